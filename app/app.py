@@ -1,12 +1,31 @@
+import atexit
+import base64
+import bisect
+import gzip
+import hashlib
+import functools
+import http.client
+import ipaddress
+import itertools
 import json
+import math
+import mimetypes
 import os
 import queue
+import random
+import re
+import select
+import signal
+import socket
 import sqlite3
 import threading
+import time
 import urllib.error
 import urllib.request
 import urllib.parse
-from datetime import datetime, timezone
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -14,6 +33,11 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+try:  # Optional: brotli variants are only served when the package is installed.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
 from flask import (
     Flask,
     Response,
@@ -270,14 +294,105 @@ next_submission_id = 1
 STATUS_OPTIONS = ["New", "In Process", "Finished"]
 visitor_stats = {}
 blocked_ips = set()
+# Compiled form of blocked_ips, rebuilt lazily whenever the rules change.
+_blocklist_index = None
+_blocklist_version = 0
+_blocklist_lock = threading.Lock()
 chat_conversations = {}
 next_chat_message_id = 1
 chat_stream_subscribers = []
 chat_subscribers_lock = threading.Lock()
 appointment_slots = []
 next_slot_id = 1
+# Striped locks so concurrent bookings of one slot serialize without a lock per slot.
+_slot_locks = [threading.Lock() for _ in range(64)]
+# Serialises bulk generation so two requests cannot both claim the same free times.
+_bulk_slot_lock = threading.Lock()
+# How far ahead the public booking pages list slots, and admin page size.
+BOOKING_WINDOW_DAYS = max(1, int(os.environ.get("BOOKING_WINDOW_DAYS") or 90))
+ADMIN_SLOT_PAGE_SIZE = max(1, int(os.environ.get("ADMIN_SLOT_PAGE_SIZE") or 50))
+BULK_SLOT_MAX = max(1, int(os.environ.get("BULK_SLOT_MAX") or 1000))
+# Rendered public pages are kept for PAGE_CACHE_TTL seconds (0 disables the
+# cache) unless the state they show changes first.
+PAGE_CACHE_TTL = max(0, int(os.environ.get("PAGE_CACHE_TTL") or 60))
+PAGE_CACHE_MAX_ENTRIES = max(1, int(os.environ.get("PAGE_CACHE_MAX_ENTRIES") or 64))
+_page_cache = OrderedDict()
+_page_cache_lock = threading.Lock()
+page_cache_stats = {"hits": 0, "misses": 0, "not_modified": 0}
+# Change counters for the state public pages read; see _bump_content_versions.
+_content_version_counter = itertools.count(1)
+_content_versions = {}
+_content_epoch = 0
+# Static files are served under content-hashed names with long cache lifetimes.
+STATIC_FINGERPRINTING = (os.environ.get("STATIC_FINGERPRINTING") or "1").strip().lower() not in {"0", "false", "no"}
+STATIC_ASSET_MAX_AGE = 365 * 24 * 3600
+_COMPRESSIBLE_ASSET_SUFFIXES = {".css", ".js", ".json", ".map", ".svg", ".txt", ".html"}
+_static_assets = None
+_static_assets_lock = threading.Lock()
+# Background job scheduler for slot expiry and weather refresh.
+SCHEDULER_ENABLED = (os.environ.get("SCHEDULER_ENABLED") or "1").strip().lower() not in {"0", "false", "no"}
+SCHEDULER_JITTER = min(0.5, max(0.0, float(os.environ.get("SCHEDULER_JITTER") or 0.1)))
+_scheduler_wakeup = threading.Event()
+_scheduler_pid: Optional[int] = None
+# Visits are queued by the request hook and merged by the flush_visits job.
+VISITOR_FLUSH_INTERVAL = max(1.0, float(os.environ.get("VISITOR_FLUSH_INTERVAL") or 30))
+VISITOR_FLUSH_BATCH = max(1, int(os.environ.get("VISITOR_FLUSH_BATCH") or 500))
+VISITOR_QUEUE_HIGH_WATER = max(1, int(os.environ.get("VISITOR_QUEUE_HIGH_WATER") or 5000))
+VISITOR_LOAD_SAMPLE_RATE = min(1.0, max(0.01, float(os.environ.get("VISITOR_LOAD_SAMPLE_RATE") or 0.1)))
+_visit_queue = queue.SimpleQueue()
+_visit_flush_lock = threading.Lock()
+visit_tracking_stats = {"flushes": 0, "merged": 0, "sampled_out": 0, "evicted": 0, "bots_skipped": 0}
+_unsaved_visitors = set()
+# visitor_stats keeps at most VISITOR_STATS_MAX IPs seen in the last
+# VISITOR_STATS_TTL_DAYS; older traffic survives only in the rollups.
+VISITOR_STATS_MAX = max(1, int(os.environ.get("VISITOR_STATS_MAX") or 5000))
+VISITOR_STATS_TTL_DAYS = max(1, int(os.environ.get("VISITOR_STATS_TTL_DAYS") or 90))
+VISITOR_PAGE_SIZE = max(1, int(os.environ.get("VISITOR_PAGE_SIZE") or 50))
+# Rollup bucket size in seconds and how many buckets to keep.
+VISITOR_ROLLUP_SPANS = {"hourly": (3600, 48), "daily": (86400, 90)}
+VISITOR_ROLLUP_TOP = 5
+visitor_rollups = {"hourly": [], "daily": []}
+# Unique addresses per rollup bucket are estimated with a HyperLogLog sketch
+# of 2**VISITOR_ROLLUP_SKETCH_BITS one-byte registers (1 KiB, about 3% error),
+# so memory stays fixed however many distinct addresses visit.
+VISITOR_ROLLUP_SKETCH_BITS = 10
+_rollup_ip_sketches = {}
+_rollup_sketches_changed = set()
+
+
+def _rate_limit_budget(name: str, default: str):
+    """Parse a ``"<requests>/<seconds>"`` budget; ``0`` or ``off`` disables it."""
+
+    value = (os.environ.get(name) or default).strip().lower()
+    if value in {"0", "off", "false", "no"}:
+        return None
+    count, _, seconds = value.partition("/")
+    return max(1, int(count)), max(1.0, float(seconds or 60))
+
+
+# Token buckets per client for public write endpoints: each allows a burst of
+# <requests> and refills at <requests>/<seconds> per second.
+RATE_LIMITS = {
+    "chat": _rate_limit_budget("RATE_LIMIT_CHAT", "20/60"),
+    "booking": _rate_limit_budget("RATE_LIMIT_BOOKING", "5/300"),
+    "enquiry": _rate_limit_budget("RATE_LIMIT_ENQUIRY", "5/600"),
+}
+RATE_LIMIT_MAX_BUCKETS = max(1, int(os.environ.get("RATE_LIMIT_MAX_BUCKETS") or 50000))
+RATE_LIMIT_SWEEP_INTERVAL = max(1.0, float(os.environ.get("RATE_LIMIT_SWEEP_INTERVAL") or 300))
+_rate_buckets = OrderedDict()
+_rate_limit_lock = threading.Lock()
+rate_limit_stats = {scope: {"allowed": 0, "limited": 0} for scope in RATE_LIMITS}
+rate_limit_stats["swept"] = 0
 WEATHER_LOCATION_QUERY = "Tameside, Manchester"
 WEATHER_ADMIN_PASSWORD = "891133kk"
+WEATHER_FORECAST_URL = os.environ.get("WEATHER_FORECAST_URL") or "https://api.openweathermap.org/data/2.5/forecast"
+WEATHER_FORECAST_TTL = max(1.0, float(os.environ.get("WEATHER_FORECAST_TTL") or 1800))
+WEATHER_FORECAST_RETRY_AFTER = 60.0
+_forecast_cache: Optional[dict] = None
+_forecast_fetch_lock = threading.Lock()
+forecast_cache_stats = {"hits": 0, "misses": 0, "errors": 0}
+_weather_enrichment_queue = queue.Queue()
+_weather_worker_pid: Optional[int] = None
 weather_api_key = None
 dog_breeds = []
 next_dog_breed_id = 1
@@ -285,6 +400,24 @@ breed_ai_suggestions = None
 meet_greet_enabled = True
 backup_history = []
 next_backup_history_id = 1
+BACKUP_RETENTION_RULES = ("last", "hourly", "daily", "weekly", "monthly")
+BACKUP_RETENTION_BUCKETS = {
+    "hourly": lambda saved_at: saved_at.strftime("%Y-%m-%d %H"),
+    "daily": lambda saved_at: saved_at.strftime("%Y-%m-%d"),
+    "weekly": lambda saved_at: saved_at.isocalendar()[:2],
+    "monthly": lambda saved_at: saved_at.strftime("%Y-%m"),
+}
+BACKUP_RETENTION_POLICY = (
+    os.environ.get("BACKUP_RETENTION_POLICY") or "last=10,hourly=24,daily=30,monthly=12"
+)
+backup_retention_stats = {
+    "runs": 0,
+    "last_run_at": None,
+    "last_pruned": 0,
+    "last_bytes_reclaimed": 0,
+    "pruned_total": 0,
+    "bytes_reclaimed_total": 0,
+}
 
 ADMIN_VIEWS = {
     "menu",
@@ -315,6 +448,95 @@ DEFAULT_TIME_CHOICES = [
 
 
 IGNORED_USER_AGENT_KEYWORDS = ["vercel-screenshot"]
+# Crawlers, link previewers, uptime monitors and HTTP libraries. Their visits
+# are not tracked and they share one cached copy of each public page.
+# Keywords match whole user-agent tokens (``Googlebot/2.1``, ``curl/8.5``),
+# never part of a longer word, so devices such as CUBOT phones stay browsers.
+BOT_USER_AGENT_KEYWORDS = [
+    # Search engines and AI crawlers.
+    "googlebot",
+    "google-inspectiontool",
+    "adsbot-google",
+    "mediapartners-google",
+    "bingbot",
+    "bingpreview",
+    "slurp",
+    "duckduckbot",
+    "baiduspider",
+    "yandexbot",
+    "yandeximages",
+    "applebot",
+    "petalbot",
+    "seznambot",
+    "sogou web spider",
+    "exabot",
+    "gptbot",
+    "chatgpt-user",
+    "oai-searchbot",
+    "claudebot",
+    "anthropic-ai",
+    "perplexitybot",
+    "ccbot",
+    "bytespider",
+    "amazonbot",
+    "ia_archiver",
+    # SEO tools.
+    "ahrefsbot",
+    "semrushbot",
+    "mj12bot",
+    "dotbot",
+    "blexbot",
+    "dataforseobot",
+    "serpstatbot",
+    # Link previews.
+    "facebookexternalhit",
+    "facebookcatalog",
+    "twitterbot",
+    "linkedinbot",
+    "slackbot",
+    "slack-imgproxy",
+    "discordbot",
+    "telegrambot",
+    "whatsapp",
+    "pinterestbot",
+    "skypeuripreview",
+    "embedly",
+    # Monitors and headless browsers.
+    "uptimerobot",
+    "pingdom.com_bot_version",
+    "statuscake",
+    "site24x7",
+    "datadogsynthetics",
+    "chrome-lighthouse",
+    "headlesschrome",
+    "phantomjs",
+    # Generic crawler tokens.
+    "bot",
+    "crawler",
+    "spider",
+    # HTTP libraries and command-line tools.
+    "curl",
+    "wget",
+    "python-requests",
+    "python-urllib",
+    "python-httpx",
+    "aiohttp",
+    "go-http-client",
+    "okhttp",
+    "axios",
+    "node-fetch",
+    "undici",
+    "apache-httpclient",
+    "java-http-client",
+    "libwww-perl",
+    "scrapy",
+    *(
+        keyword.strip().lower()
+        for keyword in (os.environ.get("BOT_USER_AGENT_KEYWORDS") or "").split(",")
+        if keyword.strip()
+    ),
+]
+USER_AGENT_CACHE_SIZE = max(1, int(os.environ.get("USER_AGENT_CACHE_SIZE") or 4096))
 
 AUTOPILOT_MODEL_NAME = "deepseek-chat"
 DEFAULT_COVERAGE_AREAS = [
@@ -393,11 +615,65 @@ auto_save_last_run: Optional[datetime] = None
 SERVICE_NOTICE_DEFAULT_TEXT = "Website under construction - Do not place any bookings."
 site_service_notice = {"enabled": False, "message": SERVICE_NOTICE_DEFAULT_TEXT}
 STATE_BACKUP_DB_FILENAME = "state_backups.sqlite3"
+STATE_PRIMARY_DB_FILENAME = "state.sqlite3"
 STATE_EXPORT_FILENAME = "andy.json"
+# Directory for andy.json and the local snapshot database; defaults to the
+# project root.
+STATE_DATA_DIR = os.environ.get("STATE_DATA_DIR") or ""
 STATE_STORAGE_NAMESPACE = os.environ.get("STATE_STORAGE_NAMESPACE", "dog_walking_state")
 STATE_LATEST_STORAGE_KEY = "latest_state"
 STATE_SNAPSHOT_COUNTER_KEY = "snapshot_counter"
+STATE_JOURNAL_STORAGE_KEY = "state_journal"
+# Snapshot codec framing. Values without a prefix are plain (legacy) JSON.
+SNAPSHOT_CODEC_TEXT_PREFIX = "dwz1:"
+SNAPSHOT_CODEC_BINARY_MAGIC = b"DWZ1"
+SNAPSHOT_COMPRESSION_LEVEL = 6
+# History snapshots are stored as manifests of content-addressed chunks, one
+# per group below plus a "settings" chunk holding every other key.
+STATE_CHUNK_REFS_STORAGE_KEY = "chunk_refs"
+# Every process rewrites the whole chunk index, so changes to it are made
+# under a KV lock that expires on its own if the holder dies.
+STATE_CHUNK_REFS_LOCK_SECONDS = 10
+SNAPSHOT_CHUNK_GROUPS = {
+    "slots": ("appointment_slots", "next_slot_id"),
+    "conversations": ("chat_conversations", "next_chat_message_id"),
+    "visitors": ("visitor_stats", "blocked_ips", "visitor_rollups"),
+    "submissions": ("submissions", "next_submission_id"),
+    "history": ("backup_history", "next_backup_history_id"),
+}
+# "snapshot" rewrites the full state on every change; "journal" appends small
+# deltas and only rewrites the full state when the journal is compacted.
+STATE_PERSISTENCE_MODE = (os.environ.get("STATE_PERSISTENCE_MODE") or "snapshot").strip().lower()
+STATE_JOURNAL_COMPACT_EVERY = max(1, int(os.environ.get("STATE_JOURNAL_COMPACT_EVERY") or 200))
+# Seconds between background state writes; 0 keeps writes on the request thread.
+STATE_WRITE_BEHIND_INTERVAL = max(0.0, float(os.environ.get("STATE_WRITE_BEHIND_INTERVAL") or 0))
+# Primary database used when STATE_PERSISTENCE_MODE=sqlite.
+STATE_SQLITE_PATH = os.environ.get("STATE_SQLITE_PATH")
+STATE_SQLITE_BUSY_TIMEOUT = float(os.environ.get("STATE_SQLITE_BUSY_TIMEOUT") or 5)
+_state_db_local = threading.local()
+# Shared-state version this worker's globals reflect, and the optional
+# directory of per-worker Unix sockets used to announce new versions.
+_state_db_seen_version: Optional[int] = None
+# Bumped on every reload from the database. Each thread records the value its
+# work started from, so a commit made against replaced globals is detected.
+_state_reload_generation = 0
+STATE_NOTIFY_DIR = os.environ.get("STATE_NOTIFY_DIR")
+_state_change_event = threading.Event()
+_state_change_listener_pid: Optional[int] = None
 _state_storage_lock = threading.Lock()
+_write_behind_condition = threading.Condition()
+_write_behind_flush_lock = threading.Lock()
+_write_behind_pending: list = []
+_write_behind_full_save = False
+_write_behind_dirty_since: Optional[float] = None
+_write_behind_thread: Optional[threading.Thread] = None
+write_behind_status = {
+    "last_flush_at": None,
+    "last_flush_monotonic": None,
+    "last_flush_changes": None,
+    "last_error": None,
+    "flush_count": 0,
+}
 _fallback_kv_store: dict = {}
 _cached_export_file_path: Optional[str] = None
 _KV_REST_API_URL = (
@@ -413,6 +689,20 @@ _KV_REST_API_TOKEN = (
 _KV_REST_HEADERS = {"Accept": "application/json"}
 if _KV_REST_API_TOKEN:
     _KV_REST_HEADERS["Authorization"] = f"Bearer {_KV_REST_API_TOKEN}"
+KV_REST_TIMEOUT = float(os.environ.get("KV_REST_TIMEOUT") or 10)
+KV_REST_RETRIES = max(0, int(os.environ.get("KV_REST_RETRIES") or 2))
+KV_REST_BACKOFF = float(os.environ.get("KV_REST_BACKOFF") or 0.2)
+# Commands that leave the store the same when applied twice, so a request
+# that failed after it was sent can be repeated safely.
+_KV_IDEMPOTENT_COMMANDS = frozenset({"GET", "SET", "DEL", "LRANGE"})
+KV_REST_POOL_SIZE = max(1, int(os.environ.get("KV_REST_POOL_SIZE") or 4))
+_kv_connection_pool: queue.LifoQueue = queue.LifoQueue(maxsize=KV_REST_POOL_SIZE)
+KV_READ_CACHE_MAX_BYTES = max(0, int(os.environ.get("KV_READ_CACHE_MAX_BYTES") or 8 * 1024 * 1024))
+_kv_cache_lock = threading.Lock()
+_kv_read_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_kv_read_cache_bytes = 0
+_kv_cache_generation = 0
+kv_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
 _R2_CLIENT: Optional[object] = None
 R2_BUCKET_NAME = os.environ.get("R2_BUCKET")
 R2_EXPORT_OBJECT_KEY = os.environ.get("R2_EXPORT_KEY") or f"{STATE_STORAGE_NAMESPACE}/{STATE_EXPORT_FILENAME}"
@@ -440,44 +730,333 @@ def _snapshot_counter_key() -> str:
     return _storage_key(STATE_SNAPSHOT_COUNTER_KEY)
 
 
+def _state_journal_key() -> str:
+    return _storage_key(STATE_JOURNAL_STORAGE_KEY)
 
-def _kv_rest_execute(command: str, *args):
-    if not _KV_REST_API_URL:
+
+def _kv_rest_target():
+    """Return (scheme, host, port, base_path) for the configured REST endpoint."""
+
+    parsed = urllib.parse.urlsplit(_KV_REST_API_URL or "")
+    if not parsed.hostname:
+        return None
+    base_path = parsed.path.rstrip("/")
+    return parsed.scheme or "https", parsed.hostname, parsed.port, base_path
+
+
+def _kv_open_connection(target):
+    scheme, host, port, _ = target
+    connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return connection_class(host, port, timeout=KV_REST_TIMEOUT)
+
+
+def _kv_acquire_connection(target):
+    while True:
+        try:
+            pooled_target, connection = _kv_connection_pool.get_nowait()
+        except queue.Empty:
+            return _kv_open_connection(target)
+        if pooled_target == target and not _kv_connection_dropped(connection):
+            return connection
+        connection.close()
+
+
+def _kv_connection_dropped(connection) -> bool:
+    """True when the server has closed an idle pooled connection.
+
+    An idle keep-alive socket only turns readable when the peer closed it.
+    """
+
+    if connection.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _kv_release_connection(target, connection):
+    try:
+        _kv_connection_pool.put_nowait((target, connection))
+    except queue.Full:
+        connection.close()
+
+
+def _reset_kv_connection_pool():
+    while True:
+        try:
+            _, connection = _kv_connection_pool.get_nowait()
+        except queue.Empty:
+            return
+        connection.close()
+
+
+def _kv_rest_request(path: str, body, *, idempotent: bool = False):
+    """POST ``body`` to the REST endpoint over a pooled keep-alive connection.
+
+    Failures to connect are retried with exponential backoff. Errors after the
+    request went out and 5xx responses are retried only when ``idempotent``,
+    since the server may already have applied it. Timeouts are never retried:
+    callers may hold the storage lock. The decoded JSON response is returned,
+    or None when the request failed.
+    """
+
+    target = _kv_rest_target()
+    if target is None:
         return None
-    payload = json.dumps({"command": command, "args": [str(arg) for arg in args]}).encode("utf-8")
+    payload = json.dumps(body).encode("utf-8")
     headers = dict(_KV_REST_HEADERS)
     headers["Content-Type"] = "application/json"
-    request = urllib.request.Request(
-        _KV_REST_API_URL,
-        data=payload,
-        headers=headers,
-        method="POST",
-    )
-    try:
-        with urllib.request.urlopen(request, timeout=10) as response:
+    for attempt in range(KV_REST_RETRIES + 1):
+        if attempt:
+            time.sleep(KV_REST_BACKOFF * (2 ** (attempt - 1)))
+        connection = _kv_acquire_connection(target)
+        try:
+            if connection.sock is None:
+                connection.connect()
+        except TimeoutError:
+            connection.close()
+            return None
+        except OSError:
+            connection.close()
+            continue
+        try:
+            connection.request("POST", f"{target[3]}{path}" or "/", body=payload, headers=headers)
+            response = connection.getresponse()
             raw = response.read().decode("utf-8")
-        data = json.loads(raw)
-        return data.get("result")
-    except (urllib.error.URLError, json.JSONDecodeError):
+        except (OSError, http.client.HTTPException) as exc:
+            # Idle pooled connections are usually dropped together, so start
+            # any retry from a fresh connection rather than another stale one.
+            connection.close()
+            _reset_kv_connection_pool()
+            if idempotent and not isinstance(exc, TimeoutError):
+                continue
+            return None
+        if response.will_close:
+            connection.close()
+        else:
+            _kv_release_connection(target, connection)
+        if response.status >= 500:
+            if idempotent:
+                continue
+            return None
+        if response.status >= 400:
+            return None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+    return None
+
+
+def _kv_rest_execute(command: str, *args):
+    if not _KV_REST_API_URL:
+        return None
+    data = _kv_rest_request(
+        "",
+        {"command": command, "args": [str(arg) for arg in args]},
+        idempotent=command.upper() in _KV_IDEMPOTENT_COMMANDS,
+    )
+    if not isinstance(data, dict):
+        return None
+    return data.get("result")
+
+
+def _kv_rest_pipeline(commands, *, transaction: bool = False) -> Optional[list]:
+    """Send several commands in one round trip via ``/pipeline`` or ``/multi-exec``."""
+
+    if not _KV_REST_API_URL or not commands:
+        return None
+    body = [[str(part) for part in command] for command in commands]
+    data = _kv_rest_request(
+        "/multi-exec" if transaction else "/pipeline",
+        body,
+        idempotent=all(command[0].upper() in _KV_IDEMPOTENT_COMMANDS for command in body),
+    )
+    if not isinstance(data, list) or len(data) != len(commands):
+        return None
+    return [row.get("result") if isinstance(row, dict) else None for row in data]
+
+
+def _kv_fallback_execute(command: str, *args):
+    """Apply a command to the in-process store used when KV is unavailable."""
+
+    command = command.upper()
+    key = args[0] if args else None
+    if command == "SET":
+        if "NX" in args[2:] and key in _fallback_kv_store:
+            return None
+        _fallback_kv_store[key] = args[1]
+        return "OK"
+    if command == "GET":
+        value = _fallback_kv_store.get(key)
+        return value if isinstance(value, str) else None
+    if command == "DEL":
+        return 1 if _fallback_kv_store.pop(key, None) is not None else 0
+    if command == "INCR":
+        current_value = int(_fallback_kv_store.get(key, 0) or 0) + 1
+        _fallback_kv_store[key] = str(current_value)
+        return current_value
+    if command == "RPUSH":
+        rows = _fallback_kv_store.get(key)
+        if not isinstance(rows, list):
+            rows = []
+            _fallback_kv_store[key] = rows
+        rows.extend(args[1:])
+        return len(rows)
+    if command == "LRANGE":
+        rows = _fallback_kv_store.get(key)
+        return list(rows) if isinstance(rows, list) else []
+    raise ValueError(f"Unsupported fallback KV command {command}")
+
+
+def _kv_cache_lookup(key: str):
+    with _kv_cache_lock:
+        entry = _kv_read_cache.get(key)
+        if entry is not None:
+            _kv_read_cache.move_to_end(key)
+            kv_cache_stats["hits"] += 1
+            return entry[1]
+        kv_cache_stats["misses"] += 1
         return None
 
 
+def _kv_cache_store(key: str, value: Optional[str], generation: Optional[int] = None):
+    """Cache ``value`` for ``key`` unless the cache changed since ``generation``.
+
+    Every write and invalidation bumps the generation. Reads pass the
+    generation observed before their network round trip, so a value fetched
+    while a concurrent write or delete landed is never cached over it.
+    """
+
+    global _kv_read_cache_bytes, _kv_cache_generation
+
+    with _kv_cache_lock:
+        if generation is None:
+            _kv_cache_generation += 1
+            generation = _kv_cache_generation
+        elif generation != _kv_cache_generation:
+            return
+        previous = _kv_read_cache.pop(key, None)
+        if previous is not None:
+            _kv_read_cache_bytes -= previous[2]
+        if not isinstance(value, str):
+            return
+        size = len(value.encode("utf-8"))
+        if size > KV_READ_CACHE_MAX_BYTES:
+            return
+        _kv_read_cache[key] = (generation, value, size)
+        _kv_read_cache_bytes += size
+        while _kv_read_cache_bytes > KV_READ_CACHE_MAX_BYTES:
+            _, evicted = _kv_read_cache.popitem(last=False)
+            _kv_read_cache_bytes -= evicted[2]
+            kv_cache_stats["evictions"] += 1
+
+
+def _kv_cache_invalidate(key: Optional[str] = None):
+    """Drop ``key`` from the read cache, or everything when no key is given."""
+
+    global _kv_read_cache_bytes, _kv_cache_generation
+
+    with _kv_cache_lock:
+        _kv_cache_generation += 1
+        if key is None:
+            _kv_read_cache.clear()
+            _kv_read_cache_bytes = 0
+            return
+        previous = _kv_read_cache.pop(key, None)
+        if previous is not None:
+            _kv_read_cache_bytes -= previous[2]
+
+
+def _kv_cache_summary() -> dict:
+    with _kv_cache_lock:
+        lookups = kv_cache_stats["hits"] + kv_cache_stats["misses"]
+        return {
+            "entries": len(_kv_read_cache),
+            "bytes": _kv_read_cache_bytes,
+            "max_bytes": KV_READ_CACHE_MAX_BYTES,
+            "hits": kv_cache_stats["hits"],
+            "misses": kv_cache_stats["misses"],
+            "evictions": kv_cache_stats["evictions"],
+            "hit_rate": round(100.0 * kv_cache_stats["hits"] / lookups, 1) if lookups else 0.0,
+        }
+
+
+def _kv_pipeline(commands, *, transaction: bool = True) -> list:
+    """Run commands in one round trip, falling back to the local store."""
+
+    results = _kv_rest_pipeline(commands, transaction=transaction)
+    if results is None:
+        results = [_kv_fallback_execute(*command) for command in commands]
+    for command in commands:
+        name = command[0].upper()
+        if name == "SET":
+            _kv_cache_store(command[1], command[2])
+        elif name == "DEL":
+            _kv_cache_invalidate(command[1])
+    return results
+
+
+def _kv_get_many(keys) -> list:
+    """Read several keys, serving cached ones locally and pipelining the rest."""
+
+    values = {key: _kv_cache_lookup(key) for key in keys}
+    missing = [key for key, value in values.items() if value is None]
+    if missing:
+        generation = _kv_cache_generation
+        results = _kv_rest_pipeline([("GET", key) for key in missing])
+        if results is None:
+            results = [_kv_fallback_execute("GET", key) for key in missing]
+        for key, result in zip(missing, results):
+            value = str(result) if result is not None else None
+            values[key] = value
+            if value is not None:
+                _kv_cache_store(key, value, generation)
+    return [values[key] for key in keys]
+
+
 def _kv_set(key: str, value: str):
+    _kv_cache_store(key, value)
     if _kv_rest_execute("SET", key, value) is not None:
         return
-    _fallback_kv_store[key] = value
+    _kv_fallback_execute("SET", key, value)
+
+
+def _kv_set_if_absent(key: str, value: str, ttl_seconds: float) -> Optional[bool]:
+    """``SET key value NX PX ttl``; True when this call created the key.
+
+    Returns None when the REST store is configured but did not answer. The
+    process-local store is only used when there is no REST store at all, since
+    a key set there would not be seen by other processes.
+    """
+
+    if _KV_REST_API_URL:
+        args = [key, value, "NX", "PX", str(int(ttl_seconds * 1000))]
+        data = _kv_rest_request("", {"command": "SET", "args": args})
+        if not isinstance(data, dict):
+            return None
+        return data.get("result") == "OK"
+    return _kv_fallback_execute("SET", key, value, "NX") == "OK"
 
 
 def _kv_get(key: str):
+    cached = _kv_cache_lookup(key)
+    if cached is not None:
+        return cached
+    generation = _kv_cache_generation
     result = _kv_rest_execute("GET", key)
-    if result is not None:
-        return str(result)
-    return _fallback_kv_store.get(key)
+    value = str(result) if result is not None else _kv_fallback_execute("GET", key)
+    if value is not None:
+        _kv_cache_store(key, value, generation)
+    return value
 
 
 def _kv_delete(key: str):
+    _kv_cache_invalidate(key)
     _kv_rest_execute("DEL", key)
-    _fallback_kv_store.pop(key, None)
+    _kv_fallback_execute("DEL", key)
 
 
 def _kv_incr(key: str) -> int:
@@ -489,9 +1068,21 @@ def _kv_incr(key: str) -> int:
             return int(result)
         except ValueError:
             pass
-    current_value = int(_fallback_kv_store.get(key, 0) or 0) + 1
-    _fallback_kv_store[key] = str(current_value)
-    return current_value
+    return _kv_fallback_execute("INCR", key)
+
+
+def _kv_rpush(key: str, *values: str) -> int:
+    result = _kv_rest_execute("RPUSH", key, *values)
+    if isinstance(result, int):
+        return result
+    return _kv_fallback_execute("RPUSH", key, *values)
+
+
+def _kv_lrange(key: str) -> list:
+    result = _kv_rest_execute("LRANGE", key, 0, -1)
+    if isinstance(result, list):
+        return [str(value) for value in result]
+    return _kv_fallback_execute("LRANGE", key)
 
 
 def _r2_client():
@@ -543,7 +1134,7 @@ def _state_export_file_path() -> str:
 
 
 def _backup_directory_candidates():
-    project_root = Path(app.root_path).parent
+    project_root = Path(STATE_DATA_DIR) if STATE_DATA_DIR else Path(app.root_path).parent
     backups_dir = project_root / "backups"
     return [str(project_root), str(backups_dir)]
 
@@ -590,6 +1181,23 @@ def _r2_delete(key: str):
         return
 
 
+def _r2_delete_many(keys):
+    client = _r2_client()
+    keys = [key for key in keys if key]
+    if not client or not R2_BUCKET_NAME or not keys:
+        return
+    # DeleteObjects accepts at most 1,000 keys per call.
+    for offset in range(0, len(keys), 1000):
+        batch = keys[offset : offset + 1000]
+        try:
+            client.delete_objects(
+                Bucket=R2_BUCKET_NAME,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+        except (BotoCoreError, ClientError):
+            app.logger.warning("Unable to delete %s pruned backups from R2", len(batch))
+
+
 def _write_state_export_payload(payload_text: str) -> Optional[str]:
     """Persist the serialized state to the auto-restore JSON file."""
 
@@ -665,10 +1273,38 @@ def _count_backup_rows() -> int:
     return sum(1 for entry in backup_history if entry.get("storage_id"))
 
 
-def _delete_backup_row(storage_id: Optional[int]):
+def _delete_backup_row(storage_id: Optional[int]) -> int:
     if storage_id is None:
-        return
-    _kv_delete(_snapshot_key(storage_id))
+        return 0
+    return _delete_backup_rows([storage_id])
+
+
+def _delete_backup_rows(storage_ids) -> int:
+    """Delete several snapshots in one batch; return the stored bytes reclaimed."""
+
+    storage_ids = [storage_id for storage_id in storage_ids if storage_id is not None]
+    if not storage_ids:
+        return 0
+    raw_values = _kv_get_many([_snapshot_key(storage_id) for storage_id in storage_ids])
+    manifests = {}
+    reclaimed = 0
+    for storage_id, raw_value in zip(storage_ids, raw_values):
+        reclaimed += len(raw_value or "")
+        try:
+            manifest = json.loads(raw_value) if raw_value else None
+        except (TypeError, json.JSONDecodeError):
+            manifest = None
+        manifests[storage_id] = manifest if isinstance(manifest, dict) else None
+    refs = None
+    if _chunked_manifests(manifests):
+        try:
+            refs = _lock_snapshot_chunk_refs()
+        except (ConnectionError, TimeoutError) as exc:
+            # Unreferenced chunks are only wasted space; skip collecting them
+            # rather than rewrite the index without holding its lock.
+            app.logger.warning("Skipping snapshot chunk cleanup: %s", exc)
+    with _state_storage_lock:
+        return reclaimed + _delete_snapshot_manifests(manifests, refs)
 
 
 def _describe_backup_source(source: Optional[str]) -> str:
@@ -708,6 +1344,7 @@ def _record_backup_history(
         "legacy_path": None,
     }
     backup_history.insert(0, entry)
+    _backup_history_index.added(entry)
     next_backup_history_id += 1
     return entry
 
@@ -721,6 +1358,7 @@ def _serialize_backup_history_entry(entry: dict) -> dict:
         "legacy_path": entry.get("legacy_path"),
         "saved_at": _serialize_datetime(entry.get("saved_at")),
         "source": entry.get("source"),
+        "stored_bytes": entry.get("stored_bytes"),
     }
 
 
@@ -744,7 +1382,7 @@ def _present_backup_history_entry(entry: dict, include_urls: bool = False) -> di
 
 
 def _get_backup_history_entry(entry_id: int):
-    return next((entry for entry in backup_history if entry.get("id") == entry_id), None)
+    return _backup_history_index.get(entry_id)
 
 
 def _remove_backup_history_entry(entry_id: int):
@@ -757,6 +1395,107 @@ def _remove_backup_history_entry(entry_id: int):
     return entry
 
 
+def _parse_backup_retention_policy(text: str) -> dict:
+    """Parse ``"last=10,hourly=24,daily=30"`` style retention settings."""
+
+    policy = {rule: 0 for rule in BACKUP_RETENTION_RULES}
+    for part in (text or "").split(","):
+        name, _, value = part.partition("=")
+        name = name.strip().lower()
+        if name in policy:
+            policy[name] = max(0, _coerce_int(value.strip(), 0))
+    return policy
+
+
+def _describe_backup_retention_policy(policy: dict) -> str:
+    labels = {
+        "last": "the latest {}",
+        "hourly": "{} hourly",
+        "daily": "{} daily",
+        "weekly": "{} weekly",
+        "monthly": "{} monthly",
+    }
+    parts = [labels[rule].format(count) for rule, count in policy.items() if count]
+    return "Keep " + ", ".join(parts) if parts else "Keep every snapshot"
+
+
+def _plan_backup_retention(entries, policy: Optional[dict] = None):
+    """Split history entries into (keep, prune) lists, newest first.
+
+    The newest ``last`` entries are always kept; each bucketed rule then keeps
+    the newest entry in each of its most recent N hourly/daily/... buckets.
+    """
+
+    policy = policy or _parse_backup_retention_policy(BACKUP_RETENTION_POLICY)
+    ordered = sorted(
+        (entry for entry in entries if isinstance(entry, dict)),
+        key=lambda entry: _parse_datetime(entry.get("saved_at")) or datetime.min,
+        reverse=True,
+    )
+    if not any(policy.values()):
+        return ordered, []
+    keep_ids = {entry.get("id") for entry in ordered[: policy.get("last", 0)]}
+    for rule, bucket_of in BACKUP_RETENTION_BUCKETS.items():
+        limit = policy.get(rule, 0)
+        seen_buckets = set()
+        for entry in ordered:
+            if len(seen_buckets) >= limit:
+                break
+            saved_at = _parse_datetime(entry.get("saved_at"))
+            if saved_at is None:
+                continue
+            bucket = bucket_of(saved_at)
+            if bucket in seen_buckets:
+                continue
+            seen_buckets.add(bucket)
+            keep_ids.add(entry.get("id"))
+    keep = [entry for entry in ordered if entry.get("id") in keep_ids]
+    prune = [entry for entry in ordered if entry.get("id") not in keep_ids]
+    return keep, prune
+
+
+def _apply_backup_retention() -> dict:
+    """Prune history entries outside the retention policy and their stored data."""
+
+    global backup_history
+
+    _, pruned = _plan_backup_retention(backup_history)
+    reclaimed = 0
+    if pruned:
+        pruned_ids = {entry.get("id") for entry in pruned}
+        backup_history = [entry for entry in backup_history if entry.get("id") not in pruned_ids]
+        reclaimed = _delete_backup_rows([entry.get("storage_id") for entry in pruned])
+        _r2_delete_many([entry.get("legacy_path") for entry in pruned])
+    backup_retention_stats.update(
+        {
+            "runs": backup_retention_stats["runs"] + 1,
+            "last_run_at": datetime.utcnow(),
+            "last_pruned": len(pruned),
+            "last_bytes_reclaimed": reclaimed,
+            "pruned_total": backup_retention_stats["pruned_total"] + len(pruned),
+            "bytes_reclaimed_total": backup_retention_stats["bytes_reclaimed_total"] + reclaimed,
+        }
+    )
+    return {"pruned": len(pruned), "bytes_reclaimed": reclaimed}
+
+
+def _backup_retention_preview() -> dict:
+    keep, prune = _plan_backup_retention(backup_history)
+    last_run_at = backup_retention_stats.get("last_run_at")
+    return {
+        "policy_label": _describe_backup_retention_policy(
+            _parse_backup_retention_policy(BACKUP_RETENTION_POLICY)
+        ),
+        "keep_count": len(keep),
+        "prune": [_present_backup_history_entry(entry) for entry in prune],
+        "prune_bytes": sum(entry.get("stored_bytes") or 0 for entry in prune),
+        "stats": dict(
+            backup_retention_stats,
+            last_run_label=_format_backup_history_timestamp(last_run_at) if last_run_at else None,
+        ),
+    }
+
+
 def _latest_snapshot_storage_id() -> Optional[int]:
     for entry in backup_history:
         storage_id = entry.get("storage_id")
@@ -765,6 +1504,191 @@ def _latest_snapshot_storage_id() -> Optional[int]:
     return None
 
 
+def _snapshot_json(payload: dict) -> str:
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _compress_snapshot_text(payload_json: str) -> str:
+    """Frame compact snapshot JSON as zlib-compressed, base64 text for KV values."""
+
+    compressed = zlib.compress(payload_json.encode("utf-8"), SNAPSHOT_COMPRESSION_LEVEL)
+    return SNAPSHOT_CODEC_TEXT_PREFIX + base64.b64encode(compressed).decode("ascii")
+
+
+def _compress_snapshot_bytes(payload_json: str) -> bytes:
+    """Frame compact snapshot JSON as raw zlib bytes for object storage."""
+
+    return SNAPSHOT_CODEC_BINARY_MAGIC + zlib.compress(
+        payload_json.encode("utf-8"),
+        SNAPSHOT_COMPRESSION_LEVEL,
+    )
+
+
+def _decode_snapshot(raw_value) -> Optional[dict]:
+    """Decode any stored snapshot: framed codec output or legacy/compact JSON."""
+
+    if raw_value is None:
+        return None
+    if isinstance(raw_value, dict):
+        return raw_value
+    try:
+        if isinstance(raw_value, (bytes, bytearray)):
+            raw_bytes = bytes(raw_value)
+            if raw_bytes.startswith(SNAPSHOT_CODEC_BINARY_MAGIC):
+                raw_value = zlib.decompress(raw_bytes[len(SNAPSHOT_CODEC_BINARY_MAGIC):]).decode("utf-8")
+            else:
+                raw_value = raw_bytes.decode("utf-8")
+        if raw_value.startswith(SNAPSHOT_CODEC_TEXT_PREFIX):
+            compressed = base64.b64decode(raw_value[len(SNAPSHOT_CODEC_TEXT_PREFIX):])
+            raw_value = zlib.decompress(compressed).decode("utf-8")
+        data = json.loads(raw_value)
+    except (TypeError, ValueError, UnicodeDecodeError, zlib.error):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _snapshot_chunk_key(chunk_hash: str) -> str:
+    return _storage_key("chunk", chunk_hash)
+
+
+def _snapshot_chunk_refs_key() -> str:
+    return _storage_key(STATE_CHUNK_REFS_STORAGE_KEY)
+
+
+def _split_snapshot_chunks(payload: dict) -> dict:
+    """Group a state payload into per-entity chunks; leftovers go to "settings"."""
+
+    chunks = {name: {} for name in SNAPSHOT_CHUNK_GROUPS}
+    chunks["settings"] = {}
+    group_for_key = {
+        key: name for name, keys in SNAPSHOT_CHUNK_GROUPS.items() for key in keys
+    }
+    for key, value in payload.items():
+        if key == "saved_at":
+            continue
+        chunks[group_for_key.get(key, "settings")][key] = value
+    return chunks
+
+
+def _snapshot_chunk_refs_lock_key() -> str:
+    return _storage_key(STATE_CHUNK_REFS_STORAGE_KEY, "lock")
+
+
+def _lock_snapshot_chunk_refs() -> dict:
+    """Lock the chunk reference index against other processes and read it.
+
+    Returns ``{hash: {"size": bytes, "refs": [ids]}}``. The caller writes the
+    index back and releases the lock in the same pipeline, so no process can
+    rewrite it from a stale copy and drop another's references. Call this
+    before taking ``_state_storage_lock``, since it may wait for another
+    process. Raises ``ConnectionError`` when the shared store cannot be
+    reached and ``TimeoutError`` when another process keeps the lock.
+    """
+
+    lock_key = _snapshot_chunk_refs_lock_key()
+    deadline = time.monotonic() + STATE_CHUNK_REFS_LOCK_SECONDS
+    while True:
+        locked = _kv_set_if_absent(lock_key, str(os.getpid()), STATE_CHUNK_REFS_LOCK_SECONDS)
+        if locked is None:
+            raise ConnectionError("The key-value store is unreachable; cannot lock the snapshot chunk index")
+        if locked:
+            break
+        if time.monotonic() >= deadline:
+            raise TimeoutError("Timed out waiting for the snapshot chunk index lock")
+        time.sleep(0.05)
+    # Other processes rewrite the index, so never serve it from the read cache.
+    _kv_cache_invalidate(_snapshot_chunk_refs_key())
+    try:
+        decoded = _decode_snapshot(_kv_get(_snapshot_chunk_refs_key()))
+    except BaseException:
+        _kv_delete(lock_key)
+        raise
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def _snapshot_manifest_commands(storage_id: int, payload: dict, row: dict, refs: dict):
+    """Build the KV commands that store ``payload`` as a chunk manifest.
+
+    Chunks are addressed by the SHA-256 of their canonical JSON, so a chunk
+    that an earlier snapshot already uploaded is only referenced again.
+    ``refs`` comes from ``_lock_snapshot_chunk_refs``; the commands write it
+    back and release the lock.
+    """
+
+    commands = []
+    manifest = dict(row)
+    manifest.update({"format": "manifest", "saved_at_value": payload.get("saved_at"), "chunks": {}})
+    stored_bytes = 0
+    for name, chunk in _split_snapshot_chunks(payload).items():
+        chunk_json = json.dumps(chunk, sort_keys=True, separators=(",", ":"))
+        chunk_hash = hashlib.sha256(chunk_json.encode("utf-8")).hexdigest()
+        manifest["chunks"][name] = chunk_hash
+        entry = refs.get(chunk_hash)
+        if entry is None:
+            encoded_chunk = _compress_snapshot_text(chunk_json)
+            entry = {"size": len(encoded_chunk), "refs": []}
+            refs[chunk_hash] = entry
+            commands.append(("SET", _snapshot_chunk_key(chunk_hash), encoded_chunk))
+            stored_bytes += entry["size"]
+        if storage_id not in entry["refs"]:
+            entry["refs"].append(storage_id)
+    manifest["stored_bytes"] = stored_bytes
+    manifest_text = json.dumps(manifest)
+    commands.append(("SET", _snapshot_key(storage_id), manifest_text))
+    commands.append(("SET", _snapshot_chunk_refs_key(), _snapshot_json(refs)))
+    commands.append(("DEL", _snapshot_chunk_refs_lock_key()))
+    return commands, stored_bytes + len(manifest_text)
+
+
+def _assemble_snapshot_manifest(manifest: dict) -> Optional[dict]:
+    chunk_hashes = manifest.get("chunks") or {}
+    keys = [_snapshot_chunk_key(chunk_hash) for chunk_hash in chunk_hashes.values()]
+    payload = {}
+    for raw_chunk in _kv_get_many(keys):
+        chunk = _decode_snapshot(raw_chunk)
+        if chunk is None:
+            return None
+        payload.update(chunk)
+    payload["saved_at"] = manifest.get("saved_at_value") or manifest.get("saved_at")
+    return payload
+
+
+def _chunked_manifests(manifests: dict) -> dict:
+    return {
+        storage_id: manifest
+        for storage_id, manifest in manifests.items()
+        if manifest and manifest.get("format") == "manifest"
+    }
+
+
+def _delete_snapshot_manifests(manifests: dict, refs: Optional[dict]) -> int:
+    """Drop snapshots and garbage-collect chunks no remaining snapshot uses.
+
+    ``manifests`` maps storage ids to their manifest (or None for legacy rows).
+    ``refs`` is the locked chunk index, or None to leave chunks alone.
+    Everything is removed in one pipelined call; returns the chunk bytes reclaimed.
+    """
+
+    commands = [("DEL", _snapshot_key(storage_id)) for storage_id in manifests]
+    reclaimed = 0
+    chunked = _chunked_manifests(manifests) if refs is not None else {}
+    for storage_id, manifest in chunked.items():
+        for chunk_hash in set((manifest.get("chunks") or {}).values()):
+            entry = refs.get(chunk_hash)
+            if entry is None:
+                continue
+            entry["refs"] = [ref for ref in entry.get("refs", []) if ref != storage_id]
+            if not entry["refs"]:
+                reclaimed += entry.get("size") or 0
+                refs.pop(chunk_hash, None)
+                commands.append(("DEL", _snapshot_chunk_key(chunk_hash)))
+    if chunked:
+        commands.append(("SET", _snapshot_chunk_refs_key(), _snapshot_json(refs)))
+        commands.append(("DEL", _snapshot_chunk_refs_lock_key()))
+    _kv_pipeline(commands)
+    return reclaimed
+
+
 def _get_snapshot_row(storage_id: Optional[int]):
     if storage_id is None:
         return None
@@ -775,6 +1699,16 @@ def _get_snapshot_row(storage_id: Optional[int]):
         row = json.loads(raw_value)
     except (TypeError, json.JSONDecodeError):
         return None
+    if not isinstance(row, dict):
+        return None
+    if row.get("format") == "manifest":
+        payload = _assemble_snapshot_manifest(row)
+        if payload is None:
+            return None
+        row = dict(row, payload=payload)
+    elif "payload" not in row:
+        # Older snapshots stored the bare state under the snapshot key.
+        row = {"saved_at": row.get("saved_at"), "source": None, "payload": raw_value}
     row.setdefault("id", storage_id)
     return row
 
@@ -785,13 +1719,20 @@ def save_data(
     record_history: bool = True,
     state_payload: Optional[dict] = None,
 ) -> Optional[dict]:
-    payload = state_payload or _serialize_state()
-    saved_at_value = payload.get("saved_at") or datetime.utcnow().isoformat()
     history_entry = None
     storage_id = None
-    payload_to_persist = payload
+    chunk_refs = None
     try:
+        if record_history:
+            # Wait for other processes before taking the storage lock, so
+            # requests saving in this process are not held up behind them.
+            chunk_refs = _lock_snapshot_chunk_refs()
         with _state_storage_lock:
+            # Serialize under the lock so no journal delta can land between the
+            # snapshot being taken and the journal being cleared below.
+            payload = state_payload or _serialize_state()
+            saved_at_value = payload.get("saved_at") or datetime.utcnow().isoformat()
+            payload_to_persist = payload
             if record_history:
                 storage_id = _kv_incr(_snapshot_counter_key())
                 storage_label = f"Snapshot #{storage_id} (persistent store)"
@@ -807,21 +1748,41 @@ def save_data(
                     _serialize_backup_history_entry(entry) for entry in backup_history
                 ]
                 payload_to_persist["next_backup_history_id"] = next_backup_history_id
+            # Serialize and compress once; every destination reuses these.
+            payload_json = _snapshot_json(payload_to_persist)
+            encoded_payload = _compress_snapshot_text(payload_json)
+            commands = [
+                ("SET", _latest_state_key(), encoded_payload),
+                ("DEL", _state_journal_key()),
+            ]
+            if record_history and storage_id is not None:
                 row_payload = {
                     "id": storage_id,
                     "saved_at": saved_at_value,
                     "source": source or "manual",
-                    "payload": json.dumps(payload_to_persist, indent=2),
                 }
-            payload_text = json.dumps(payload_to_persist, indent=2)
-            _kv_set(_latest_state_key(), payload_text)
-            if record_history and storage_id is not None:
-                _kv_set(_snapshot_key(storage_id), row_payload["payload"])
-            _write_state_export_payload(payload_text)
+                manifest_commands, stored_bytes = _snapshot_manifest_commands(
+                    storage_id,
+                    payload_to_persist,
+                    row_payload,
+                    chunk_refs,
+                )
+                commands.extend(manifest_commands)
+                history_entry["stored_bytes"] = stored_bytes
+            _kv_pipeline(commands)
+            chunk_refs = None
+            _write_state_export_payload(payload_json)
     except Exception as exc:  # pylint: disable=broad-except
+        if chunk_refs is not None:
+            _kv_delete(_snapshot_chunk_refs_lock_key())
         app.logger.exception("Failed to save application state: %s", exc)
         return None
-    return {"history_entry": history_entry, "storage_id": storage_id, "payload": payload_to_persist}
+    return {
+        "history_entry": history_entry,
+        "storage_id": storage_id,
+        "payload": payload_to_persist,
+        "payload_json": payload_json,
+    }
 
 
 def load_data(
@@ -829,6 +1790,12 @@ def load_data(
     *,
     persist_after: bool = False,
 ) -> bool:
+    replay_journal = storage_id is None
+    if storage_id is None and STATE_PERSISTENCE_MODE == "sqlite":
+        state = _state_db_load_state()
+        if state is not None:
+            _apply_state_db_snapshot(state)
+            return True
     if storage_id is None:
         payload_text = _kv_get(_latest_state_key())
         if not payload_text:
@@ -842,120 +1809,923 @@ def load_data(
         payload_text = row.get("payload")
         if not payload_text:
             return False
-    try:
-        payload = json.loads(payload_text)
-    except (TypeError, json.JSONDecodeError):
+    payload = _decode_snapshot(payload_text)
+    if payload is None:
         return False
+    if replay_journal:
+        _replay_state_journal(payload)
     _load_state(payload)
-    if persist_after:
-        save_data(source="auto", record_history=False)
+    if persist_after or (replay_journal and STATE_PERSISTENCE_MODE == "sqlite"):
+        # In sqlite mode this also migrates a key-value snapshot into the tables.
+        _write_state_changes((), full_save=True)
     return True
 
 
-def _persist_state_change():
-    save_data(source="auto", record_history=False)
-
+# Collections that journal deltas address by id. List-backed entities map to
+# the counter that must stay ahead of every replayed id.
+_JOURNAL_LIST_ENTITIES = {
+    "submissions": "next_submission_id",
+    "appointment_slots": "next_slot_id",
+    "dog_breeds": "next_dog_breed_id",
+    "coverage_areas": "next_coverage_area_id",
+    "certificates": "next_certificate_id",
+}
+_JOURNAL_DICT_ENTITIES = {"visitor_stats", "chat_conversations"}
 
-def _write_state_backup(source: str = "manual") -> Optional[dict]:
-    """Persist the serialized state to the managed store."""
 
-    state_payload = _serialize_state()
-    result = save_data(source=source, record_history=True, state_payload=state_payload)
-    if not result:
-        return None
-    if os.environ.get("DOG_WALKING_BACKUP_DB_PATH"):
-        _write_sqlite_backup(result.get("payload") or state_payload, source)
-    return result
+def _state_delta(entity: str, entity_id=None, fields: Optional[dict] = None, *, op: str = "upsert") -> dict:
+    """Describe a single change to the persisted state for the journal."""
 
+    return {"op": op, "entity": entity, "id": entity_id, "fields": fields or {}}
 
-def _write_sqlite_backup(state_payload: dict, source: str):
-    """Mirror the persisted state to a local sqlite file or R2 when requested."""
 
-    backup_path = _state_backup_db_path()
-    local_backup_path = os.environ.get("DOG_WALKING_BACKUP_DB_PATH")
-    payload_text = json.dumps(state_payload, indent=2)
+def _submission_delta(submission: dict) -> dict:
+    return _state_delta("submissions", submission.get("id"), dict(submission))
 
-    # When a local path is provided, persist the snapshot there for easy restores.
-    if local_backup_path:
-        backup_path = local_backup_path
-        try:
-            directory = os.path.dirname(backup_path)
-            if directory:
-                os.makedirs(directory, exist_ok=True)
-            with sqlite3.connect(backup_path) as connection:
-                connection.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS state_backups (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        saved_at TEXT,
-                        source TEXT,
-                        payload TEXT
-                    )
-                    """
-                )
-                connection.execute(
-                    "INSERT INTO state_backups (saved_at, source, payload) VALUES (?, ?, ?)",
-                    (
-                        state_payload.get("saved_at"),
-                        source or "manual",
-                        payload_text,
-                    ),
-                )
-                connection.commit()
-            return backup_path
-        except (OSError, sqlite3.DatabaseError):
-            app.logger.warning("Unable to write admin export because local storage is not available")
 
-    result = _r2_upload(backup_path, payload_text.encode("utf-8"), content_type="application/json")
-    if not result:
-        app.logger.warning("Unable to mirror backup to R2 key %s", backup_path)
-        return None
-    return result
+def _slot_delta(slot: dict) -> dict:
+    _bump_slot_version(slot)
+    return _state_delta("appointment_slots", slot.get("id"), _serialize_slot_row(slot))
 
 
-def _serialize_datetime(value):
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return value
+def _conversation_delta(visitor_id: str, *, include_messages: bool = False) -> dict:
+    conversation = chat_conversations.get(visitor_id)
+    if not conversation:
+        return _state_delta("chat_conversations", visitor_id, op="delete")
+    return _state_delta(
+        "chat_conversations",
+        visitor_id,
+        _serialize_conversation_row(visitor_id, conversation, include_messages=include_messages),
+    )
 
 
-def _parse_datetime(value):
-    if not value:
-        return None
-    if isinstance(value, datetime):
-        return value
-    try:
-        return datetime.fromisoformat(value)
-    except (TypeError, ValueError):
-        return None
+def _chat_message_delta(message: dict) -> dict:
+    return _state_delta("chat_messages", message.get("id"), dict(message))
 
 
-def _coerce_int(value, default: int) -> int:
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return default
+def _settings_delta(*keys: str) -> dict:
+    return _state_delta("settings", fields=_serialize_settings(*keys))
 
 
-def _get_photo_url(key: str) -> str:
-    meta = SITE_PHOTO_DEFAULTS.get(key)
-    if not meta:
-        return ""
-    current = site_photos.get(key)
-    return current or meta["default_url"]
+def _apply_state_delta(state: dict, delta: dict):
+    """Apply one journal delta to a serialized state payload in place."""
 
+    op = delta.get("op") or "upsert"
+    entity = delta.get("entity")
+    entity_id = delta.get("id")
+    fields = delta.get("fields") if isinstance(delta.get("fields"), dict) else {}
 
-def _site_photo_rows():
-    rows = []
-    for key, meta in SITE_PHOTO_DEFAULTS.items():
-        current = _get_photo_url(key) or meta["default_url"]
-        default_url = meta["default_url"]
-        group_key = meta.get("group", "site")
-        try:
-            group_order = SITE_PHOTO_GROUP_ORDER.index(group_key)
-        except ValueError:
-            group_order = len(SITE_PHOTO_GROUP_ORDER)
-        rows.append(
+    if entity == "settings":
+        state.update(fields)
+        return
+    if entity == "blocked_ips":
+        blocked = [ip for ip in state.get("blocked_ips") or [] if ip != entity_id]
+        if op != "delete":
+            blocked.append(entity_id)
+        state["blocked_ips"] = blocked
+        return
+    if entity == "chat_messages":
+        visitor_id = fields.get("visitor_id")
+        conversations = state.setdefault("chat_conversations", {})
+        conversation = conversations.setdefault(
+            visitor_id,
+            {
+                "visitor_id": visitor_id,
+                "ip_address": fields.get("visitor_ip"),
+                "created_at": fields.get("timestamp"),
+                "last_message_at": fields.get("timestamp"),
+                "messages": [],
+            },
+        )
+        messages = [row for row in conversation.get("messages") or [] if row.get("id") != entity_id]
+        if op != "delete":
+            messages.append(fields)
+        conversation["messages"] = messages
+        state["next_chat_message_id"] = max(
+            _coerce_int(state.get("next_chat_message_id"), 1),
+            _coerce_int(entity_id, 0) + 1,
+        )
+        return
+    if entity in _JOURNAL_DICT_ENTITIES:
+        rows = state.setdefault(entity, {})
+        if op == "delete":
+            rows.pop(entity_id, None)
+            return
+        row = rows.setdefault(entity_id, {})
+        row.update(fields)
+        return
+    if entity in _JOURNAL_LIST_ENTITIES:
+        rows = [row for row in state.get(entity) or [] if row.get("id") != entity_id]
+        if op != "delete":
+            existing = next((row for row in state.get(entity) or [] if row.get("id") == entity_id), {})
+            merged = dict(existing)
+            merged.update(fields)
+            rows.append(merged)
+            counter_key = _JOURNAL_LIST_ENTITIES[entity]
+            state[counter_key] = max(
+                _coerce_int(state.get(counter_key), 1),
+                _coerce_int(entity_id, 0) + 1,
+            )
+        state[entity] = rows
+        return
+    app.logger.warning("Ignoring journal delta for unknown entity %s", entity)
+
+
+def _replay_state_journal(state: dict) -> int:
+    """Apply every pending journal delta on top of a loaded snapshot."""
+
+    replayed = 0
+    for raw_value in _kv_lrange(_state_journal_key()):
+        try:
+            delta = json.loads(raw_value)
+        except (TypeError, json.JSONDecodeError):
+            app.logger.warning("Skipping unreadable state journal entry")
+            continue
+        if not isinstance(delta, dict):
+            continue
+        _apply_state_delta(state, delta)
+        replayed += 1
+    return replayed
+
+
+def _append_state_journal(changes) -> bool:
+    """Append deltas to the journal; return False when a compaction is due."""
+
+    lines = [json.dumps(change, separators=(",", ":")) for change in changes]
+    try:
+        with _state_storage_lock:
+            journal_length = _kv_rpush(_state_journal_key(), *lines)
+    except Exception as exc:  # pylint: disable=broad-except
+        app.logger.exception("Failed to append state journal: %s", exc)
+        return False
+    return journal_length < STATE_JOURNAL_COMPACT_EVERY
+
+
+def _write_state_changes(changes, *, full_save: bool = False) -> bool:
+    """Write changes to storage right away; return True when they were stored."""
+
+    if STATE_PERSISTENCE_MODE == "sqlite":
+        if changes and not full_save:
+            return _state_db_apply_changes(changes)
+        return _state_db_store_state()
+    if STATE_PERSISTENCE_MODE == "journal" and changes and not full_save:
+        if _append_state_journal(changes):
+            return True
+    return save_data(source="auto", record_history=False) is not None
+
+
+def _persist_state_change(*changes):
+    """Persist a state mutation.
+
+    Callers describe what changed with ``_state_delta`` helpers. In journal mode
+    those deltas are appended to the change log; without deltas (or in snapshot
+    mode) the full state is rewritten, which also compacts the journal. When
+    write-behind is enabled the change is only queued for the background writer.
+    """
+
+    _bump_content_versions(changes)
+    if STATE_WRITE_BEHIND_INTERVAL > 0:
+        _queue_state_changes(changes)
+        return
+    _write_state_changes(changes, full_save=not changes)
+
+
+def _queue_state_changes(changes):
+    global _write_behind_full_save, _write_behind_dirty_since
+
+    with _write_behind_condition:
+        if changes:
+            _write_behind_pending.extend(changes)
+        else:
+            _write_behind_full_save = True
+        if _write_behind_dirty_since is None:
+            _write_behind_dirty_since = time.monotonic()
+        _ensure_write_behind_worker()
+        _write_behind_condition.notify()
+
+
+def _ensure_write_behind_worker():
+    global _write_behind_thread
+
+    if _write_behind_thread is not None and _write_behind_thread.is_alive():
+        return
+    _write_behind_thread = threading.Thread(
+        target=_write_behind_loop,
+        name="state-write-behind",
+        daemon=True,
+    )
+    _write_behind_thread.start()
+
+
+def _write_behind_loop():
+    while True:
+        with _write_behind_condition:
+            while _write_behind_dirty_since is None:
+                _write_behind_condition.wait()
+        # Coalesce bursts: wait out the rest of the interval since the last
+        # flush so storage sees at most one write per interval.
+        last_flush = write_behind_status.get("last_flush_monotonic") or 0.0
+        delay = last_flush + STATE_WRITE_BEHIND_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        flush_pending_state_changes()
+
+
+def flush_pending_state_changes() -> bool:
+    """Write every queued change to storage; safe to call from any thread."""
+
+    global _write_behind_full_save, _write_behind_dirty_since
+
+    with _write_behind_flush_lock:
+        with _write_behind_condition:
+            if _write_behind_dirty_since is None:
+                return True
+            changes = list(_write_behind_pending)
+            full_save = _write_behind_full_save
+            _write_behind_pending.clear()
+            _write_behind_full_save = False
+            _write_behind_dirty_since = None
+        try:
+            stored = _write_state_changes(changes, full_save=full_save)
+            error = None if stored else "State could not be written to storage."
+        except Exception as exc:  # pylint: disable=broad-except
+            stored = False
+            error = str(exc)
+        write_behind_status.update(
+            {
+                "last_flush_at": datetime.utcnow(),
+                "last_flush_monotonic": time.monotonic(),
+                "last_flush_changes": len(changes),
+                "last_error": error,
+            }
+        )
+        if stored:
+            write_behind_status["flush_count"] += 1
+            return True
+        # Keep the state dirty so the next pass retries with a full rewrite.
+        with _write_behind_condition:
+            _write_behind_full_save = True
+            if _write_behind_dirty_since is None:
+                _write_behind_dirty_since = time.monotonic()
+            _write_behind_condition.notify()
+        return False
+
+
+def _write_behind_summary() -> dict:
+    with _write_behind_condition:
+        dirty_since = _write_behind_dirty_since
+        pending_count = len(_write_behind_pending) + (1 if _write_behind_full_save else 0)
+    lag_seconds = time.monotonic() - dirty_since if dirty_since is not None else 0.0
+    last_flush_at = write_behind_status.get("last_flush_at")
+    return {
+        "enabled": STATE_WRITE_BEHIND_INTERVAL > 0,
+        "interval_seconds": STATE_WRITE_BEHIND_INTERVAL,
+        "pending_changes": pending_count,
+        "lag_seconds": round(lag_seconds, 2),
+        "last_flush_label": _format_backup_history_timestamp(last_flush_at) if last_flush_at else None,
+        "last_flush_changes": write_behind_status.get("last_flush_changes"),
+        "last_error": write_behind_status.get("last_error"),
+        "flush_count": write_behind_status.get("flush_count", 0),
+    }
+
+
+def _flush_on_shutdown() -> bool:
+    """Merge queued visits, then write every pending change before exiting."""
+
+    try:
+        _flush_visits()
+    except Exception as exc:  # pylint: disable=broad-except
+        app.logger.exception("Queued visits could not be merged on shutdown: %s", exc)
+    return flush_pending_state_changes()
+
+
+def _install_shutdown_hooks():
+    atexit.register(_flush_on_shutdown)
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous_handler = signal.getsignal(signal.SIGTERM)
+
+    def _flush_then_exit(signum, frame):
+        _flush_on_shutdown()
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+        elif previous_handler != signal.SIG_IGN:
+            raise SystemExit(128 + signum)
+
+    try:
+        signal.signal(signal.SIGTERM, _flush_then_exit)
+    except ValueError:  # pragma: no cover - not the main interpreter thread
+        pass
+
+
+def _write_state_backup(source: str = "manual") -> Optional[dict]:
+    """Persist the serialized state to the managed store."""
+
+    result = save_data(source=source, record_history=True)
+    if not result:
+        return None
+    if os.environ.get("DOG_WALKING_BACKUP_DB_PATH"):
+        _write_sqlite_backup(result["payload"], source, payload_json=result.get("payload_json"))
+    retention = _apply_backup_retention()
+    if retention["pruned"]:
+        _persist_state_change(_settings_delta("backup_history"))
+    result["retention"] = retention
+    return result
+
+
+def _write_sqlite_backup(state_payload: dict, source: str, *, payload_json: Optional[str] = None):
+    """Mirror the persisted state to a local sqlite file or R2 when requested."""
+
+    backup_path = _state_backup_db_path()
+    local_backup_path = os.environ.get("DOG_WALKING_BACKUP_DB_PATH")
+    payload_text = payload_json or _snapshot_json(state_payload)
+
+    # When a local path is provided, persist the snapshot there for easy restores.
+    if local_backup_path:
+        backup_path = local_backup_path
+        try:
+            directory = os.path.dirname(backup_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with sqlite3.connect(backup_path) as connection:
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS state_backups (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        saved_at TEXT,
+                        source TEXT,
+                        payload TEXT
+                    )
+                    """
+                )
+                connection.execute(
+                    "INSERT INTO state_backups (saved_at, source, payload) VALUES (?, ?, ?)",
+                    (
+                        state_payload.get("saved_at"),
+                        source or "manual",
+                        payload_text,
+                    ),
+                )
+                connection.commit()
+            return backup_path
+        except (OSError, sqlite3.DatabaseError):
+            app.logger.warning("Unable to write admin export because local storage is not available")
+
+    result = _r2_upload(backup_path, _compress_snapshot_bytes(payload_text))
+    if not result:
+        app.logger.warning("Unable to mirror backup to R2 key %s", backup_path)
+        return None
+    return result
+
+
+_STATE_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_status ON submissions (status);
+CREATE TABLE IF NOT EXISTS appointment_slots (
+    id INTEGER PRIMARY KEY,
+    start TEXT,
+    is_booked INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS appointment_slots_start ON appointment_slots (start);
+CREATE INDEX IF NOT EXISTS appointment_slots_booked ON appointment_slots (is_booked, start);
+CREATE TABLE IF NOT EXISTS chat_conversations (
+    visitor_id TEXT PRIMARY KEY,
+    last_message_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chat_conversations_last_message ON chat_conversations (last_message_at);
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY,
+    visitor_id TEXT NOT NULL,
+    seen_by_admin INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chat_messages_visitor ON chat_messages (visitor_id, id);
+CREATE INDEX IF NOT EXISTS chat_messages_unseen ON chat_messages (seen_by_admin, visitor_id);
+CREATE TABLE IF NOT EXISTS visitor_stats (
+    ip_address TEXT PRIMARY KEY,
+    last_visit TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS visitor_stats_last_visit ON visitor_stats (last_visit);
+CREATE TABLE IF NOT EXISTS dog_breeds (
+    id INTEGER PRIMARY KEY,
+    name TEXT COLLATE NOCASE,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dog_breeds_name ON dog_breeds (name);
+CREATE TABLE IF NOT EXISTS coverage_areas (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS certificates (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocked_ips (
+    ip_address TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS state_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO state_meta (key, value) VALUES ('version', 0);
+"""
+
+# Entity -> (table, key column, indexed columns pulled out of the row).
+_STATE_DB_TABLES = {
+    "submissions": ("submissions", "id", {"status": lambda row: row.get("status")}),
+    "appointment_slots": (
+        "appointment_slots",
+        "id",
+        {
+            "start": lambda row: _serialize_datetime(row.get("start")),
+            "is_booked": lambda row: 1 if row.get("is_booked") else 0,
+        },
+    ),
+    "chat_conversations": (
+        "chat_conversations",
+        "visitor_id",
+        {"last_message_at": lambda row: _serialize_datetime(row.get("last_message_at"))},
+    ),
+    "chat_messages": (
+        "chat_messages",
+        "id",
+        {
+            "visitor_id": lambda row: row.get("visitor_id") or "",
+            "seen_by_admin": lambda row: 1 if row.get("seen_by_admin") else 0,
+        },
+    ),
+    "visitor_stats": (
+        "visitor_stats",
+        "ip_address",
+        {"last_visit": lambda row: _serialize_datetime(row.get("last_visit"))},
+    ),
+    "dog_breeds": ("dog_breeds", "id", {"name": lambda row: row.get("name")}),
+    "coverage_areas": ("coverage_areas", "id", {}),
+    "certificates": ("certificates", "id", {}),
+}
+# Upserts that must not overwrite a row another worker moved on. Bookings
+# never revert, so a stale copy of an open slot cannot un-book it.
+_STATE_DB_UPSERT_GUARDS = {
+    "appointment_slots": "appointment_slots.is_booked = 0 OR excluded.is_booked = 1",
+}
+_STATE_DB_COUNTERS = dict(_JOURNAL_LIST_ENTITIES, chat_messages="next_chat_message_id")
+
+
+def _state_db_path() -> str:
+    if STATE_SQLITE_PATH:
+        return STATE_SQLITE_PATH
+    for directory in _backup_directory_candidates():
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError:
+            continue
+        return os.path.join(directory, STATE_PRIMARY_DB_FILENAME)
+    return STATE_PRIMARY_DB_FILENAME
+
+
+def _state_db_connection() -> sqlite3.Connection:
+    """Return this thread's connection to the primary state database."""
+
+    path = _state_db_path()
+    connection = getattr(_state_db_local, "connection", None)
+    if connection is not None and getattr(_state_db_local, "path", None) == path:
+        return connection
+    if connection is not None:
+        connection.close()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Autocommit mode: _state_db_commit issues BEGIN IMMEDIATE/COMMIT itself.
+    connection = sqlite3.connect(path, timeout=STATE_SQLITE_BUSY_TIMEOUT, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_STATE_DB_SCHEMA)
+    _state_db_local.connection = connection
+    _state_db_local.path = path
+    return connection
+
+
+def _close_state_db_connection():
+    connection = getattr(_state_db_local, "connection", None)
+    if connection is not None:
+        connection.close()
+    _state_db_local.connection = None
+    _state_db_local.path = None
+
+
+def _state_db_upsert(connection, entity: str, entity_id, fields: dict):
+    table, key_column, columns = _STATE_DB_TABLES[entity]
+    names = [key_column, *columns, "data"]
+    values = [entity_id, *(extract(fields) for extract in columns.values()), json.dumps(fields)]
+    # Constant SQL per table, so sqlite3's statement cache reuses the prepared statement.
+    sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})"
+    guard = _STATE_DB_UPSERT_GUARDS.get(entity)
+    if guard:
+        assignments = ", ".join(f"{name} = excluded.{name}" for name in names[1:])
+        sql += f" ON CONFLICT ({key_column}) DO UPDATE SET {assignments} WHERE {guard}"
+    else:
+        sql = sql.replace("INSERT", "INSERT OR REPLACE", 1)
+    connection.execute(sql, values)
+
+
+def _state_db_write_settings(connection, settings: dict):
+    connection.executemany(
+        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+        [(key, json.dumps(value)) for key, value in settings.items()],
+    )
+
+
+def _state_db_apply_delta(connection, delta: dict):
+    op = delta.get("op") or "upsert"
+    entity = delta.get("entity")
+    entity_id = delta.get("id")
+    fields = dict(delta.get("fields")) if isinstance(delta.get("fields"), dict) else {}
+
+    if entity == "settings":
+        _state_db_write_settings(connection, fields)
+        return
+    if entity == "blocked_ips":
+        if op == "delete":
+            connection.execute("DELETE FROM blocked_ips WHERE ip_address = ?", (entity_id,))
+        else:
+            connection.execute("INSERT OR IGNORE INTO blocked_ips (ip_address) VALUES (?)", (entity_id,))
+        return
+    if entity not in _STATE_DB_TABLES:
+        app.logger.warning("Ignoring state database change for unknown entity %s", entity)
+        return
+    table, key_column, _ = _STATE_DB_TABLES[entity]
+    if op == "delete":
+        connection.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (entity_id,))
+        if entity == "chat_conversations":
+            connection.execute("DELETE FROM chat_messages WHERE visitor_id = ?", (entity_id,))
+        return
+    if entity == "chat_conversations":
+        messages = fields.pop("messages", None)
+        if messages is not None:
+            connection.execute("DELETE FROM chat_messages WHERE visitor_id = ?", (entity_id,))
+            for message in messages:
+                _state_db_upsert(connection, "chat_messages", message.get("id"), dict(message))
+    _state_db_upsert(connection, entity, entity_id, fields)
+
+
+def _state_db_apply_changes(changes) -> bool:
+    """Apply journal-style deltas as row upserts in a single transaction."""
+
+    def write(connection):
+        for change in changes:
+            _state_db_apply_delta(connection, change)
+
+    try:
+        with _state_storage_lock:
+            # Row upserts from different workers touch disjoint rows, so they
+            # commit unconditionally and only advance the shared version.
+            _state_db_commit(write)
+    except (OSError, sqlite3.DatabaseError) as exc:
+        app.logger.exception("Failed to write state changes to the database: %s", exc)
+        return False
+    return True
+
+
+def _state_db_claim_slot(slot_row: dict) -> bool:
+    """Book a slot row only if no other worker has booked it yet."""
+
+    def write(connection):
+        cursor = connection.execute(
+            "UPDATE appointment_slots SET is_booked = 1, data = ? WHERE id = ? AND is_booked = 0",
+            (json.dumps(slot_row), slot_row["id"]),
+        )
+        if cursor.rowcount == 1:
+            return True
+        exists = connection.execute("SELECT 1 FROM appointment_slots WHERE id = ?", (slot_row["id"],)).fetchone()
+        if exists:
+            return False
+        # The slot itself has not reached the database yet (write-behind).
+        _state_db_upsert(connection, "appointment_slots", slot_row["id"], slot_row)
+        return True
+
+    with _state_storage_lock:
+        return _state_db_commit(write) is not None
+
+
+def _state_db_version(connection=None) -> int:
+    connection = connection or _state_db_connection()
+    (version,) = connection.execute("SELECT value FROM state_meta WHERE key = 'version'").fetchone()
+    return version
+
+
+def _state_db_commit(write, *, expected_version: Optional[int] = None, replaces_state: bool = False) -> Optional[int]:
+    """Run ``write`` in one write transaction and bump the shared state version.
+
+    With ``expected_version`` the write is a compare-and-set: it is rolled back
+    and None is returned when another worker committed in the meantime. A
+    ``write`` that returns False is rolled back the same way.
+    """
+
+    global _state_db_seen_version
+
+    connection = _state_db_connection()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        version = _state_db_version(connection)
+        if expected_version is not None and version != expected_version:
+            connection.execute("ROLLBACK")
+            return None
+        if write(connection) is False:
+            connection.execute("ROLLBACK")
+            return None
+        connection.execute("UPDATE state_meta SET value = ? WHERE key = 'version'", (version + 1,))
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    # Only advance when nothing from another worker landed in between;
+    # otherwise the next request reloads and picks up both.
+    if replaces_state or _state_db_seen_version == version:
+        _state_db_seen_version = version + 1
+    generation = getattr(_state_db_local, "generation", _state_reload_generation)
+    if not replaces_state and generation != _state_reload_generation:
+        # Another thread reloaded while this one was changing rows, so the
+        # globals no longer hold what was just written; reload on next check.
+        _state_db_seen_version = None
+        _state_change_event.set()
+    _notify_state_change()
+    return version + 1
+
+
+def _state_db_store_state(state: Optional[dict] = None) -> bool:
+    """Replace every table with the given (or current) serialized state."""
+
+    def write(connection):
+        for table in (*(table for table, _, _ in _STATE_DB_TABLES.values()), "blocked_ips", "settings"):
+            connection.execute(f"DELETE FROM {table}")
+        for entity in ("submissions", "appointment_slots", "dog_breeds", "coverage_areas", "certificates"):
+            for row in state.get(entity) or []:
+                if isinstance(row, dict):
+                    _state_db_upsert(connection, entity, row.get("id"), dict(row))
+        for entity in ("visitor_stats", "chat_conversations"):
+            for entity_id, row in (state.get(entity) or {}).items():
+                if isinstance(row, dict):
+                    _state_db_apply_delta(connection, _state_delta(entity, entity_id, row))
+        connection.executemany(
+            "INSERT OR IGNORE INTO blocked_ips (ip_address) VALUES (?)",
+            [(ip,) for ip in state.get("blocked_ips") or []],
+        )
+        settings_keys = set(_serialize_settings()) | set(_STATE_DB_COUNTERS.values())
+        _state_db_write_settings(
+            connection,
+            {key: state.get(key) for key in settings_keys if key in state},
+        )
+
+    try:
+        with _state_storage_lock:
+            state = state or _serialize_state()
+            # A full rewrite would clobber rows other workers changed since we
+            # last loaded, so it only commits against the version we have seen.
+            version = _state_db_commit(write, expected_version=_state_db_seen_version, replaces_state=True)
+    except (OSError, sqlite3.DatabaseError) as exc:
+        app.logger.exception("Failed to write state to the database: %s", exc)
+        return False
+    if version is None:
+        app.logger.warning("State changed in another worker; reloading instead of overwriting it")
+        _refresh_shared_state(force=True)
+        return False
+    return True
+
+
+def _state_db_read_tables(connection) -> Optional[dict]:
+    settings = {key: json.loads(value) for key, value in connection.execute("SELECT key, value FROM settings")}
+    if not settings:
+        return None
+    state = dict(settings)
+
+    def rows(entity, order_by):
+        table, _, _ = _STATE_DB_TABLES[entity]
+        return [json.loads(data) for (data,) in connection.execute(f"SELECT data FROM {table} ORDER BY {order_by}")]
+
+    for entity in ("submissions", "dog_breeds", "coverage_areas", "certificates"):
+        state[entity] = rows(entity, "id")
+    state["appointment_slots"] = rows("appointment_slots", "start")
+    state["visitor_stats"] = {
+        ip_address: json.loads(data)
+        for ip_address, data in connection.execute("SELECT ip_address, data FROM visitor_stats")
+    }
+    conversations = {
+        visitor_id: dict(json.loads(data), messages=[])
+        for visitor_id, data in connection.execute("SELECT visitor_id, data FROM chat_conversations")
+    }
+    for visitor_id, data in connection.execute(
+        "SELECT visitor_id, data FROM chat_messages ORDER BY visitor_id, id"
+    ):
+        if visitor_id in conversations:
+            conversations[visitor_id]["messages"].append(json.loads(data))
+    state["chat_conversations"] = conversations
+    state["blocked_ips"] = [ip for (ip,) in connection.execute("SELECT ip_address FROM blocked_ips")]
+    for entity, counter_key in _STATE_DB_COUNTERS.items():
+        table, _, _ = _STATE_DB_TABLES[entity]
+        (max_id,) = connection.execute(f"SELECT MAX(id) FROM {table}").fetchone()
+        state[counter_key] = max(_coerce_int(state.get(counter_key), 1), (max_id or 0) + 1)
+    state["state_version"] = _state_db_version(connection)
+    return state
+
+
+def _state_db_load_state() -> Optional[dict]:
+    """Assemble a serialized state payload from the tables, or None when empty.
+
+    The payload carries the ``state_version`` it was read at.
+    """
+
+    try:
+        connection = _state_db_connection()
+        # One read transaction so the rows and the version are a consistent snapshot.
+        connection.execute("BEGIN")
+        try:
+            return _state_db_read_tables(connection)
+        finally:
+            connection.execute("COMMIT")
+    except (OSError, sqlite3.DatabaseError, ValueError) as exc:
+        app.logger.exception("Failed to read state from the database: %s", exc)
+        return None
+
+
+def _state_db_data_changed() -> bool:
+    """Cheap check for commits by other connections since this thread last looked."""
+
+    (data_version,) = _state_db_connection().execute("PRAGMA data_version").fetchone()
+    changed = getattr(_state_db_local, "data_version", None) != data_version
+    _state_db_local.data_version = data_version
+    return changed
+
+
+def _apply_state_db_snapshot(state: dict):
+    global _state_db_seen_version, _state_reload_generation
+
+    _load_state(state)
+    _state_db_seen_version = state.get("state_version")
+    _state_reload_generation += 1
+    _state_db_local.generation = _state_reload_generation
+    # Other workers may also have rewritten shared key-value entries.
+    _kv_cache_invalidate()
+
+
+def _refresh_shared_state(*, force: bool = False) -> bool:
+    """Reload the in-memory state when another worker changed the database.
+
+    The tables are read and swapped in under ``_state_storage_lock``, so no
+    local commit can land in between and be skipped by the new version.
+    """
+
+    if STATE_PERSISTENCE_MODE != "sqlite":
+        return False
+    _state_db_local.generation = _state_reload_generation
+    if STATE_NOTIFY_DIR and not force:
+        _ensure_state_change_listener()
+        if not _state_change_event.is_set():
+            return False
+    _state_change_event.clear()
+    try:
+        if _state_db_seen_version is not None and not _state_db_data_changed() and not force:
+            return False
+        version = _state_db_version()
+    except sqlite3.DatabaseError as exc:
+        app.logger.warning("Unable to check the shared state version: %s", exc)
+        return False
+    if version == _state_db_seen_version:
+        return False
+    if not force:
+        # Queued local changes must land before they are replaced by the reload.
+        flush_pending_state_changes()
+    with _state_storage_lock:
+        state = _state_db_load_state()
+        if state is None or state.get("state_version") == _state_db_seen_version:
+            return False
+        _apply_state_db_snapshot(state)
+    return True
+
+
+def _state_notify_socket_path(pid: Optional[int] = None) -> str:
+    return os.path.join(STATE_NOTIFY_DIR, f"worker-{pid or os.getpid()}.sock")
+
+
+def _ensure_state_change_listener():
+    """Bind this worker's notification socket (once per process, after fork)."""
+
+    global _state_change_listener_pid
+
+    if not STATE_NOTIFY_DIR or _state_change_listener_pid == os.getpid():
+        return
+    path = _state_notify_socket_path()
+    try:
+        os.makedirs(STATE_NOTIFY_DIR, exist_ok=True)
+        if os.path.exists(path):
+            os.unlink(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        listener.bind(path)
+    except OSError as exc:
+        app.logger.warning("Unable to listen for state change notifications: %s", exc)
+        return
+    _state_change_listener_pid = os.getpid()
+    threading.Thread(
+        target=_state_change_listen,
+        args=(listener,),
+        name="state-change-listener",
+        daemon=True,
+    ).start()
+    # Anything committed before the socket existed was never announced.
+    _state_change_event.set()
+
+
+def _state_change_listen(listener):
+    while True:
+        try:
+            listener.recv(64)
+        except OSError:
+            return
+        _state_change_event.set()
+
+
+def _notify_state_change():
+    """Tell every other worker that the shared state version moved."""
+
+    if not STATE_NOTIFY_DIR:
+        return
+    own_path = _state_notify_socket_path()
+    try:
+        names = os.listdir(STATE_NOTIFY_DIR)
+    except OSError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+        sender.setblocking(False)
+        for name in names:
+            path = os.path.join(STATE_NOTIFY_DIR, name)
+            if not name.endswith(".sock") or path == own_path:
+                continue
+            try:
+                sender.sendto(b"1", path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker is gone; drop its socket file.
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except OSError:
+                # A full receive queue already means "changed".
+                continue
+
+
+def _serialize_datetime(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _parse_datetime(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _coerce_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _get_photo_url(key: str) -> str:
+    meta = SITE_PHOTO_DEFAULTS.get(key)
+    if not meta:
+        return ""
+    current = site_photos.get(key)
+    return current or meta["default_url"]
+
+
+def _site_photo_rows():
+    rows = []
+    for key, meta in SITE_PHOTO_DEFAULTS.items():
+        current = _get_photo_url(key) or meta["default_url"]
+        default_url = meta["default_url"]
+        group_key = meta.get("group", "site")
+        try:
+            group_order = SITE_PHOTO_GROUP_ORDER.index(group_key)
+        except ValueError:
+            group_order = len(SITE_PHOTO_GROUP_ORDER)
+        rows.append(
             {
                 "key": key,
                 "label": meta["label"],
@@ -1061,135 +2831,456 @@ def _classify_weather(summary: str) -> str:
     return "unknown"
 
 
-def _cleanup_expired_slots() -> bool:
-    """Remove past appointment slots that were never booked."""
+def _cleanup_expired_slots() -> list:
+    """Remove past appointment slots that were never booked; return their ids."""
+
+    expired = _slot_calendar.remove_open_before(datetime.utcnow())
+    for slot in expired:
+        _slot_index.removed(slot)
+    return [slot["id"] for slot in expired]
+
+
+def _refresh_future_weather(now: datetime) -> list:
+    """Ensure upcoming slots carry a weather forecast; return the slots changed."""
+
+    updated = []
+    forecast = None
+
+    for slot in _slot_calendar.between(now, None):
+        weather = slot.get("weather")
+        if not isinstance(weather, dict) or weather.get("status") in (None, "", "unknown", "pending"):
+            if forecast is None:
+                # One cached forecast annotates every slot in this pass.
+                forecast = _load_tameside_forecast()
+            annotated = _forecast_for(slot["start"], forecast)
+            if annotated != weather:
+                slot["weather"] = annotated
+                updated.append(slot)
+
+    return updated
+
+
+def _load_tameside_forecast():
+    """Return the cached ``(timestamps, entries)`` forecast, fetching it when stale.
+
+    Returns a weather dict describing the failure instead when no forecast is
+    available. Concurrent callers share one download.
+    """
+
+    global _forecast_cache
+
+    api_key = _weather_api_key()
+    if not api_key:
+        return {"status": "unknown", "summary": "Weather lookup unavailable (missing API key)."}
+
+    def cached():
+        entry = _forecast_cache
+        if entry and entry["api_key"] == api_key and time.monotonic() < entry["expires"]:
+            return entry["forecast"]
+        return None
+
+    forecast = cached()
+    if forecast is not None:
+        forecast_cache_stats["hits"] += 1
+        return forecast
+    with _forecast_fetch_lock:
+        # Another thread may have refreshed it while we waited.
+        forecast = cached()
+        if forecast is not None:
+            forecast_cache_stats["hits"] += 1
+            return forecast
+        forecast_cache_stats["misses"] += 1
+        forecast, ttl = _download_tameside_forecast(api_key), WEATHER_FORECAST_TTL
+        if isinstance(forecast, dict):
+            forecast_cache_stats["errors"] += 1
+            # Remember failures briefly so an outage is not retried per slot.
+            ttl = WEATHER_FORECAST_RETRY_AFTER
+        _forecast_cache = {
+            "api_key": api_key,
+            "forecast": forecast,
+            "expires": time.monotonic() + ttl,
+            "fetched_at": datetime.utcnow(),
+        }
+        return forecast
+
+
+def _download_tameside_forecast(api_key: str):
+    query = urllib.parse.quote(WEATHER_LOCATION_QUERY)
+    url = f"{WEATHER_FORECAST_URL}?q={query}&appid={api_key}&units=metric"
+    request = urllib.request.Request(url, headers={"User-Agent": "HappyTrails/1.0"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, ValueError, json.JSONDecodeError):
+        return {"status": "unknown", "summary": "Weather lookup unavailable."}
+
+    entries = sorted(
+        (entry for entry in payload.get("list") or [] if isinstance(entry.get("dt"), (int, float))),
+        key=lambda entry: entry["dt"],
+    )
+    if not entries:
+        return {"status": "unknown", "summary": "Weather data unavailable."}
+    return [int(entry["dt"]) for entry in entries], entries
+
+
+def _forecast_for(start: datetime, forecast) -> dict:
+    """Pick the forecast entry nearest to ``start`` with bisect."""
+
+    if isinstance(forecast, dict):
+        return dict(forecast)
+    timestamps, entries = forecast
+    target_timestamp = int(start.replace(tzinfo=timezone.utc).timestamp())
+    position = bisect.bisect_left(timestamps, target_timestamp)
+    candidates = [index for index in (position - 1, position) if 0 <= index < len(entries)]
+    closest_entry = entries[min(candidates, key=lambda index: abs(timestamps[index] - target_timestamp))]
+
+    weather_entries = closest_entry.get("weather") or []
+    primary_weather = weather_entries[0] if weather_entries and isinstance(weather_entries[0], dict) else {}
+    condition_text = (primary_weather.get("description") or "").strip() or "Weather data unavailable"
+    status = _classify_weather(condition_text)
+    return {"status": status, "summary": condition_text}
+
+
+def _fetch_tameside_weather(start: datetime) -> dict:
+    return _forecast_for(start, _load_tameside_forecast())
+
+
+def _pending_weather() -> dict:
+    return {"status": "pending", "summary": "Checking the forecast…"}
+
+
+def _enrich_pending_weather(slot_ids=None, *, persist: bool = True) -> list:
+    """Fill in forecasts for pending slots (all of them when ``slot_ids`` is None)."""
+
+    slots = appointment_slots if slot_ids is None else [_get_slot(slot_id) for slot_id in slot_ids]
+    forecast = None
+    updated = []
+    for slot in slots:
+        if not slot or (slot.get("weather") or {}).get("status") != "pending":
+            continue
+        if forecast is None:
+            forecast = _load_tameside_forecast()
+        slot["weather"] = _forecast_for(slot["start"], forecast)
+        updated.append(slot)
+    if updated and persist:
+        _persist_state_change(*(_slot_delta(slot) for slot in updated))
+    return updated
+
+
+def _queue_weather_enrichment(*slot_ids: int):
+    """Hand slots to the background forecast worker.
+
+    Without background threads nothing would ever pick the slots up, so
+    they are enriched inline instead, as before the worker existed. Call it
+    before persisting the slots; the inline path leaves that to the caller.
+    """
+
+    if not SCHEDULER_ENABLED:
+        _enrich_pending_weather(slot_ids, persist=False)
+        return
+    _ensure_weather_worker()
+    for slot_id in slot_ids:
+        _weather_enrichment_queue.put(slot_id)
+
+
+def _ensure_weather_worker():
+    global _weather_worker_pid
+
+    if _weather_worker_pid == os.getpid():
+        return
+    _weather_worker_pid = os.getpid()
+    threading.Thread(target=_weather_enrichment_loop, name="weather-enrichment", daemon=True).start()
+
+
+def _weather_enrichment_loop():
+    while True:
+        slot_ids = {_weather_enrichment_queue.get()}
+        # Drain whatever queued up meanwhile so one forecast covers the batch.
+        while True:
+            try:
+                slot_ids.add(_weather_enrichment_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _enrich_pending_weather(sorted(slot_ids))
+        except Exception as exc:  # pylint: disable=broad-except
+            app.logger.exception("Weather enrichment failed: %s", exc)
+
+
+def _forecast_cache_summary() -> dict:
+    entry = _forecast_cache
+    lookups = forecast_cache_stats["hits"] + forecast_cache_stats["misses"]
+    fetched_at = entry.get("fetched_at") if entry else None
+    return {
+        "hits": forecast_cache_stats["hits"],
+        "misses": forecast_cache_stats["misses"],
+        "errors": forecast_cache_stats["errors"],
+        "hit_rate": round(100 * forecast_cache_stats["hits"] / lookups, 1) if lookups else 0.0,
+        "ttl_seconds": int(WEATHER_FORECAST_TTL),
+        "entries": len(entry["forecast"][0]) if entry and not isinstance(entry["forecast"], dict) else 0,
+        "fetched_label": _format_backup_history_timestamp(fetched_at) if fetched_at else None,
+    }
+
+
+def _expire_slots_job() -> str:
+    expired_ids = _cleanup_expired_slots()
+    if expired_ids:
+        _persist_state_change(
+            *(_state_delta("appointment_slots", slot_id, op="delete") for slot_id in expired_ids)
+        )
+    return f"Removed {len(expired_ids)} expired slot{'s' if len(expired_ids) != 1 else ''}"
+
+
+def _refresh_weather_job() -> str:
+    updated = _refresh_future_weather(datetime.utcnow())
+    if updated:
+        _persist_state_change(*(_slot_delta(slot) for slot in updated))
+    return f"Updated the forecast for {len(updated)} slot{'s' if len(updated) != 1 else ''}"
+
+
+def _flush_visits_job() -> str:
+    result = _flush_visits()
+    return (
+        f"Merged {result['events']} visit{'s' if result['events'] != 1 else ''} "
+        f"from {result['visitors']} visitor{'s' if result['visitors'] != 1 else ''}"
+    )
+
+
+def _sweep_rate_limits_job() -> str:
+    removed = _sweep_rate_limits()
+    return f"Dropped {removed} idle rate limit bucket{'s' if removed != 1 else ''}"
+
+
+# Periodic background jobs. Intervals are in seconds.
+SCHEDULED_JOBS = {
+    "expire_slots": {
+        "label": "Remove expired open slots",
+        "interval": max(1.0, float(os.environ.get("SLOT_EXPIRY_INTERVAL") or 300)),
+        "run": _expire_slots_job,
+    },
+    "refresh_weather": {
+        "label": "Refresh slot weather",
+        "interval": max(1.0, float(os.environ.get("WEATHER_REFRESH_INTERVAL") or 1800)),
+        "run": _refresh_weather_job,
+    },
+    "flush_visits": {
+        "label": "Merge visitor analytics",
+        "interval": VISITOR_FLUSH_INTERVAL,
+        "run": _flush_visits_job,
+    },
+    "sweep_rate_limits": {
+        "label": "Drop idle rate limit buckets",
+        "interval": RATE_LIMIT_SWEEP_INTERVAL,
+        "run": _sweep_rate_limits_job,
+    },
+}
+scheduled_job_status = {
+    name: {
+        "runs": 0,
+        "skipped": 0,
+        "running": False,
+        "last_started_at": None,
+        "last_duration": None,
+        "last_result": None,
+        "last_error": None,
+        "next_run": 0.0,
+    }
+    for name in SCHEDULED_JOBS
+}
+_scheduled_job_locks = {name: threading.Lock() for name in SCHEDULED_JOBS}
+
+
+def _next_job_run(interval: float) -> float:
+    jitter = interval * SCHEDULER_JITTER
+    return time.monotonic() + interval + random.uniform(-jitter, jitter)
+
+
+def _run_scheduled_job(name: str) -> bool:
+    """Run one job now unless it is already running; True when it ran."""
+
+    job = SCHEDULED_JOBS[name]
+    status = scheduled_job_status[name]
+    lock = _scheduled_job_locks[name]
+    if not lock.acquire(blocking=False):
+        status["skipped"] += 1
+        return False
+    started = time.monotonic()
+    status.update({"running": True, "last_started_at": datetime.utcnow()})
+    try:
+        # Jobs run outside requests, so pick up other workers' changes first.
+        _refresh_shared_state()
+        status["last_result"] = job["run"]()
+        status["last_error"] = None
+    except Exception as exc:  # pylint: disable=broad-except
+        app.logger.exception("Scheduled job %s failed: %s", name, exc)
+        status["last_error"] = str(exc)
+    finally:
+        status.update(
+            {
+                "running": False,
+                "runs": status["runs"] + 1,
+                "last_duration": round(time.monotonic() - started, 3),
+                "next_run": _next_job_run(job["interval"]),
+            }
+        )
+        lock.release()
+    return True
+
+
+def _wake_scheduled_job(name: str):
+    """Ask the scheduler to run a job on its next pass."""
 
-    global appointment_slots
+    scheduled_job_status[name]["next_run"] = 0.0
+    _scheduler_wakeup.set()
 
-    now = datetime.utcnow()
-    retained_slots = []
-    removed = False
 
-    for slot in appointment_slots:
-        start = slot.get("start")
-        if isinstance(start, datetime) and start < now and not slot.get("is_booked"):
-            removed = True
-            continue
-        retained_slots.append(slot)
+def _scheduler_loop():
+    while True:
+        now = time.monotonic()
+        for name in SCHEDULED_JOBS:
+            if scheduled_job_status[name]["next_run"] <= now:
+                _run_scheduled_job(name)
+        next_run = min(status["next_run"] for status in scheduled_job_status.values())
+        _scheduler_wakeup.wait(max(0.0, next_run - time.monotonic()))
+        _scheduler_wakeup.clear()
 
-    if removed:
-        appointment_slots = retained_slots
 
-    return removed
+def _ensure_scheduler():
+    """Start the job thread once per process (after any pre-fork import).
 
+    With the scheduler off, slot expiry runs on the request instead, at most
+    once per ``SLOT_EXPIRY_INTERVAL``, so expired slots still go away.
+    """
 
-def _refresh_future_weather(now: datetime) -> bool:
-    """Ensure upcoming slots carry a weather forecast."""
+    global _scheduler_pid
 
-    updated = False
+    if not SCHEDULER_ENABLED:
+        if scheduled_job_status["expire_slots"]["next_run"] <= time.monotonic():
+            _run_scheduled_job("expire_slots")
+        return
+    if _scheduler_pid == os.getpid():
+        return
+    _scheduler_pid = os.getpid()
+    threading.Thread(target=_scheduler_loop, name="job-scheduler", daemon=True).start()
 
-    for slot in appointment_slots:
-        start = slot.get("start")
-        if not isinstance(start, datetime) or start < now:
-            continue
-        weather = slot.get("weather")
-        if not isinstance(weather, dict) or not weather.get("status") or weather.get("status") == "unknown":
-            slot["weather"] = _fetch_tameside_weather(start)
-            updated = True
 
-    return updated
+def _scheduler_summary() -> list:
+    now = time.monotonic()
+    rows = []
+    for name, job in SCHEDULED_JOBS.items():
+        status = scheduled_job_status[name]
+        started_at = status.get("last_started_at")
+        rows.append(
+            {
+                "name": name,
+                "label": job["label"],
+                "interval_seconds": int(job["interval"]),
+                "runs": status["runs"],
+                "skipped": status["skipped"],
+                "running": status["running"],
+                "last_run_label": _format_backup_history_timestamp(started_at) if started_at else None,
+                "last_duration": status["last_duration"],
+                "last_result": status["last_result"],
+                "last_error": status["last_error"],
+                "next_run_seconds": max(0, int(status["next_run"] - now)) if status["runs"] else None,
+            }
+        )
+    return rows
 
 
-def _fetch_tameside_weather(start: datetime) -> dict:
-    api_key = _weather_api_key()
-    if not api_key:
-        return {"status": "unknown", "summary": "Weather lookup unavailable (missing API key)."}
+def _service_label(value: Optional[str]) -> str:
+    service_key = value if value in BOOKING_SERVICE_TYPES else "walk"
+    return BOOKING_SERVICE_TYPES.get(service_key, BOOKING_SERVICE_TYPES["walk"])["label"]
 
-    query = urllib.parse.quote(WEATHER_LOCATION_QUERY)
-    url = (
-        "https://api.openweathermap.org/data/2.5/forecast"
-        f"?q={query}&appid={api_key}&units=metric"
-    )
-    request = urllib.request.Request(url, headers={"User-Agent": "HappyTrails/1.0"})
-    try:
-        with urllib.request.urlopen(request, timeout=5) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, ValueError, json.JSONDecodeError):
-        return {"status": "unknown", "summary": "Weather lookup unavailable."}
 
-    forecasts = payload.get("list") or []
-    if not forecasts:
-        return {"status": "unknown", "summary": "Weather data unavailable."}
+def _serialize_visitor_row(visitor: dict) -> dict:
+    data = dict(visitor)
+    data["first_visit"] = _serialize_datetime(data.get("first_visit"))
+    data["last_visit"] = _serialize_datetime(data.get("last_visit"))
+    return data
 
-    target_timestamp = int(start.replace(tzinfo=timezone.utc).timestamp())
-    closest_entry = None
-    closest_distance = None
-    for entry in forecasts:
-        entry_timestamp = entry.get("dt")
-        if not isinstance(entry_timestamp, (int, float)):
-            continue
-        distance = abs(int(entry_timestamp) - target_timestamp)
-        if closest_distance is None or distance < closest_distance:
-            closest_entry = entry
-            closest_distance = distance
 
-    if not closest_entry:
-        return {"status": "unknown", "summary": "Weather data unavailable."}
+def _serialize_conversation_row(visitor_id: str, conversation: dict, *, include_messages: bool = True) -> dict:
+    data = {
+        "visitor_id": visitor_id,
+        "ip_address": conversation.get("ip_address"),
+        "created_at": _serialize_datetime(conversation.get("created_at")),
+        "last_message_at": _serialize_datetime(conversation.get("last_message_at")),
+    }
+    if include_messages:
+        data["messages"] = [dict(message) for message in conversation.get("messages", [])]
+    return data
 
-    weather_entries = closest_entry.get("weather") or []
-    primary_weather = weather_entries[0] if weather_entries and isinstance(weather_entries[0], dict) else {}
-    condition_text = (primary_weather.get("description") or "").strip() or "Weather data unavailable"
-    status = _classify_weather(condition_text)
-    return {"status": status, "summary": condition_text}
 
+def _serialize_slot_row(slot: dict) -> dict:
+    return {
+        "id": slot.get("id"),
+        "start": _serialize_datetime(slot.get("start")),
+        "is_booked": bool(slot.get("is_booked", False)),
+        "workflow_status": slot.get("workflow_status"),
+        "visitor_name": slot.get("visitor_name"),
+        "visitor_email": slot.get("visitor_email"),
+        "visitor_dog_breed": slot.get("visitor_dog_breed"),
+        "visitor_service_area_id": slot.get("visitor_service_area_id"),
+        "visitor_service_area_name": slot.get("visitor_service_area_name"),
+        "visitor_travel_fee": slot.get("visitor_travel_fee"),
+        "booked_at": _serialize_datetime(slot.get("booked_at")),
+        "price": slot.get("price"),
+        "service_type": slot.get("service_type", "walk"),
+        "weather": slot.get("weather") if isinstance(slot.get("weather"), dict) else {},
+    }
+
+
+def _serialize_settings(*keys: str) -> dict:
+    """Serialize the scalar settings, optionally limited to ``keys``."""
+
+    serializers = {
+        "breed_ai_suggestions": lambda: breed_ai_suggestions,
+        "business_in_a_box": lambda: business_in_a_box,
+        "autopilot_enabled": lambda: autopilot_enabled,
+        "autopilot_status": lambda: dict(autopilot_status),
+        "site_photos": lambda: dict(site_photos),
+        "service_notice": lambda: dict(site_service_notice),
+        "meet_greet_enabled": _meet_greet_setting,
+        "auto_save_enabled": lambda: auto_save_enabled,
+        "auto_save_last_run": lambda: _serialize_datetime(auto_save_last_run),
+        "backup_history": lambda: [_serialize_backup_history_entry(entry) for entry in backup_history],
+        "next_backup_history_id": lambda: next_backup_history_id,
+        "weather_api_key": lambda: weather_api_key,
+        "visitor_rollups": _locked_visitor_rollups,
+    }
+    selected = keys or tuple(serializers)
+    return {key: serializers[key]() for key in selected}
+
+
+def _serialize_visitor_rollups() -> dict:
+    return {
+        span: [[row[0], row[1], row[2], _top_counts(row[3], 20), _top_counts(row[4], 20)] for row in rows]
+        for span, rows in visitor_rollups.items()
+    }
 
-def _service_label(value: Optional[str]) -> str:
-    service_key = value if value in BOOKING_SERVICE_TYPES else "walk"
-    return BOOKING_SERVICE_TYPES.get(service_key, BOOKING_SERVICE_TYPES["walk"])["label"]
+
+def _locked_visitor_rollups() -> dict:
+    with _visit_flush_lock:
+        return _serialize_visitor_rollups()
 
 
 def _serialize_state() -> dict:
+    # The visit flush reorders visitor_stats from the scheduler thread.
+    with _visit_flush_lock:
+        visitor_items = list(visitor_stats.items())
     visitor_rows = {}
-    for ip_address, visitor in visitor_stats.items():
+    for ip_address, visitor in visitor_items:
         if not isinstance(visitor, dict):
             continue
         try:
-            data = dict(visitor)
+            visitor_rows[ip_address] = _serialize_visitor_row(visitor)
         except Exception:  # pragma: no cover - defensive
             continue
-        data["first_visit"] = _serialize_datetime(data.get("first_visit"))
-        data["last_visit"] = _serialize_datetime(data.get("last_visit"))
-        visitor_rows[ip_address] = data
-    conversation_rows = {}
-    for visitor_id, conversation in chat_conversations.items():
-        data = {
-            "visitor_id": visitor_id,
-            "ip_address": conversation.get("ip_address"),
-            "created_at": _serialize_datetime(conversation.get("created_at")),
-            "last_message_at": _serialize_datetime(conversation.get("last_message_at")),
-            "messages": [dict(message) for message in conversation.get("messages", [])],
-        }
-        conversation_rows[visitor_id] = data
-    slot_rows = []
-    for slot in appointment_slots:
-        slot_rows.append(
-            {
-                "id": slot.get("id"),
-                "start": _serialize_datetime(slot.get("start")),
-                "is_booked": bool(slot.get("is_booked", False)),
-                "workflow_status": slot.get("workflow_status"),
-                "visitor_name": slot.get("visitor_name"),
-                "visitor_email": slot.get("visitor_email"),
-                "visitor_dog_breed": slot.get("visitor_dog_breed"),
-                "visitor_service_area_id": slot.get("visitor_service_area_id"),
-                "visitor_service_area_name": slot.get("visitor_service_area_name"),
-                "visitor_travel_fee": slot.get("visitor_travel_fee"),
-                "booked_at": _serialize_datetime(slot.get("booked_at")),
-                "price": slot.get("price"),
-                "service_type": slot.get("service_type", "walk"),
-                "weather": slot.get("weather") if isinstance(slot.get("weather"), dict) else {},
-            }
-        )
+    conversation_rows = {
+        visitor_id: _serialize_conversation_row(visitor_id, conversation)
+        for visitor_id, conversation in chat_conversations.items()
+    }
     state = {
         "version": 1,
         "saved_at": datetime.utcnow().isoformat(),
@@ -1199,7 +3290,7 @@ def _serialize_state() -> dict:
         "blocked_ips": list(blocked_ips),
         "chat_conversations": conversation_rows,
         "next_chat_message_id": next_chat_message_id,
-        "appointment_slots": slot_rows,
+        "appointment_slots": [_serialize_slot_row(slot) for slot in appointment_slots],
         "next_slot_id": next_slot_id,
         "dog_breeds": [dict(breed) for breed in dog_breeds],
         "next_dog_breed_id": next_dog_breed_id,
@@ -1207,19 +3298,8 @@ def _serialize_state() -> dict:
         "next_coverage_area_id": next_coverage_area_id,
         "certificates": [dict(certificate) for certificate in team_certificates],
         "next_certificate_id": next_certificate_id,
-        "breed_ai_suggestions": breed_ai_suggestions,
-        "business_in_a_box": business_in_a_box,
-        "autopilot_enabled": autopilot_enabled,
-        "autopilot_status": dict(autopilot_status),
-        "site_photos": dict(site_photos),
-        "service_notice": dict(site_service_notice),
-        "meet_greet_enabled": _meet_greet_setting(),
-        "auto_save_enabled": auto_save_enabled,
-        "auto_save_last_run": _serialize_datetime(auto_save_last_run),
-        "backup_history": [_serialize_backup_history_entry(entry) for entry in backup_history],
-        "next_backup_history_id": next_backup_history_id,
-        "weather_api_key": weather_api_key,
     }
+    state.update(_serialize_settings())
     return state
 
 
@@ -1232,7 +3312,7 @@ def _load_state(state: dict):
     global site_photos, site_service_notice, meet_greet_enabled
     global auto_save_enabled, auto_save_last_run
     global backup_history, next_backup_history_id
-    global weather_api_key
+    global weather_api_key, visitor_rollups
 
     submissions = [dict(row) for row in state.get("submissions", []) if isinstance(row, dict)]
     next_submission_id = _coerce_int(state.get("next_submission_id"), _next_id_from_rows(submissions))
@@ -1245,7 +3325,19 @@ def _load_state(state: dict):
         data["first_visit"] = _parse_datetime(data.get("first_visit")) or datetime.utcnow()
         data["last_visit"] = _parse_datetime(data.get("last_visit")) or data["first_visit"]
         visitor_rows[ip_address] = data
-    visitor_stats = visitor_rows
+    # Least recently seen first, which is the order eviction relies on.
+    visitor_stats = dict(sorted(visitor_rows.items(), key=lambda item: _safe_last_visit(item[1])))
+    visitor_rollups = {span: [] for span in VISITOR_ROLLUP_SPANS}
+    for span, rows in (state.get("visitor_rollups") or {}).items():
+        if span not in VISITOR_ROLLUP_SPANS or not isinstance(rows, list):
+            continue
+        for row in rows:
+            try:
+                start, visits, unique_ips, agents, locations = row
+                visitor_rollups[span].append([int(start), int(visits), int(unique_ips), dict(agents), dict(locations)])
+            except (TypeError, ValueError):
+                continue
+        visitor_rollups[span].sort(key=lambda bucket: bucket[0])
 
     blocked_ips = set(state.get("blocked_ips") or [])
 
@@ -1386,6 +3478,7 @@ def _load_state(state: dict):
             "legacy_path": payload.get("legacy_path")
             or payload.get("file_path")
             or payload.get("primary_path"),
+            "stored_bytes": payload.get("stored_bytes"),
         }
         history_entries.append(entry)
     history_entries.sort(key=lambda item: item.get("saved_at"), reverse=True)
@@ -1395,6 +3488,7 @@ def _load_state(state: dict):
         state.get("next_backup_history_id"),
         max_existing_id + 1,
     )
+    _bump_content_versions()
 
 
 def _get_state_backup_metadata() -> dict:
@@ -1431,16 +3525,245 @@ def _load_state_from_database(storage_id: Optional[int] = None) -> bool:
     return load_data(storage_id=storage_id, persist_after=storage_id is not None)
 
 
+class _RowIndex:
+    """Dict index over one of the module-level row lists.
+
+    Handlers append to, filter and reassign those lists and ``_load_state``
+    replaces them wholesale, so the index remembers which list object (and
+    length) it was built from and rebuilds lazily when either changes.
+    In-place appends and removals must be reported through ``added`` and
+    ``removed``; a removal followed by an append would otherwise leave the
+    length unchanged and the index stale.
+    """
+
+    def __init__(self, rows, key):
+        self._rows = rows
+        self._key = key
+        self._state = (None, 0, {})
+
+    def _current(self):
+        rows = self._rows()
+        source, length, index = self._state
+        if source is rows and length == len(rows):
+            return rows, index
+        index = {}
+        for row in rows:
+            if isinstance(row, dict):
+                index.setdefault(self._key(row), row)
+        self._state = (rows, len(rows), index)
+        return rows, index
+
+    def get(self, value):
+        rows, index = self._current()
+        row = index.get(value)
+        if row is not None and self._key(row) != value:
+            # The row was edited in place; rebuild once from the list.
+            self._state = (None, 0, {})
+            row = self._current()[1].get(value)
+        return row
+
+    def added(self, row):
+        """Record a row just appended to (or inserted into) the list."""
+
+        rows = self._rows()
+        source, length, index = self._state
+        if source is rows and length == len(rows) - 1:
+            index.setdefault(self._key(row), row)
+            self._state = (rows, len(rows), index)
+        else:
+            self._state = (None, 0, {})
+
+    def removed(self, row):
+        """Record a row just removed from the list in place.
+
+        Removals are rare admin actions, so the index is simply rebuilt on the
+        next lookup; that also keeps duplicate keys resolving to the first row.
+        """
+
+        self._state = (None, 0, {})
+
+
+_submission_index = _RowIndex(lambda: submissions, lambda row: row.get("id"))
+_slot_index = _RowIndex(lambda: appointment_slots, lambda row: row.get("id"))
+_breed_index = _RowIndex(lambda: dog_breeds, lambda row: row.get("id"))
+_breed_name_index = _RowIndex(lambda: dog_breeds, lambda row: (row.get("name") or "").lower())
+_coverage_area_index = _RowIndex(lambda: coverage_areas, lambda row: row.get("id"))
+_certificate_index = _RowIndex(lambda: team_certificates, lambda row: row.get("id"))
+_backup_history_index = _RowIndex(lambda: backup_history, lambda row: row.get("id"))
+
+
+class _SlotCalendar:
+    """Keeps ``appointment_slots`` ordered by start time for range queries.
+
+    ``_keys`` mirrors the list as ``(start, id)`` pairs so bisect finds a time
+    window or a slot's position in O(log n). Like ``_RowIndex`` it re-sorts and
+    rebuilds when the list is replaced or changes length behind its back.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._source = None
+        self._keys = []
+
+    @staticmethod
+    def _key(slot: dict):
+        return (slot["start"], slot["id"])
+
+    def _current(self) -> list:
+        rows = appointment_slots
+        if self._source is rows and len(self._keys) == len(rows):
+            return rows
+        rows.sort(key=self._key)
+        self._keys = [self._key(slot) for slot in rows]
+        self._source = rows
+        return rows
+
+    def _position(self, key) -> Optional[int]:
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return position
+        return None
+
+    def insert(self, slot: dict):
+        with self._lock:
+            rows = self._current()
+            position = bisect.bisect_right(self._keys, self._key(slot))
+            self._keys.insert(position, self._key(slot))
+            rows.insert(position, slot)
+
+    def remove(self, slot: dict, *, start: Optional[datetime] = None):
+        with self._lock:
+            rows = self._current()
+            position = self._position((start or slot["start"], slot["id"]))
+            if position is None:
+                # The slot moved without telling us; re-sort and look again.
+                self._source = None
+                rows = self._current()
+                position = self._position(self._key(slot))
+            if position is not None:
+                del self._keys[position]
+                del rows[position]
+
+    def extend(self, slots: list):
+        """Add many slots with a single merge instead of one insert each."""
+
+        with self._lock:
+            rows = self._current()
+            rows.extend(slots)
+            self._source = None
+            self._current()
+
+    def move(self, slot: dict, previous_start: datetime):
+        """Reposition a slot whose start time changed from ``previous_start``."""
+
+        with self._lock:
+            self.remove(slot, start=previous_start)
+            self.insert(slot)
+
+    def remove_open_before(self, end: datetime) -> list:
+        """Drop unbooked slots starting before ``end`` in place; return them."""
+
+        with self._lock:
+            rows = self._current()
+            high = bisect.bisect_left(self._keys, (end,))
+            kept = [slot for slot in rows[:high] if slot.get("is_booked")]
+            if len(kept) == high:
+                return []
+            removed = [slot for slot in rows[:high] if not slot.get("is_booked")]
+            rows[:high] = kept
+            self._keys[:high] = [self._key(slot) for slot in kept]
+            return removed
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> list:
+        """Slots starting in ``[start, end)``, in time order."""
+
+        with self._lock:
+            rows = self._current()
+            low = 0 if start is None else bisect.bisect_left(self._keys, (start,))
+            high = len(rows) if end is None else bisect.bisect_left(self._keys, (end,))
+            return rows[low:high]
+
+
+_slot_calendar = _SlotCalendar()
+# Cached ``_serialize_slot`` output keyed by slot id, stored as (slot dict,
+# version, view). A view is reused only for the same dict at the same version;
+# reloads replace the dicts, and ``_bump_slot_version`` covers edits in place.
+_slot_view_cache = {}
+_slot_versions = {}
+_slot_version_counter = itertools.count(1)
+slot_view_stats = {"hits": 0, "misses": 0}
+
+
+def _upcoming_slots(service_type: Optional[str] = None, *, days: Optional[int] = None) -> list:
+    """Slots from now until ``days`` ahead (default ``BOOKING_WINDOW_DAYS``)."""
+
+    now = datetime.utcnow()
+    end = now + timedelta(days=days if days is not None else BOOKING_WINDOW_DAYS)
+    slots = _slot_calendar.between(now, end)
+    if service_type:
+        slots = [slot for slot in slots if (slot.get("service_type") or "walk") == service_type]
+    return slots
+
+
+def _pager(total: int, page: int, per_page: int) -> dict:
+    page_count = max(1, -(-total // per_page))
+    page = min(max(1, page), page_count)
+    return {
+        "page": page,
+        "page_count": page_count,
+        "total": total,
+        "offset": (page - 1) * per_page,
+        "previous_page": page - 1 if page > 1 else None,
+        "next_page": page + 1 if page < page_count else None,
+    }
+
+
+def _paginate(rows: list, page: int, per_page: int):
+    """Return ``(page_rows, pager)`` for a 1-based ``page``."""
+
+    pager = _pager(len(rows), page, per_page)
+    return rows[pager["offset"] : pager["offset"] + per_page], pager
+
+
 def _get_submission(submission_id: int):
-    return next((submission for submission in submissions if submission["id"] == submission_id), None)
+    return _submission_index.get(submission_id)
 
 
 def _get_slot(slot_id: int):
-    return next((slot for slot in appointment_slots if slot["id"] == slot_id), None)
+    return _slot_index.get(slot_id)
+
+
+def _slot_lock(slot_id: int) -> threading.Lock:
+    return _slot_locks[slot_id % len(_slot_locks)]
+
+
+def _claim_slot(slot: dict, booking: dict) -> bool:
+    """Atomically apply ``booking`` to an open slot; False if it was taken first."""
+
+    with _slot_lock(slot["id"]):
+        if slot.get("is_booked"):
+            return False
+        if STATE_PERSISTENCE_MODE == "sqlite":
+            claimed_row = _serialize_slot_row(dict(slot, **booking))
+            try:
+                claimed = _state_db_claim_slot(claimed_row)
+            except (OSError, sqlite3.DatabaseError) as exc:
+                app.logger.exception("Failed to book slot %s: %s", slot["id"], exc)
+                return False
+            if not claimed:
+                # Another worker won; pick up its booking.
+                _refresh_shared_state(force=True)
+                return False
+            slot.update(booking)
+            _bump_slot_version(slot)
+            return True
+        slot.update(booking)
+        _persist_state_change(_slot_delta(slot))
+    return True
 
 
 def _get_breed(breed_id: int):
-    return next((breed for breed in dog_breeds if breed["id"] == breed_id), None)
+    return _breed_index.get(breed_id)
 
 
 def _normalize_breed_name(name: str) -> str:
@@ -1448,7 +3771,7 @@ def _normalize_breed_name(name: str) -> str:
 
 
 def _breed_name_exists(name: str) -> bool:
-    return any(breed["name"].lower() == name.lower() for breed in dog_breeds)
+    return _breed_name_index.get(name.lower()) is not None
 
 
 def _sorted_breeds():
@@ -1456,7 +3779,7 @@ def _sorted_breeds():
 
 
 def _get_coverage_area(area_id: int):
-    return next((area for area in coverage_areas if area["id"] == area_id), None)
+    return _coverage_area_index.get(area_id)
 
 
 def _sorted_coverage_areas():
@@ -1467,7 +3790,7 @@ def _sorted_coverage_areas():
 
 
 def _get_certificate(certificate_id: int):
-    return next((row for row in team_certificates if row.get("id") == certificate_id), None)
+    return _certificate_index.get(certificate_id)
 
 
 def _sorted_certificates():
@@ -1478,7 +3801,41 @@ def _sorted_certificates():
     return sorted(team_certificates, key=_sort_key, reverse=True)
 
 
-def _serialize_slot(slot: dict):
+def _bump_slot_version(slot: dict):
+    """Mark ``slot`` as changed so its cached presentation is rebuilt.
+
+    ``_slot_delta`` calls this, so any mutation that is persisted is covered.
+    """
+
+    _slot_versions[slot.get("id")] = next(_slot_version_counter)
+    _content_versions["appointment_slots"] = next(_content_version_counter)
+
+
+def _serialize_slot(slot: dict) -> dict:
+    """Return the template view of ``slot``, reusing it until the slot changes.
+
+    The returned dict is shared between requests and must not be modified.
+    """
+
+    slot_id = slot["id"]
+    version = _slot_versions.get(slot_id)
+    cached = _slot_view_cache.get(slot_id)
+    if cached is not None and cached[0] is slot and cached[1] == version:
+        slot_view_stats["hits"] += 1
+        return cached[2]
+    slot_view_stats["misses"] += 1
+    view = _build_slot_view(slot)
+    if len(_slot_view_cache) > 2 * len(appointment_slots) + 64:
+        # Drop views of deleted or replaced slots.
+        live = {row["id"] for row in appointment_slots}
+        for stale_id in [key for key in _slot_view_cache if key not in live]:
+            _slot_view_cache.pop(stale_id, None)
+            _slot_versions.pop(stale_id, None)
+    _slot_view_cache[slot_id] = (slot, version, view)
+    return view
+
+
+def _build_slot_view(slot: dict) -> dict:
     date_label = slot["start"].strftime("%a %d %b")
     long_date_label = slot["start"].strftime("%A %d %B")
     time_label = slot["start"].strftime("%I:%M %p").lstrip("0")
@@ -1495,7 +3852,12 @@ def _serialize_slot(slot: dict):
     weather = slot.get("weather") if isinstance(slot.get("weather"), dict) else {}
     weather_status = weather.get("status") or "unknown"
     weather_summary = weather.get("summary") or ""
-    weather_label = "Rain expected" if weather_status == "rain" else weather_summary or "Weather update unavailable"
+    if weather_status == "rain":
+        weather_label = "Rain expected"
+    elif weather_status == "pending":
+        weather_label = "Checking the forecast…"
+    else:
+        weather_label = weather_summary or "Weather update unavailable"
     return {
         "id": slot["id"],
         "start_iso": slot["start"].isoformat(),
@@ -1524,13 +3886,7 @@ def _serialize_slot(slot: dict):
 
 
 def _sorted_slots():
-    now = datetime.utcnow()
-    slots_removed = _cleanup_expired_slots()
-    weather_updated = _refresh_future_weather(now)
-    appointment_slots.sort(key=lambda slot: slot["start"])
-    if slots_removed or weather_updated:
-        _persist_state_change()
-    return list(appointment_slots)
+    return _slot_calendar.between()
 
 
 def _get_client_ip() -> str:
@@ -1538,23 +3894,63 @@ def _get_client_ip() -> str:
     return forwarded_for or request.remote_addr or "Unknown"
 
 
-def _get_location_from_headers() -> str:
-    # These headers are commonly used by reverse proxies/CDNs to expose location data.
-    city = request.headers.get("X-AppEngine-City")
-    country = request.headers.get("CF-IPCountry")
-    region = request.headers.get("X-AppEngine-Region")
-    if city or region or country:
-        location_parts = [part for part in [city, region, country] if part]
-        return ", ".join(location_parts)
-    # Fall back to the Accept-Language header as a best-effort signal.
-    return request.headers.get("Accept-Language", "Unknown")
+def _compile_user_agent_patterns():
+    """Build one case-insensitive alternation per class, so a user agent is
+    scanned once per class instead of once per keyword.
+
+    A keyword only matches a whole token: the characters either side must not
+    be letters or digits. Crawlers that link their documentation with
+    ``+http://`` in the user agent count as bots too.
+    """
+
+    def alternation(keywords, *extra):
+        # Longest first so overlapping keywords report the most specific match.
+        ordered = sorted(set(keywords), key=len, reverse=True)
+        tokens = "|".join(re.escape(keyword) for keyword in ordered)
+        return re.compile("|".join((rf"(?<![a-z0-9])(?:{tokens})(?![a-z0-9])", *extra)), re.IGNORECASE)
+
+    return (
+        ("ignored", alternation(IGNORED_USER_AGENT_KEYWORDS)),
+        ("bot", alternation(BOT_USER_AGENT_KEYWORDS, r"\+https?://")),
+    )
+
+
+_user_agent_patterns = _compile_user_agent_patterns()
+
+
+@functools.lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def _classify_user_agent(user_agent: str) -> str:
+    """Return ``"ignored"``, ``"bot"``, ``"browser"`` or ``"unknown"`` (no header).
+
+    Results are cached per user agent string; browsers send the same few
+    strings over and over.
+    """
+
+    if not user_agent or user_agent == "Unknown":
+        return "unknown"
+    for label, pattern in _user_agent_patterns:
+        if pattern.search(user_agent):
+            return label
+    return "browser"
 
 
 def _should_ignore_user_agent(user_agent: str) -> bool:
-    if not user_agent:
-        return False
-    ua = user_agent.lower()
-    return any(keyword in ua for keyword in IGNORED_USER_AGENT_KEYWORDS)
+    return _classify_user_agent(user_agent or "") in {"ignored", "bot"}
+
+
+def _is_bot_request() -> bool:
+    return _should_ignore_user_agent(request.headers.get("User-Agent", ""))
+
+
+def _user_agent_summary() -> dict:
+    info = _classify_user_agent.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "bots_skipped": visit_tracking_stats["bots_skipped"],
+        "cached": info.currsize,
+        "max_cached": info.maxsize,
+        "hit_rate": round(100.0 * info.hits / lookups, 1) if lookups else 0.0,
+    }
 
 
 def _get_deepseek_api_key() -> Optional[str]:
@@ -1640,46 +4036,275 @@ def _run_autopilot_if_needed(visitor_id: str):
             "last_visitor_id": visitor_id,
         }
     )
-    _persist_state_change()
+    _persist_state_change(_settings_delta("autopilot_status"))
     try:
         messages = _build_autopilot_messages(conversation)
         reply = _call_deepseek_chat_completion(messages)
     except Exception as exc:  # pylint: disable=broad-except
         autopilot_status.update({"state": "error", "last_error": str(exc)})
-        _persist_state_change()
+        _persist_state_change(_settings_delta("autopilot_status"))
         return
     if not reply:
         autopilot_status.update({"state": "no_reply", "last_reply_preview": None})
-        _persist_state_change()
+        _persist_state_change(_settings_delta("autopilot_status"))
         return
     autopilot_status.update({"state": "answered", "last_reply_preview": reply[:200].strip()})
-    _persist_state_change()
+    _persist_state_change(_settings_delta("autopilot_status"))
     _add_chat_message("admin", reply, visitor_id, trigger_autopilot=False)
 
 
-def _record_visit(ip_address: str):
-    user_agent = request.headers.get("User-Agent", "Unknown")
-    if _should_ignore_user_agent(user_agent):
-        return False
-    visitor = visitor_stats.setdefault(
-        ip_address,
-        {
-            "visits": 0,
-            "first_visit": datetime.utcnow(),
-            "last_visit": datetime.utcnow(),
-            "location": "Unknown",
-            "user_agent": "Unknown",
-            "accept_language": "Unknown",
-        },
+def _location_from_parts(city, region, country, accept_language) -> str:
+    if city or region or country:
+        return ", ".join(part for part in [city, region, country] if part)
+    # Fall back to the Accept-Language header as a best-effort signal.
+    return accept_language or "Unknown"
+
+
+def _record_visit(ip_address: str) -> bool:
+    """Queue a visit for the ``flush_visits`` job; the request path does no merging.
+
+    When the backlog passes ``VISITOR_QUEUE_HIGH_WATER`` only a
+    ``VISITOR_LOAD_SAMPLE_RATE`` share of visits is queued, each counting for
+    the ones skipped.
+    """
+
+    weight = 1
+    if _visit_queue.qsize() >= VISITOR_QUEUE_HIGH_WATER:
+        if random.random() >= VISITOR_LOAD_SAMPLE_RATE:
+            visit_tracking_stats["sampled_out"] += 1
+            return False
+        weight = max(1, round(1 / VISITOR_LOAD_SAMPLE_RATE))
+    headers = request.headers
+    _visit_queue.put(
+        (
+            ip_address,
+            datetime.utcnow(),
+            headers.get("User-Agent", "Unknown"),
+            headers.get("Accept-Language"),
+            headers.get("X-AppEngine-City"),
+            headers.get("X-AppEngine-Region"),
+            headers.get("CF-IPCountry"),
+            weight,
+        )
     )
-    visitor["visits"] += 1
-    visitor["last_visit"] = datetime.utcnow()
-    visitor["location"] = _get_location_from_headers() or visitor["location"]
-    visitor["user_agent"] = user_agent or visitor["user_agent"]
-    visitor["accept_language"] = request.headers.get("Accept-Language", visitor["accept_language"])
+    if not SCHEDULER_ENABLED and _visit_queue.qsize() >= VISITOR_FLUSH_BATCH:
+        # Nothing drains the queue in the background, so keep it bounded here.
+        _flush_visits()
+    return True
+
+
+def _rollup_visit(ip_address: str, seen_at: datetime, user_agent: str, location: str, weight: int):
+    """Count one visit into the hourly and daily rollup buckets.
+
+    Buckets are ``[start, visits, unique_ips, agents, locations]`` lists with
+    ``start`` as a Unix timestamp. Unique IPs are estimated by an in-memory
+    sketch per bucket, refreshed when a batch is merged; after a reload new
+    addresses are added on top of the saved count.
+    """
+
+    timestamp = seen_at.replace(tzinfo=timezone.utc).timestamp()
+    for span, (size, keep) in VISITOR_ROLLUP_SPANS.items():
+        start = int(timestamp // size * size)
+        buckets = visitor_rollups.setdefault(span, [])
+        bucket = next((row for row in reversed(buckets) if row[0] == start), None)
+        if bucket is None:
+            if buckets and start < buckets[0][0]:
+                continue  # Older than anything we still keep.
+            bucket = [start, 0, 0, {}, {}]
+            buckets.append(bucket)
+            buckets.sort(key=lambda row: row[0])
+            del buckets[:-keep]
+        bucket[1] += weight
+        sketch = _rollup_ip_sketches.get((span, start))
+        if sketch is None or sketch[0] is not bucket:
+            sketch = [bucket, bucket[2], bytearray(1 << VISITOR_ROLLUP_SKETCH_BITS)]
+            _rollup_ip_sketches[(span, start)] = sketch
+        if _sketch_add(sketch[2], ip_address):
+            _rollup_sketches_changed.add((span, start))
+        for counts, label in ((bucket[3], user_agent), (bucket[4], location)):
+            label = (label or "Unknown")[:120]
+            counts[label] = counts.get(label, 0) + weight
+            if len(counts) > VISITOR_ROLLUP_TOP * 4:
+                # Keep the heavy hitters; the long tail is what bots produce.
+                for stale in sorted(counts, key=counts.get)[: len(counts) - VISITOR_ROLLUP_TOP * 2]:
+                    del counts[stale]
+
+
+def _sketch_add(registers: bytearray, value: str) -> bool:
+    """Add ``value`` to a HyperLogLog sketch; True when a register changed."""
+
+    bits = VISITOR_ROLLUP_SKETCH_BITS
+    hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+    index = hashed >> (64 - bits)
+    rank = (64 - bits) - (hashed & ((1 << (64 - bits)) - 1)).bit_length() + 1
+    if rank <= registers[index]:
+        return False
+    registers[index] = rank
     return True
 
 
+def _sketch_count(registers: bytearray) -> int:
+    size = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / size) * size * size / sum(2.0 ** -rank for rank in registers)
+    empty = registers.count(0)
+    if empty and estimate <= 2.5 * size:
+        # Linear counting is close to exact while most registers are empty.
+        estimate = size * math.log(size / empty)
+    return int(round(estimate))
+
+
+def _refresh_rollup_unique_ips():
+    """Drop sketches for buckets that left the window and update changed counts."""
+
+    live = {(span, row[0]): row for span, rows in visitor_rollups.items() for row in rows}
+    for key, (bucket, base, registers) in list(_rollup_ip_sketches.items()):
+        if live.get(key) is not bucket:
+            del _rollup_ip_sketches[key]
+        elif key in _rollup_sketches_changed:
+            bucket[2] = base + _sketch_count(registers)
+    _rollup_sketches_changed.clear()
+
+
+def _top_counts(counts: dict, limit: int = VISITOR_ROLLUP_TOP) -> list:
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def _visitor_rollup_summary() -> dict:
+    """Traffic over the last 24 hours and 7 days for the admin visitors view."""
+
+    def combine(rows):
+        agents, locations = {}, {}
+        for row in rows:
+            for target, counts in ((agents, row[3]), (locations, row[4])):
+                for label, count in counts.items():
+                    target[label] = target.get(label, 0) + count
+        return {
+            "visits": sum(row[1] for row in rows),
+            "top_agents": _top_counts(agents),
+            "top_locations": _top_counts(locations),
+        }
+
+    now = time.time()
+    with _visit_flush_lock:
+        # Copies, since the visit flush keeps updating the label counts.
+        hourly = [
+            [*row[:3], dict(row[3]), dict(row[4])]
+            for row in visitor_rollups.get("hourly", [])
+            if row[0] > now - 24 * 3600
+        ]
+        daily = [row[:3] for row in visitor_rollups.get("daily", []) if row[0] > now - 7 * 86400]
+    return {
+        "last_day": combine(hourly),
+        "days": [
+            {
+                "date": datetime.fromtimestamp(row[0], timezone.utc).strftime("%a %d %b"),
+                "visits": row[1],
+                "unique_ips": row[2],
+            }
+            for row in reversed(daily)
+        ],
+        "tracked": len(visitor_stats),
+        "max_tracked": VISITOR_STATS_MAX,
+        "evicted": visit_tracking_stats["evicted"],
+        "user_agents": _user_agent_summary(),
+    }
+
+
+def _evict_cold_visitors() -> list:
+    """Drop the least recently seen visitors past the size cap or the TTL.
+
+    ``visitor_stats`` is kept in last-visit order, so the coldest rows are at
+    the front.
+    """
+
+    cutoff = datetime.utcnow() - timedelta(days=VISITOR_STATS_TTL_DAYS)
+    evicted = []
+    while visitor_stats:
+        ip_address = next(iter(visitor_stats))
+        visitor = visitor_stats[ip_address]
+        if (
+            len(visitor_stats) <= VISITOR_STATS_MAX
+            and isinstance(visitor, dict)
+            and _safe_last_visit(visitor) >= cutoff
+        ):
+            break
+        del visitor_stats[ip_address]
+        _unsaved_visitors.discard(ip_address)
+        evicted.append(ip_address)
+    visit_tracking_stats["evicted"] += len(evicted)
+    return evicted
+
+
+def _flush_visits(*, persist: bool = True) -> dict:
+    """Merge queued visits into ``visitor_stats`` and persist the changed rows.
+
+    Readers such as the admin visitors view merge with ``persist=False``;
+    the rows they touch are written by the next persisting flush. Anything
+    that iterates ``visitor_stats`` or ``visitor_rollups`` does so under
+    ``_visit_flush_lock``; the changes are persisted after it is released,
+    because saving serializes those same collections.
+    """
+
+    changes = ()
+
+    with _visit_flush_lock:
+        batch = {}
+        events = 0
+        while True:
+            try:
+                ip_address, seen_at, user_agent, accept_language, city, region, country, weight = (
+                    _visit_queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            events += 1
+            if _should_ignore_user_agent(user_agent):
+                continue
+            row = batch.setdefault(ip_address, {"visits": 0, "first_visit": seen_at})
+            row["visits"] += weight
+            row["last_visit"] = seen_at
+            row["location"] = _location_from_parts(city, region, country, accept_language)
+            row["user_agent"] = user_agent
+            _rollup_visit(ip_address, seen_at, user_agent, row["location"], weight)
+            if accept_language is not None:
+                row["accept_language"] = accept_language
+        for ip_address, row in sorted(batch.items(), key=lambda item: item[1]["last_visit"]):
+            # Re-insert so visitor_stats stays ordered by last visit.
+            visitor = visitor_stats.pop(ip_address, None)
+            if not isinstance(visitor, dict):
+                visitor = {
+                    "visits": 0,
+                    "first_visit": row["first_visit"],
+                    "last_visit": row["last_visit"],
+                    "location": "Unknown",
+                    "user_agent": "Unknown",
+                    "accept_language": "Unknown",
+                }
+            visitor_stats[ip_address] = visitor
+            visitor["visits"] += row["visits"]
+            visitor["last_visit"] = row["last_visit"]
+            visitor["location"] = row["location"] or visitor["location"]
+            visitor["user_agent"] = row["user_agent"] or visitor["user_agent"]
+            visitor["accept_language"] = row.get("accept_language", visitor["accept_language"])
+            _unsaved_visitors.add(ip_address)
+        if events:
+            _refresh_rollup_unique_ips()
+        visit_tracking_stats["flushes"] += 1
+        visit_tracking_stats["merged"] += events
+        if persist and (_unsaved_visitors or batch):
+            evicted = _evict_cold_visitors()
+            changed = [ip for ip in _unsaved_visitors if ip in visitor_stats]
+            _unsaved_visitors.clear()
+            changes = (
+                *(_state_delta("visitor_stats", ip, _serialize_visitor_row(visitor_stats[ip])) for ip in changed),
+                *(_state_delta("visitor_stats", ip, op="delete") for ip in evicted),
+                _state_delta("settings", fields={"visitor_rollups": _serialize_visitor_rollups()}),
+            )
+    if changes:
+        _persist_state_change(*changes)
+    return {"events": events, "visitors": len(batch)}
+
+
 def _get_conversation(visitor_id: str, create: bool = False, ip_address: Optional[str] = None):
     if not visitor_id:
         return None
@@ -1826,7 +4451,7 @@ def _add_chat_message(
     _broadcast_chat_update({"type": "message", "message": message})
     if trigger_autopilot and sender == "visitor":
         _run_autopilot_if_needed(visitor_id)
-    _persist_state_change()
+    _persist_state_change(_conversation_delta(visitor_id), _chat_message_delta(message))
     return message
 
 
@@ -1835,7 +4460,7 @@ def _delete_conversation(visitor_id: str) -> bool:
     if not conversation:
         return False
     _broadcast_chat_update({"type": "conversation_deleted", "visitor_id": visitor_id})
-    _persist_state_change()
+    _persist_state_change(_state_delta("chat_conversations", visitor_id, op="delete"))
     return True
 
 
@@ -1869,49 +4494,459 @@ def _broadcast_chat_update(payload):
         subscriber["queue"].put(filtered)
 
 
-def _format_sse_payload(payload: dict) -> str:
-    return f"data: {json.dumps(payload)}\n\n"
+def _format_sse_payload(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def _chat_event_stream(role: str, visitor_id: Optional[str] = None):
+    subscriber_queue: queue.Queue = queue.Queue()
+    subscriber = {"queue": subscriber_queue, "role": role, "visitor_id": visitor_id}
+    with chat_subscribers_lock:
+        chat_stream_subscribers.append(subscriber)
+
+    def stream():
+        try:
+            if role == "admin":
+                history_payload = {
+                    "type": "history",
+                    "messages": _all_messages(),
+                    "conversations": [
+                        data for data in (_serialize_conversation(cid) for cid in chat_conversations)
+                        if data is not None
+                    ],
+                }
+            else:
+                history_payload = {
+                    "type": "history",
+                    "visitor_id": visitor_id,
+                    "messages": _get_conversation_messages(visitor_id),
+                }
+            yield _format_sse_payload(history_payload)
+            while True:
+                try:
+                    payload = subscriber_queue.get(timeout=25)
+                except queue.Empty:
+                    payload = {"type": "ping"}
+                yield _format_sse_payload(payload)
+        finally:
+            with chat_subscribers_lock:
+                chat_stream_subscribers[:] = [
+                    existing
+                    for existing in chat_stream_subscribers
+                    if existing.get("queue") is not subscriber_queue
+                ]
+
+    return stream_with_context(stream())
+
+
+def _static_asset_manifest() -> dict:
+    """Fingerprint and precompress everything under ``app.static_folder`` once.
+
+    Maps each ``filename`` as passed to ``url_for("static", ...)`` to its
+    hashed name (``js/booking.3f2a9c1d0b7e.js``), bytes and compressed
+    variants. Hashed names are also keys so requests for them resolve.
+    """
+
+    global _static_assets
+
+    if _static_assets is not None:
+        return _static_assets
+    with _static_assets_lock:
+        if _static_assets is not None:
+            return _static_assets
+        manifest = {}
+        root = Path(app.static_folder or "")
+        for path in sorted(root.rglob("*")) if root.is_dir() else []:
+            if not path.is_file():
+                continue
+            filename = path.relative_to(root).as_posix()
+            try:
+                body = path.read_bytes()
+            except OSError as exc:
+                app.logger.warning("Skipping static asset %s: %s", filename, exc)
+                continue
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            stem, dot, suffix = filename.rpartition(".")
+            hashed = f"{stem}.{digest}.{suffix}" if dot else f"{filename}.{digest}"
+            variants = {}
+            if path.suffix.lower() in _COMPRESSIBLE_ASSET_SUFFIXES:
+                compressed = gzip.compress(body, compresslevel=9, mtime=0)
+                if len(compressed) < len(body):
+                    variants["gzip"] = compressed
+                if brotli is not None:
+                    compressed = brotli.compress(body)
+                    if len(compressed) < len(body):
+                        variants["br"] = compressed
+            entry = {
+                "filename": filename,
+                "hashed": hashed,
+                "etag": digest,
+                "body": body,
+                "variants": variants,
+                "mimetype": mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            }
+            manifest[filename] = entry
+            manifest[hashed] = entry
+        _static_assets = manifest
+    return _static_assets
+
+
+def _preferred_asset_encoding(variants: dict) -> Optional[str]:
+    accepted = request.accept_encodings
+    for encoding in ("br", "gzip"):
+        if encoding in variants and accepted[encoding]:
+            return encoding
+    return None
+
+
+@app.url_defaults
+def _fingerprint_static_urls(endpoint, values):
+    if endpoint != "static" or not STATIC_FINGERPRINTING:
+        return
+    entry = _static_asset_manifest().get(values.get("filename"))
+    if entry is not None:
+        values["filename"] = entry["hashed"]
+
+
+def _serve_static_asset(filename):
+    """Serve static files from the manifest, precompressed when the client accepts it.
+
+    Fingerprinted URLs never change content, so they are cached for a year
+    as immutable. Plain names and unknown files fall back to Flask's handler.
+    """
+
+    entry = _static_asset_manifest().get(filename) if STATIC_FINGERPRINTING else None
+    if entry is None:
+        return app.send_static_file(filename)
+    encoding = _preferred_asset_encoding(entry["variants"])
+    body = entry["variants"][encoding] if encoding else entry["body"]
+    response = Response(body, mimetype=entry["mimetype"])
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.set_etag(f"{entry['etag']}-{encoding}" if encoding else entry["etag"])
+    if filename == entry["hashed"]:
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_ASSET_MAX_AGE}, immutable"
+    else:
+        response.headers["Cache-Control"] = "public, no-cache"
+    return response.make_conditional(request)
+
+
+app.view_functions["static"] = _serve_static_asset
+
+
+def _bump_content_versions(changes=()):
+    """Record which state the public pages read from has changed.
+
+    Each delta bumps its entity (settings deltas bump each setting they
+    carry); no deltas means anything may have changed.
+    """
+
+    global _content_epoch
+
+    if not changes:
+        _content_epoch = next(_content_version_counter)
+        return
+    for change in changes:
+        entity = change.get("entity")
+        if entity == "settings":
+            for key in change.get("fields") or {}:
+                _content_versions[f"settings.{key}"] = next(_content_version_counter)
+        else:
+            _content_versions[entity] = next(_content_version_counter)
+
+
+def _content_version(dependencies) -> tuple:
+    return (_content_epoch,) + tuple(_content_versions.get(name, 0) for name in dependencies)
+
+
+def _page_cache_summary() -> dict:
+    with _page_cache_lock:
+        lookups = page_cache_stats["hits"] + page_cache_stats["misses"]
+        return {
+            "enabled": PAGE_CACHE_TTL > 0,
+            "ttl": PAGE_CACHE_TTL,
+            "entries": len(_page_cache),
+            "max_entries": PAGE_CACHE_MAX_ENTRIES,
+            "hits": page_cache_stats["hits"],
+            "misses": page_cache_stats["misses"],
+            "not_modified": page_cache_stats["not_modified"],
+            "hit_rate": round(100.0 * page_cache_stats["hits"] / lookups, 1) if lookups else 0.0,
+        }
+
+
+def _cached_page(*dependencies):
+    """Serve a public GET page from memory until one of ``dependencies`` changes.
+
+    ``dependencies`` name journal entities (``"appointment_slots"``) or
+    settings (``"settings.site_photos"``). Entries also expire after
+    ``PAGE_CACHE_TTL`` seconds because slot listings depend on the clock.
+    Responses carry an ETag and Last-Modified so repeat visitors get a 304.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET" or PAGE_CACHE_TTL <= 0:
+                return view(*args, **kwargs)
+            key = request.full_path
+            # Crawlers are served the plain page whatever query string they
+            # add, and pages rendered for made-up URLs are not kept, so bots
+            # cannot push visitors' pages out of the cache.
+            bot_variant = _is_bot_request() and bool(request.query_string)
+            if bot_variant:
+                key = f"{request.path}?"
+            version = _content_version(dependencies)
+            now = time.monotonic()
+            with _page_cache_lock:
+                entry = _page_cache.get(key)
+                if entry is not None and entry["version"] == version and entry["expires"] > now:
+                    _page_cache.move_to_end(key)
+                    page_cache_stats["hits"] += 1
+                else:
+                    entry = None
+                    page_cache_stats["misses"] += 1
+            if entry is None:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                entry = {
+                    "version": version,
+                    "expires": now + PAGE_CACHE_TTL,
+                    "body": body,
+                    "mimetype": response.mimetype,
+                    "etag": hashlib.sha1(body).hexdigest(),
+                    "last_modified": datetime.now(timezone.utc).replace(microsecond=0),
+                }
+                if bot_variant:
+                    return response
+                with _page_cache_lock:
+                    _page_cache[key] = entry
+                    _page_cache.move_to_end(key)
+                    while len(_page_cache) > PAGE_CACHE_MAX_ENTRIES:
+                        _page_cache.popitem(last=False)
+            response = Response(entry["body"], mimetype=entry["mimetype"])
+            response.set_etag(entry["etag"])
+            response.last_modified = entry["last_modified"]
+            # Browsers may keep the page but must revalidate so edits show at once.
+            response.headers["Cache-Control"] = "no-cache"
+            response.make_conditional(request)
+            if response.status_code == 304:
+                with _page_cache_lock:
+                    page_cache_stats["not_modified"] += 1
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _normalize_block_rule(rule: str) -> str:
+    """Return the canonical form of an IP or CIDR rule, e.g. ``10.0.0.0/8``.
+
+    Single addresses are stored without a prefix length. Raises ValueError for
+    text that is neither.
+    """
+
+    network = ipaddress.ip_network(str(rule).strip(), strict=False)
+    if network.num_addresses == 1:
+        return str(network.network_address)
+    return str(network)
+
+
+def _parse_block_rules(text: str):
+    """Split pasted or uploaded blocklist text into (rules, invalid_entries).
+
+    Rules may be separated by newlines, commas or spaces; ``#`` starts a comment.
+    """
+
+    rules, invalid = [], []
+    for line in (text or "").splitlines():
+        for entry in line.split("#", 1)[0].replace(",", " ").split():
+            try:
+                rules.append(_normalize_block_rule(entry))
+            except ValueError:
+                invalid.append(entry)
+    return rules, invalid
 
 
-def _chat_event_stream(role: str, visitor_id: Optional[str] = None):
-    subscriber_queue: queue.Queue = queue.Queue()
-    subscriber = {"queue": subscriber_queue, "role": role, "visitor_id": visitor_id}
-    with chat_subscribers_lock:
-        chat_stream_subscribers.append(subscriber)
+def _compile_blocklist(rules) -> dict:
+    """Merge rules into sorted, disjoint integer ranges per address family."""
 
-    def stream():
+    ranges = {4: [], 6: []}
+    literals = set()
+    for rule in rules:
         try:
-            if role == "admin":
-                history_payload = {
-                    "type": "history",
-                    "messages": _all_messages(),
-                    "conversations": [
-                        data for data in (_serialize_conversation(cid) for cid in chat_conversations)
-                        if data is not None
-                    ],
-                }
+            network = ipaddress.ip_network(rule, strict=False)
+        except ValueError:
+            # Entries such as "Unknown" from older data still match exactly.
+            literals.add(rule)
+            continue
+        ranges[network.version].append(
+            (int(network.network_address), int(network.broadcast_address))
+        )
+    index = {"literals": literals}
+    for version, spans in ranges.items():
+        starts, ends = [], []
+        for start, end in sorted(spans):
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
             else:
-                history_payload = {
-                    "type": "history",
-                    "visitor_id": visitor_id,
-                    "messages": _get_conversation_messages(visitor_id),
+                starts.append(start)
+                ends.append(end)
+        index[version] = (starts, ends)
+    return index
+
+
+def _blocklist() -> dict:
+    global _blocklist_index
+    index = _blocklist_index
+    if index is not None and index["source"] is blocked_ips and index["version"] == _blocklist_version:
+        return index
+    with _blocklist_lock:
+        source, version = blocked_ips, _blocklist_version
+        index = _compile_blocklist(list(source))
+        index.update(source=source, version=version)
+        _blocklist_index = index
+    return index
+
+
+def _ip_is_blocked(ip_address: str) -> bool:
+    """Check an address against every blocked IP and range in O(log n)."""
+
+    index = _blocklist()
+    if ip_address in index["literals"]:
+        return True
+    try:
+        address = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return False
+    if address.version == 6 and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    starts, ends = index[address.version]
+    value = int(address)
+    position = bisect.bisect_right(starts, value) - 1
+    return position >= 0 and value <= ends[position]
+
+
+def _update_blocklist(rules, *, remove: bool = False) -> int:
+    """Add or remove rules, persisting one delta per change; returns the count."""
+
+    global _blocklist_version
+    changes = []
+    for rule in dict.fromkeys(rules):
+        if remove and rule in blocked_ips:
+            blocked_ips.discard(rule)
+            changes.append(_state_delta("blocked_ips", rule, op="delete"))
+        elif not remove and rule not in blocked_ips:
+            blocked_ips.add(rule)
+            changes.append(_state_delta("blocked_ips", rule))
+    if changes:
+        _blocklist_version += 1
+        _persist_state_change(*changes)
+    return len(changes)
+
+
+def _blocklist_summary(limit: int = 50) -> dict:
+    ranges = sorted(rule for rule in blocked_ips if "/" in rule)
+    return {
+        "rules": len(blocked_ips),
+        "addresses": len(blocked_ips) - len(ranges),
+        "range_count": len(ranges),
+        "ranges": ranges[:limit],
+    }
+
+
+def _take_rate_limit_token(scope: str, *identities) -> float:
+    """Spend one token from each identity's bucket for ``scope``.
+
+    Returns 0 when the request may proceed, otherwise the seconds until every
+    bucket has a token again (nothing is spent in that case).
+    """
+
+    budget = RATE_LIMITS.get(scope)
+    if budget is None:
+        return 0.0
+    capacity, period = budget
+    rate = capacity / period
+    now = time.monotonic()
+    keys = [(scope, identity) for identity in dict.fromkeys(identities) if identity]
+    with _rate_limit_lock:
+        buckets = []
+        for key in keys:
+            bucket = _rate_buckets.get(key)
+            if bucket is None:
+                bucket = _rate_buckets[key] = [float(capacity), now]
+            else:
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                _rate_buckets.move_to_end(key)
+            buckets.append(bucket)
+        while len(_rate_buckets) > RATE_LIMIT_MAX_BUCKETS:
+            _rate_buckets.popitem(last=False)
+        shortfall = max((1.0 - bucket[0] for bucket in buckets), default=0.0)
+        if shortfall > 0:
+            rate_limit_stats[scope]["limited"] += 1
+            return shortfall / rate
+        for bucket in buckets:
+            bucket[0] -= 1.0
+        rate_limit_stats[scope]["allowed"] += 1
+    return 0.0
+
+
+def _sweep_rate_limits() -> int:
+    """Forget buckets that have refilled completely; they behave like new ones."""
+
+    now = time.monotonic()
+    with _rate_limit_lock:
+        idle = []
+        for key, (tokens, updated_at) in _rate_buckets.items():
+            budget = RATE_LIMITS.get(key[0])
+            if budget is None or tokens + (now - updated_at) * budget[0] / budget[1] >= budget[0]:
+                idle.append(key)
+        for key in idle:
+            del _rate_buckets[key]
+        rate_limit_stats["swept"] += len(idle)
+    return len(idle)
+
+
+def _rate_limited_response(retry_after: float, message: str, *, as_json: bool = True):
+    seconds = max(1, int(math.ceil(retry_after)))
+    if as_json:
+        response = jsonify({"error": message, "retry_after": seconds})
+    else:
+        response = Response(f"{message} Please try again in {seconds} seconds.", mimetype="text/plain")
+    response.status_code = 429
+    response.headers["Retry-After"] = str(seconds)
+    return response
+
+
+def _rate_limit_summary() -> dict:
+    with _rate_limit_lock:
+        return {
+            "buckets": len(_rate_buckets),
+            "max_buckets": RATE_LIMIT_MAX_BUCKETS,
+            "swept": rate_limit_stats["swept"],
+            "scopes": [
+                {
+                    "scope": scope,
+                    "enabled": budget is not None,
+                    "requests": budget[0] if budget else None,
+                    "seconds": int(budget[1]) if budget else None,
+                    **rate_limit_stats[scope],
                 }
-            yield _format_sse_payload(history_payload)
-            while True:
-                try:
-                    payload = subscriber_queue.get(timeout=25)
-                except queue.Empty:
-                    payload = {"type": "ping"}
-                yield _format_sse_payload(payload)
-        finally:
-            with chat_subscribers_lock:
-                chat_stream_subscribers[:] = [
-                    existing
-                    for existing in chat_stream_subscribers
-                    if existing.get("queue") is not subscriber_queue
-                ]
+                for scope, budget in RATE_LIMITS.items()
+            ],
+        }
 
-    return stream_with_context(stream())
+
+@app.before_request
+def refresh_shared_state():
+    if request.endpoint == "static":
+        return
+    _ensure_scheduler()
+    _refresh_shared_state()
 
 
 @app.before_request
@@ -1919,8 +4954,11 @@ def track_visitors_and_block():
     if request.endpoint == "static":
         return
     ip_address = _get_client_ip()
-    _record_visit(ip_address)
-    if ip_address in blocked_ips and not request.path.startswith("/admin"):
+    if _is_bot_request():
+        visit_tracking_stats["bots_skipped"] += 1
+    else:
+        _record_visit(ip_address)
+    if not request.path.startswith("/admin") and _ip_is_blocked(ip_address):
         return (
             render_template("blocked.html", home_url=url_for("index")),
             403,
@@ -1928,10 +4966,21 @@ def track_visitors_and_block():
 
 
 @app.route("/", methods=["GET", "POST"])
+@_cached_page(
+    "appointment_slots",
+    "dog_breeds",
+    "coverage_areas",
+    "settings.site_photos",
+    "settings.service_notice",
+    "settings.meet_greet_enabled",
+)
 def index():
     global next_submission_id
 
     if request.method == "POST":
+        retry_after = _take_rate_limit_token("enquiry", _get_client_ip())
+        if retry_after:
+            return _rate_limited_response(retry_after, "Too many enquiries from this address.", as_json=False)
         submission = {
             "id": next_submission_id,
             "name": request.form.get("name", "").strip(),
@@ -1941,16 +4990,13 @@ def index():
             "status": STATUS_OPTIONS[0],
         }
         submissions.append(submission)
+        _submission_index.added(submission)
         next_submission_id += 1
-        _persist_state_change()
+        _persist_state_change(_submission_delta(submission))
         return redirect(url_for("index", submitted=1))
 
     submission_success = request.args.get("submitted") == "1"
-    slot_rows = [
-        serialized
-        for serialized in (_serialize_slot(slot) for slot in _sorted_slots())
-        if serialized.get("service_type") == "walk"
-    ]
+    slot_rows = [_serialize_slot(slot) for slot in _upcoming_slots("walk")]
     return render_template(
         "index.html",
         form_action=url_for("index"),
@@ -1969,9 +5015,16 @@ def index():
 
 
 @app.route("/bookings", methods=["GET"])
+@_cached_page(
+    "appointment_slots",
+    "dog_breeds",
+    "coverage_areas",
+    "settings.site_photos",
+    "settings.service_notice",
+    "settings.meet_greet_enabled",
+)
 def bookings_page():
-    slot_rows = [_serialize_slot(slot) for slot in _sorted_slots()]
-    meet_slots = [slot for slot in slot_rows if slot.get("service_type") == "meet"]
+    meet_slots = [_serialize_slot(slot) for slot in _upcoming_slots("meet")]
 
     return render_template(
         "bookings.html",
@@ -1989,6 +5042,7 @@ def bookings_page():
 
 
 @app.route("/page/<int:page_id>", methods=["GET"])
+@_cached_page("certificates", "settings.site_photos", "settings.service_notice")
 def hello_world_page(page_id: int):
     page = PAGE_DEFINITIONS.get(page_id)
     if not page:
@@ -2006,12 +5060,20 @@ def hello_world_page(page_id: int):
     )
 
 
-@app.route("/admin")
-def admin_page():
-    requested_view = (request.args.get("view") or "menu").strip().lower()
-    active_view = requested_view if requested_view in ADMIN_VIEWS else "menu"
+def _admin_visitor_page(page: int):
+    """One page of ``(ip_address, visitor)`` pairs, most recent visit first.
+
+    ``visitor_stats`` is already in last-visit order, so this walks it
+    backwards instead of sorting every visitor.
+    """
+
+    _flush_visits(persist=False)
+    with _visit_flush_lock:
+        pager = _pager(len(visitor_stats), page, VISITOR_PAGE_SIZE)
+        end = pager["offset"] + VISITOR_PAGE_SIZE
+        recent = list(itertools.islice(reversed(visitor_stats.items()), pager["offset"], end))
     visitor_rows = []
-    for ip_address, visitor in visitor_stats.items():
+    for ip_address, visitor in recent:
         if not isinstance(visitor, dict):
             app.logger.warning("Skipping visitor %s because data is not a dict", ip_address)
             continue
@@ -2021,20 +5083,123 @@ def admin_page():
             app.logger.warning("Skipping visitor %s due to invalid data: %s", ip_address, exc)
             continue
         visitor_rows.append((ip_address, normalized))
-    visitor_rows.sort(key=lambda item: _safe_last_visit(item[1]), reverse=True)
-    conversation_rows = [
-        data for data in (_serialize_conversation(cid) for cid in chat_conversations)
-        if data is not None
-    ]
-    chat_waiting_count = _pending_conversation_count()
-    slot_rows = [_serialize_slot(slot) for slot in _sorted_slots()]
-    available_slots = [slot for slot in slot_rows if not slot["is_booked"]]
-    booked_slots = [slot for slot in slot_rows if slot["is_booked"]]
-    new_enquiry_count = sum(1 for submission in submissions if (submission.get("status") or "New") == "New")
-    has_new_bookings = any((slot.get("workflow_status") or "New") == "New" for slot in booked_slots)
-    site_photo_rows = _site_photo_rows()
-    site_photo_groups = _group_photo_rows(site_photo_rows)
-    custom_photo_count = sum(1 for row in site_photo_rows if not row["is_default"])
+    return visitor_rows, pager
+
+
+def _admin_conversation_rows() -> list:
+    return [data for data in (_serialize_conversation(cid) for cid in chat_conversations) if data is not None]
+
+
+def _admin_slot_lists(open_page: int, booked_page: int) -> dict:
+    """Open and booked slots for the admin, serializing only the requested pages."""
+
+    all_slots = _sorted_slots()
+    open_slot_rows = [slot for slot in all_slots if not slot.get("is_booked")]
+    booked_slot_rows = [slot for slot in all_slots if slot.get("is_booked")]
+    open_page_rows, open_slots_pager = _paginate(open_slot_rows, open_page, ADMIN_SLOT_PAGE_SIZE)
+    booked_page_rows, booked_slots_pager = _paginate(booked_slot_rows, booked_page, ADMIN_SLOT_PAGE_SIZE)
+    return {
+        "available_slots": [_serialize_slot(slot) for slot in open_page_rows],
+        "booked_slots": [_serialize_slot(slot) for slot in booked_page_rows],
+        "open_slot_count": len(open_slot_rows),
+        "booked_slot_count": len(booked_slot_rows),
+        "open_slots_pager": open_slots_pager,
+        "booked_slots_pager": booked_slots_pager,
+        "has_new_bookings": any((slot.get("workflow_status") or "New") == "New" for slot in booked_slot_rows),
+    }
+
+
+def _admin_slot_counts() -> dict:
+    all_slots = _sorted_slots()
+    booked_count = sum(1 for slot in all_slots if slot.get("is_booked"))
+    open_count = len(all_slots) - booked_count
+    return {
+        "open_slot_count": open_count,
+        "booked_slot_count": booked_count,
+        "slot_summary": f"{booked_count} booked • {open_count} open",
+    }
+
+
+def _admin_visitor_counts() -> dict:
+    _flush_visits(persist=False)
+    return {"visitor_count": len(visitor_stats), "blocked_count": len(blocked_ips)}
+
+
+# Headline counts for each admin view, fetched by admin.js when a view is
+# opened so the menu stays current.
+ADMIN_VIEW_COUNTS = {
+    "enquiries": lambda: {
+        "submission_count": len(submissions),
+        "new_enquiry_count": sum(1 for row in submissions if (row.get("status") or "New") == "New"),
+    },
+    "appointments": _admin_slot_counts,
+    "visitors": _admin_visitor_counts,
+    "chat": lambda: {"chat_waiting_count": _pending_conversation_count()},
+    "breeds": lambda: {"breed_count": len(dog_breeds)},
+    "coverage": lambda: {"coverage_area_count": len(coverage_areas)},
+    "credentials": lambda: {"certificate_count": len(team_certificates)},
+}
+
+
+@app.route("/admin/api/<view_name>", methods=["GET"])
+def admin_view_counts(view_name: str):
+    counts = ADMIN_VIEW_COUNTS.get(view_name)
+    if counts is None:
+        abort(404)
+    response = jsonify({"counts": counts()})
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _admin_enquiries_context() -> dict:
+    return {"home_url": url_for("index"), "submissions": submissions, "status_options": STATUS_OPTIONS}
+
+
+def _admin_appointments_context() -> dict:
+    bulk_slot_message = None
+    if "bulk_created" in request.args:
+        bulk_slot_message = (
+            f"Added {_coerce_int(request.args.get('bulk_created'), 0)} slots; "
+            f"skipped {_coerce_int(request.args.get('bulk_skipped'), 0)} that were taken or in the past."
+        )
+    return {
+        **_admin_slot_lists(
+            _coerce_int(request.args.get("open_page"), 1),
+            _coerce_int(request.args.get("booked_page"), 1),
+        ),
+        "booking_status_options": BOOKING_WORKFLOW_STATUSES,
+        "booking_service_type_options": BOOKING_SERVICE_TYPE_OPTIONS,
+        "time_choices": DEFAULT_TIME_CHOICES,
+        "today": datetime.utcnow().strftime("%Y-%m-%d"),
+        "bulk_slot_error": request.args.get("bulk_error") or None,
+        "bulk_slot_message": bulk_slot_message,
+        "weekday_options": [(0, "Mon"), (1, "Tue"), (2, "Wed"), (3, "Thu"), (4, "Fri"), (5, "Sat"), (6, "Sun")],
+    }
+
+
+def _admin_visitors_context() -> dict:
+    visitor_rows, visitors_pager = _admin_visitor_page(_coerce_int(request.args.get("visitor_page"), 1))
+    blocklist_message = None
+    if "blocklist_added" in request.args or "blocklist_removed" in request.args:
+        verb = "Added" if "blocklist_added" in request.args else "Removed"
+        changed = _coerce_int(request.args.get("blocklist_added", request.args.get("blocklist_removed")), 0)
+        blocklist_message = f"{verb} {changed} rule{'' if changed == 1 else 's'}"
+        invalid = _coerce_int(request.args.get("blocklist_invalid"), 0)
+        if invalid:
+            blocklist_message += f"; ignored {invalid} entr{'y' if invalid == 1 else 'ies'} that were not IPs or CIDR ranges"
+        blocklist_message += "."
+    return {
+        "visitors": visitor_rows,
+        "visitors_pager": visitors_pager,
+        "visitor_rollups": _visitor_rollup_summary(),
+        "blocked_ips": blocked_ips,
+        "blocklist": _blocklist_summary(),
+        "blocklist_message": blocklist_message,
+        "ip_is_blocked": _ip_is_blocked,
+    }
+
+
+def _admin_backups_context() -> dict:
     state_action = request.args.get("state_action", "")
     state_messages = {
         "saved": "Settings saved to backup file.",
@@ -2052,8 +5217,9 @@ def admin_page():
         "history_missing": "That backup entry was not found.",
         "history_load_failed": "Unable to load the selected history backup.",
         "history_deleted": "History entry deleted.",
+        "job_ran": "Scheduled job finished.",
+        "job_busy": "That job is already running.",
     }
-    state_backup_message = state_messages.get(state_action)
     error_actions = {
         "save_failed",
         "load_failed",
@@ -2065,27 +5231,67 @@ def admin_page():
         "auto_import_failed",
         "history_load_failed",
         "history_missing",
+        "job_busy",
     }
-    state_backup_is_error = state_action in error_actions
+    return {
+        "state_backup_metadata": _get_state_backup_metadata(),
+        "state_backup_message": state_messages.get(state_action),
+        "state_backup_is_error": state_action in error_actions,
+        "persistence_status": _write_behind_summary(),
+        "kv_cache_status": _kv_cache_summary(),
+        "page_cache_status": _page_cache_summary(),
+        "rate_limit_status": _rate_limit_summary(),
+        "retention_preview": _backup_retention_preview(),
+        "scheduled_jobs": _scheduler_summary(),
+    }
+
+
+# Views whose body is rendered from templates/admin_views. /admin renders only
+# the active one; admin.js fetches the others from /admin/views/<view> when
+# they are first opened.
+ADMIN_VIEW_CONTEXTS = {
+    "enquiries": _admin_enquiries_context,
+    "appointments": _admin_appointments_context,
+    "visitors": _admin_visitors_context,
+    "backups": _admin_backups_context,
+}
+
+
+@app.route("/admin/views/<view_name>", methods=["GET"])
+def admin_view_fragment(view_name: str):
+    view_context = ADMIN_VIEW_CONTEXTS.get(view_name)
+    if view_context is None:
+        abort(404)
+    response = app.make_response(render_template(f"admin_views/{view_name}.html", **view_context()))
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@app.route("/admin")
+def admin_page():
+    requested_view = (request.args.get("view") or "menu").strip().lower()
+    active_view = requested_view if requested_view in ADMIN_VIEWS else "menu"
+    conversation_rows = _admin_conversation_rows()
+    chat_waiting_count = _pending_conversation_count()
+    site_photo_rows = _site_photo_rows()
+    site_photo_groups = _group_photo_rows(site_photo_rows)
+    custom_photo_count = sum(1 for row in site_photo_rows if not row["is_default"])
     weather_admin_unlocked = bool(session.get("weather_admin_unlocked", False))
     weather_unlock_error = request.args.get("weather_error") == "1"
-    return render_template(
-        "admin.html",
+    context = dict(
         home_url=url_for("index"),
         submissions=submissions,
-        status_options=STATUS_OPTIONS,
-        visitors=visitor_rows,
         blocked_ips=blocked_ips,
         chat_unread=chat_waiting_count > 0,
         chat_waiting_count=chat_waiting_count,
         chat_conversations=conversation_rows,
         chat_has_conversations=bool(conversation_rows),
-        available_slots=available_slots,
-        booked_slots=booked_slots,
-        booking_status_options=BOOKING_WORKFLOW_STATUSES,
-        booking_service_type_options=BOOKING_SERVICE_TYPE_OPTIONS,
-        time_choices=DEFAULT_TIME_CHOICES,
-        today=datetime.utcnow().strftime("%Y-%m-%d"),
+        **ADMIN_VIEW_COUNTS["enquiries"](),
+        **ADMIN_VIEW_COUNTS["appointments"](),
+        **ADMIN_VIEW_COUNTS["visitors"](),
+        has_new_bookings=any(
+            slot.get("is_booked") and (slot.get("workflow_status") or "New") == "New" for slot in _sorted_slots()
+        ),
         autopilot_enabled=autopilot_enabled,
         autopilot_status=autopilot_status,
         business_in_a_box=business_in_a_box,
@@ -2093,13 +5299,9 @@ def admin_page():
         autopilot_api_key_missing=_get_deepseek_api_key() is None,
         dog_breeds=_sorted_breeds(),
         breed_ai_suggestions=breed_ai_suggestions,
-        new_enquiry_count=new_enquiry_count,
-        has_new_bookings=has_new_bookings,
-        visitor_count=len(visitor_rows),
         state_backup_metadata=_get_state_backup_metadata(),
-        state_backup_message=state_backup_message,
-        state_backup_is_error=state_backup_is_error,
         active_view=active_view,
+        admin_data_views=sorted(ADMIN_VIEW_COUNTS),
         coverage_areas=_sorted_coverage_areas(),
         certificates=_sorted_certificates(),
         site_photo_groups=site_photo_groups,
@@ -2112,9 +5314,19 @@ def admin_page():
         format_price_label=_format_price_label,
         weather_api_key=weather_api_key,
         weather_api_key_source=_weather_key_source(),
+        forecast_cache_status=_forecast_cache_summary(),
         weather_admin_unlocked=weather_admin_unlocked,
         weather_unlock_error=weather_unlock_error,
     )
+    if active_view in ADMIN_VIEW_CONTEXTS:
+        context.update(ADMIN_VIEW_CONTEXTS[active_view]())
+    return render_template("admin.html", **context)
+
+
+def _is_verified_admin_session() -> bool:
+    """True once this browser session has unlocked the admin with the password."""
+
+    return bool(session.get("weather_admin_unlocked", False))
 
 
 @app.route("/admin/weather/unlock", methods=["POST"])
@@ -2141,8 +5353,8 @@ def save_weather_api_key():
         return redirect(url_for("admin_page", view="weather"))
 
     weather_api_key = (request.form.get("api_key") or "").strip() or None
-    _refresh_future_weather(datetime.utcnow())
-    _persist_state_change()
+    _persist_state_change(_settings_delta("weather_api_key"))
+    _wake_scheduled_job("refresh_weather")
     return redirect(url_for("admin_page", view="weather"))
 
 
@@ -2154,8 +5366,7 @@ def delete_weather_api_key():
         return redirect(url_for("admin_page", view="weather"))
 
     weather_api_key = None
-    _refresh_future_weather(datetime.utcnow())
-    _persist_state_change()
+    _persist_state_change(_settings_delta("weather_api_key"))
     return redirect(url_for("admin_page", view="weather"))
 
 
@@ -2171,7 +5382,7 @@ def update_site_photo():
     else:
         url_value = (request.form.get("photo_url") or "").strip()
         site_photos[key] = url_value or SITE_PHOTO_DEFAULTS[key]["default_url"]
-    _persist_state_change()
+    _persist_state_change(_settings_delta("site_photos"))
     return redirect(url_for("admin_page", view="photos"))
 
 
@@ -2188,10 +5399,18 @@ def toggle_auto_save_setting():
     global auto_save_enabled
 
     auto_save_enabled = request.form.get("enabled") == "1"
-    _persist_state_change()
+    _persist_state_change(_settings_delta("auto_save_enabled"))
     return redirect(url_for("admin_page", view="backups"))
 
 
+@app.route("/admin/jobs/<job_name>/run", methods=["POST"])
+def run_scheduled_job(job_name: str):
+    if job_name not in SCHEDULED_JOBS:
+        abort(404)
+    state_action = "job_ran" if _run_scheduled_job(job_name) else "job_busy"
+    return redirect(url_for("admin_page", view="backups", state_action=state_action))
+
+
 @app.route("/admin/state/auto-save/run", methods=["POST"])
 def run_auto_save():
     global auto_save_enabled, auto_save_last_run
@@ -2206,7 +5425,7 @@ def run_auto_save():
         auto_save_last_run = history_entry["saved_at"]
     else:
         auto_save_last_run = datetime.utcnow()
-    _persist_state_change()
+    _persist_state_change(_settings_delta("auto_save_last_run"))
     payload = {"saved": True, "saved_at": auto_save_last_run.isoformat()}
     if history_entry:
         payload["history_entry"] = _present_backup_history_entry(history_entry, include_urls=True)
@@ -2229,9 +5448,8 @@ def load_backup_history_entry(entry_id: int):
     raw_bytes = _r2_download(legacy_path)
     if raw_bytes is None:
         return redirect(url_for("admin_page", state_action="history_missing", view="backups"))
-    try:
-        data = json.loads(raw_bytes.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError):
+    data = _decode_snapshot(raw_bytes)
+    if data is None:
         return redirect(url_for("admin_page", state_action="history_load_failed", view="backups"))
     _load_state(data)
     _persist_state_change()
@@ -2249,7 +5467,7 @@ def delete_backup_history_entry(entry_id: int):
     legacy_path = entry.get("legacy_path")
     if legacy_path:
         _r2_delete(legacy_path)
-    _persist_state_change()
+    _persist_state_change(_settings_delta("backup_history", "next_backup_history_id"))
     return redirect(url_for("admin_page", state_action="history_deleted", view="backups"))
 
 
@@ -2269,14 +5487,19 @@ def load_admin_state():
 def download_admin_state():
     """Provide the current in-memory state as a downloadable JSON file."""
 
-    payload = json.dumps(_serialize_state(), indent=2)
+    payload = _snapshot_json(_serialize_state())
     _write_state_export_payload(payload)
     filename = STATE_EXPORT_FILENAME
     headers = {
         "Content-Disposition": f"attachment; filename={filename}",
         "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding",
     }
-    return Response(payload, mimetype="application/json", headers=headers)
+    body = payload.encode("utf-8")
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        body = gzip.compress(body, compresslevel=SNAPSHOT_COMPRESSION_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, mimetype="application/json", headers=headers)
 
 
 @app.route("/admin/state/import", methods=["POST"])
@@ -2297,12 +5520,8 @@ def import_admin_state():
         raw_bytes = payload_text.encode("utf-8")
     if raw_bytes is None:
         return redirect(url_for("admin_page", state_action="import_failed", view="backups"))
-    try:
-        payload = raw_bytes.decode("utf-8")
-        data = json.loads(payload)
-    except (UnicodeDecodeError, json.JSONDecodeError):
-        return redirect(url_for("admin_page", state_action="import_invalid", view="backups"))
-    if not isinstance(data, dict):
+    data = _decode_snapshot(raw_bytes)
+    if data is None:
         return redirect(url_for("admin_page", state_action="import_invalid", view="backups"))
     try:
         _load_state(data)
@@ -2323,7 +5542,7 @@ def toggle_autopilot():
             "last_error": None if autopilot_enabled else autopilot_status.get("last_error"),
         }
     )
-    _persist_state_change()
+    _persist_state_change(_settings_delta("autopilot_enabled", "autopilot_status"))
     return redirect(url_for("admin_page"))
 
 
@@ -2336,7 +5555,7 @@ def update_service_notice():
     if not message_value:
         message_value = SERVICE_NOTICE_DEFAULT_TEXT
     site_service_notice = {"enabled": enabled_value == "1", "message": message_value}
-    _persist_state_change()
+    _persist_state_change(_settings_delta("service_notice"))
     return redirect(url_for("admin_page", view="status"))
 
 
@@ -2346,7 +5565,7 @@ def update_meet_greet_setting():
 
     enabled_value = request.form.get("enabled", "0")
     meet_greet_enabled = enabled_value == "1"
-    _persist_state_change()
+    _persist_state_change(_settings_delta("meet_greet_enabled"))
     return redirect(url_for("admin_page", view="status"))
 
 
@@ -2355,7 +5574,7 @@ def update_business_profile():
     global business_in_a_box
     description = (request.form.get("business_box") or "").strip()
     business_in_a_box = description or BUSINESS_BOX_DEFAULT
-    _persist_state_change()
+    _persist_state_change(_settings_delta("business_in_a_box"))
     return redirect(url_for("admin_page"))
 
 
@@ -2364,13 +5583,15 @@ def add_dog_breed():
     global next_dog_breed_id
     name = (request.form.get("breed_name") or "").strip()
     normalized = _normalize_breed_name(name)
-    added = False
+    added = None
     if normalized and not _breed_name_exists(normalized):
-        dog_breeds.append({"id": next_dog_breed_id, "name": normalized})
+        added = {"id": next_dog_breed_id, "name": normalized}
+        dog_breeds.append(added)
+        _breed_index.added(added)
+        _breed_name_index.added(added)
         next_dog_breed_id += 1
-        added = True
     if added:
-        _persist_state_change()
+        _persist_state_change(_state_delta("dog_breeds", added["id"], dict(added)))
     return redirect(url_for("admin_page", view="breeds"))
 
 
@@ -2383,27 +5604,26 @@ def save_coverage_area():
     travel_fee = _parse_price(request.form.get("area_travel_fee"))
     if not name:
         return redirect(url_for("admin_page", view="coverage"))
-    updated = False
+    updated = None
     if area_id_value:
         area = _get_coverage_area(_coerce_int(area_id_value, 0))
         if area:
             area["name"] = name
             area["description"] = description
             area["travel_fee"] = travel_fee
-            updated = True
+            updated = area
     else:
-        coverage_areas.append(
-            {
-                "id": next_coverage_area_id,
-                "name": name,
-                "description": description,
-                "travel_fee": travel_fee,
-            }
-        )
+        updated = {
+            "id": next_coverage_area_id,
+            "name": name,
+            "description": description,
+            "travel_fee": travel_fee,
+        }
+        coverage_areas.append(updated)
+        _coverage_area_index.added(updated)
         next_coverage_area_id += 1
-        updated = True
     if updated:
-        _persist_state_change()
+        _persist_state_change(_state_delta("coverage_areas", updated["id"], dict(updated)))
     return redirect(url_for("admin_page", view="coverage"))
 
 
@@ -2411,7 +5631,7 @@ def save_coverage_area():
 def delete_coverage_area(area_id: int):
     global coverage_areas
     coverage_areas = [area for area in coverage_areas if area.get("id") != area_id]
-    _persist_state_change()
+    _persist_state_change(_state_delta("coverage_areas", area_id, op="delete"))
     return redirect(url_for("admin_page", view="coverage"))
 
 
@@ -2419,7 +5639,7 @@ def delete_coverage_area(area_id: int):
 def delete_dog_breed(breed_id: int):
     global dog_breeds
     dog_breeds = [breed for breed in dog_breeds if breed["id"] != breed_id]
-    _persist_state_change()
+    _persist_state_change(_state_delta("dog_breeds", breed_id, op="delete"))
     return redirect(url_for("admin_page", view="breeds"))
 
 
@@ -2435,7 +5655,7 @@ def save_certificate():
     link_url = (request.form.get("certificate_link_url") or "").strip()
     if not title:
         return redirect(url_for("admin_page", view="credentials"))
-    updated = False
+    updated = None
     if certificate_id_value:
         certificate = _get_certificate(_coerce_int(certificate_id_value, 0))
         if certificate:
@@ -2449,23 +5669,22 @@ def save_certificate():
                     "link_url": link_url,
                 }
             )
-            updated = True
+            updated = certificate
     else:
-        team_certificates.append(
-            {
-                "id": next_certificate_id,
-                "title": title,
-                "issuer": issuer,
-                "year": year,
-                "description": description,
-                "image_url": image_url,
-                "link_url": link_url,
-            }
-        )
+        updated = {
+            "id": next_certificate_id,
+            "title": title,
+            "issuer": issuer,
+            "year": year,
+            "description": description,
+            "image_url": image_url,
+            "link_url": link_url,
+        }
+        team_certificates.append(updated)
+        _certificate_index.added(updated)
         next_certificate_id += 1
-        updated = True
     if updated:
-        _persist_state_change()
+        _persist_state_change(_state_delta("certificates", updated["id"], dict(updated)))
     return redirect(url_for("admin_page", view="credentials"))
 
 
@@ -2473,7 +5692,7 @@ def save_certificate():
 def delete_certificate(certificate_id: int):
     global team_certificates
     team_certificates = [row for row in team_certificates if row.get("id") != certificate_id]
-    _persist_state_change()
+    _persist_state_change(_state_delta("certificates", certificate_id, op="delete"))
     return redirect(url_for("admin_page", view="credentials"))
 
 
@@ -2497,7 +5716,7 @@ def request_breed_ai():
     prompt = (request.form.get("breed_prompt") or "").strip()
     if not prompt:
         breed_ai_suggestions = None
-        _persist_state_change()
+        _persist_state_change(_settings_delta("breed_ai_suggestions"))
         return redirect(url_for("admin_page", view="breeds"))
     breed_ai_suggestions = {
         "prompt": prompt,
@@ -2527,7 +5746,7 @@ def request_breed_ai():
         data = _extract_json_object(reply)
     except Exception as exc:  # pylint: disable=broad-except
         breed_ai_suggestions["error"] = str(exc)
-        _persist_state_change()
+        _persist_state_change(_settings_delta("breed_ai_suggestions"))
         return redirect(url_for("admin_page", view="breeds"))
     add_items = []
     remove_items = []
@@ -2537,7 +5756,7 @@ def request_breed_ai():
             if value_str and value_str not in target:
                 target.append(value_str)
     breed_ai_suggestions.update({"add": add_items, "remove": remove_items})
-    _persist_state_change()
+    _persist_state_change(_settings_delta("breed_ai_suggestions"))
     return redirect(url_for("admin_page", view="breeds"))
 
 
@@ -2552,19 +5771,25 @@ def apply_breed_ai_suggestions():
             selected.append(normalized)
     if not selected or action not in {"add", "remove"}:
         return redirect(url_for("admin_page", view="breeds"))
-    changed = False
+    changes = []
     if action == "add":
         for name in selected:
             if not _breed_name_exists(name):
-                dog_breeds.append({"id": next_dog_breed_id, "name": name})
+                breed = {"id": next_dog_breed_id, "name": name}
+                dog_breeds.append(breed)
+                _breed_index.added(breed)
+                _breed_name_index.added(breed)
                 next_dog_breed_id += 1
-                changed = True
+                changes.append(_state_delta("dog_breeds", breed["id"], dict(breed)))
     elif action == "remove":
         target_names = {name.lower() for name in selected}
-        original_count = len(dog_breeds)
+        changes.extend(
+            _state_delta("dog_breeds", breed["id"], op="delete")
+            for breed in dog_breeds
+            if breed["name"].lower() in target_names
+        )
         dog_breeds = [breed for breed in dog_breeds if breed["name"].lower() not in target_names]
-        if len(dog_breeds) != original_count:
-            changed = True
+    changed = bool(changes)
     if breed_ai_suggestions:
         if action == "add":
             breed_ai_suggestions["add"] = [
@@ -2582,7 +5807,8 @@ def apply_breed_ai_suggestions():
             breed_ai_suggestions = None
             changed = True
     if changed:
-        _persist_state_change()
+        changes.append(_settings_delta("breed_ai_suggestions"))
+        _persist_state_change(*changes)
     return redirect(url_for("admin_page", view="breeds"))
 
 
@@ -2590,7 +5816,7 @@ def apply_breed_ai_suggestions():
 def clear_breed_ai_suggestions():
     global breed_ai_suggestions
     breed_ai_suggestions = None
-    _persist_state_change()
+    _persist_state_change(_settings_delta("breed_ai_suggestions"))
     return redirect(url_for("admin_page", view="breeds"))
 
 
@@ -2623,15 +5849,173 @@ def create_appointment_slot():
         "visitor_dog_breed": None,
         "price": price_amount,
         "service_type": service_type,
-        "weather": _fetch_tameside_weather(start),
+        "weather": _pending_weather(),
     }
-    appointment_slots.append(slot)
-    appointment_slots.sort(key=lambda entry: entry["start"])
+    _slot_calendar.insert(slot)
+    _slot_index.added(slot)
     next_slot_id += 1
-    _persist_state_change()
+    _queue_weather_enrichment(slot["id"])
+    _persist_state_change(_slot_delta(slot))
     return redirect(appointments_url)
 
 
+def _bulk_slot_starts(first_day, last_day, weekdays, times, limit: Optional[int] = None) -> list:
+    """Every ``weekday``/``time`` combination from ``first_day`` to ``last_day`` inclusive.
+
+    Stops once more than ``limit`` starts have been generated.
+    """
+
+    starts = []
+    day = first_day
+    while day <= last_day:
+        if day.weekday() in weekdays:
+            starts.extend(datetime.combine(day, slot_time) for slot_time in times)
+            if limit is not None and len(starts) > limit:
+                break
+        day += timedelta(days=1)
+    return starts
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _parse_bulk_slot_request(values: dict) -> dict:
+    """Validate a recurring-slot request from the admin form or JSON body.
+
+    Raises ``ValueError`` with a message fit to show the admin.
+    """
+
+    try:
+        first_day = datetime.strptime(str(values.get("start_date") or ""), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("Choose a start date.") from None
+    if values.get("end_date"):
+        try:
+            last_day = datetime.strptime(str(values["end_date"]), "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("The end date is not a valid date.") from None
+    else:
+        weeks = _coerce_int(values.get("weeks"), 0)
+        if weeks < 1:
+            raise ValueError("Choose how many weeks to fill.")
+        if 7 * weeks > BOOKING_WINDOW_DAYS:
+            raise ValueError(f"Fill at most {BOOKING_WINDOW_DAYS // 7} weeks at a time.")
+        last_day = first_day + timedelta(days=7 * weeks - 1)
+    if last_day < first_day:
+        raise ValueError("The end date is before the start date.")
+    # The booking pages only list BOOKING_WINDOW_DAYS ahead, so slots past
+    # that would sit unseen; stop at the last day the window covers.
+    last_listed_day = datetime.utcnow().date() + timedelta(days=BOOKING_WINDOW_DAYS - 1)
+    if last_day > last_listed_day:
+        raise ValueError(
+            f"Clients can only book {BOOKING_WINDOW_DAYS} days ahead; "
+            f"fill up to {last_listed_day.isoformat()} at the latest."
+        )
+    weekdays = {_coerce_int(value, -1) for value in _as_list(values.get("weekdays"))} & set(range(7))
+    if not weekdays:
+        raise ValueError("Pick at least one weekday.")
+    times = set()
+    for value in _as_list(values.get("times")):
+        try:
+            times.add(datetime.strptime(str(value).strip(), "%H:%M").time())
+        except ValueError:
+            raise ValueError(f"{value} is not a valid time.") from None
+    if not times:
+        raise ValueError("Pick at least one time.")
+    price_amount = _parse_price(str(values.get("price") or "").strip())
+    if price_amount is None:
+        raise ValueError("Enter a valid price.")
+    service_type = str(values.get("service_type") or "walk").strip()
+    if service_type not in BOOKING_SERVICE_TYPES:
+        raise ValueError("Choose a booking type.")
+    starts = _bulk_slot_starts(first_day, last_day, weekdays, sorted(times), limit=BULK_SLOT_MAX)
+    if len(starts) > BULK_SLOT_MAX:
+        raise ValueError(f"That would create more than {BULK_SLOT_MAX} slots; the limit is {BULK_SLOT_MAX} at a time.")
+    return {"starts": starts, "price": price_amount, "service_type": service_type}
+
+
+def _create_bulk_slots(starts: list, price_amount: float, service_type: str):
+    """Insert open slots for ``starts`` that are in the future and not already taken.
+
+    Everything lands with one calendar merge, one persist and one queued
+    weather batch. Returns ``(created_slots, skipped_starts)``.
+    """
+
+    global next_slot_id
+
+    if not starts:
+        return [], []
+    now = datetime.utcnow()
+    starts = sorted(set(starts))
+    taken = {slot["start"] for slot in _slot_calendar.between(starts[0], starts[-1] + timedelta(seconds=1))}
+    created, skipped = [], []
+    for start in starts:
+        if start <= now or start in taken:
+            skipped.append(start)
+            continue
+        created.append(
+            {
+                "id": next_slot_id,
+                "start": start,
+                "is_booked": False,
+                "workflow_status": "",
+                "visitor_name": None,
+                "visitor_email": None,
+                "visitor_dog_breed": None,
+                "price": price_amount,
+                "service_type": service_type,
+                "weather": _pending_weather(),
+            }
+        )
+        next_slot_id += 1
+    if created:
+        _slot_calendar.extend(created)
+        _queue_weather_enrichment(*(slot["id"] for slot in created))
+        _persist_state_change(*(_slot_delta(slot) for slot in created))
+    return created, skipped
+
+
+@app.route("/admin/slots/bulk", methods=["POST"])
+def create_bulk_appointment_slots():
+    """Publish a recurring block of slots, e.g. weekdays 08:00-16:00 for eight weeks.
+
+    Accepts the admin form or a JSON body with the same field names
+    (``weekdays`` as 0=Monday..6=Sunday, ``times`` as ``HH:MM`` strings).
+    """
+
+    if request.is_json:
+        values = request.get_json(silent=True)
+        if not isinstance(values, dict):
+            return jsonify({"error": "Send a JSON object."}), 400
+    else:
+        values = request.form.to_dict()
+        values["weekdays"] = request.form.getlist("weekdays")
+        values["times"] = request.form.getlist("times")
+    try:
+        plan = _parse_bulk_slot_request(values)
+    except ValueError as exc:
+        if request.is_json:
+            return jsonify({"error": str(exc)}), 400
+        return redirect(url_for("admin_page", view="appointments", bulk_error=str(exc)))
+    with _bulk_slot_lock:
+        created, skipped = _create_bulk_slots(plan["starts"], plan["price"], plan["service_type"])
+    if request.is_json:
+        return jsonify(
+            {
+                "created": [_serialize_slot(slot) for slot in created],
+                "skipped": [start.isoformat() for start in skipped],
+            }
+        )
+    return redirect(
+        url_for("admin_page", view="appointments", bulk_created=len(created), bulk_skipped=len(skipped))
+    )
+
+
 @app.route("/admin/slots/<int:slot_id>/status", methods=["POST"])
 def update_slot_status(slot_id: int):
     slot = _get_slot(slot_id)
@@ -2641,7 +6025,7 @@ def update_slot_status(slot_id: int):
     if status not in BOOKING_WORKFLOW_STATUSES:
         status = BOOKING_WORKFLOW_STATUSES[0]
     slot["workflow_status"] = status
-    _persist_state_change()
+    _persist_state_change(_slot_delta(slot))
     return redirect(url_for("admin_page", view="appointments"))
 
 
@@ -2670,31 +6054,64 @@ def update_appointment_slot(slot_id: int):
             return redirect(appointments_url)
     previous_start = slot.get("start")
     slot.update({"start": start, "service_type": service_type, "price": price_amount})
-    if previous_start != start or not slot.get("weather"):
-        slot["weather"] = _fetch_tameside_weather(start)
-    appointment_slots.sort(key=lambda entry: entry["start"])
-    _persist_state_change()
+    refresh_weather = previous_start != start or not slot.get("weather")
+    if refresh_weather:
+        slot["weather"] = _pending_weather()
+    if previous_start != start:
+        _slot_calendar.move(slot, previous_start)
+    if refresh_weather:
+        _queue_weather_enrichment(slot["id"])
+    _persist_state_change(_slot_delta(slot))
     return redirect(appointments_url)
 
 
 @app.route("/admin/slots/<int:slot_id>/delete", methods=["POST"])
 def delete_appointment_slot(slot_id: int):
-    global appointment_slots
     slot = _get_slot(slot_id)
     if slot is None:
         abort(404)
-    appointment_slots = [entry for entry in appointment_slots if entry["id"] != slot_id]
-    _persist_state_change()
+    _slot_calendar.remove(slot)
+    _slot_index.removed(slot)
+    _persist_state_change(_state_delta("appointment_slots", slot_id, op="delete"))
     return redirect(url_for("admin_page", view="appointments"))
 
 
+@app.route("/bookings/slots/weather", methods=["GET"])
+def slot_weather():
+    """Let pages poll for forecasts that were still pending when they rendered."""
+
+    slot_ids = []
+    for value in (request.args.get("ids") or "").split(",")[:200]:
+        slot_id = _coerce_int(value.strip(), 0)
+        if slot_id:
+            slot_ids.append(slot_id)
+    rows = []
+    for slot_id in slot_ids:
+        slot = _get_slot(slot_id)
+        if slot is None:
+            continue
+        serialized = _serialize_slot(slot)
+        rows.append(
+            {
+                key: serialized[key]
+                for key in ("id", "weather_status", "weather_summary", "weather_label", "is_rainy")
+            }
+        )
+    response = jsonify({"slots": rows})
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
 @app.route("/bookings/slots/<int:slot_id>", methods=["POST"])
 def book_appointment_slot(slot_id: int):
     slot = _get_slot(slot_id)
     if slot is None:
         return jsonify({"error": "Slot not found"}), 404
     if slot.get("is_booked"):
-        return jsonify({"error": "This slot has already been booked"}), 400
+        return jsonify({"error": "This slot has already been booked"}), 409
+    retry_after = _take_rate_limit_token("booking", _get_client_ip())
+    if retry_after:
+        return _rate_limited_response(retry_after, "Too many booking attempts. Please wait a moment.")
     payload = request.get_json(silent=True) or {}
     name = (payload.get("name") or request.form.get("name") or "").strip()
     email = (payload.get("email") or request.form.get("email") or "").strip()
@@ -2725,20 +6142,19 @@ def book_appointment_slot(slot_id: int):
     if not coverage_area:
         return jsonify({"error": "Please select your service area"}), 400
     travel_fee = _parse_price(coverage_area.get("travel_fee"))
-    slot.update(
-        {
-            "is_booked": True,
-            "visitor_name": name,
-            "visitor_email": email,
-            "visitor_dog_breed": breed["name"],
-            "visitor_service_area_id": coverage_area["id"],
-            "visitor_service_area_name": coverage_area.get("name"),
-            "visitor_travel_fee": travel_fee,
-            "workflow_status": BOOKING_WORKFLOW_STATUSES[0],
-            "booked_at": datetime.utcnow(),
-        }
-    )
-    _persist_state_change()
+    booking = {
+        "is_booked": True,
+        "visitor_name": name,
+        "visitor_email": email,
+        "visitor_dog_breed": breed["name"],
+        "visitor_service_area_id": coverage_area["id"],
+        "visitor_service_area_name": coverage_area.get("name"),
+        "visitor_travel_fee": travel_fee,
+        "workflow_status": BOOKING_WORKFLOW_STATUSES[0],
+        "booked_at": datetime.utcnow(),
+    }
+    if not _claim_slot(slot, booking):
+        return jsonify({"error": "This slot has already been booked"}), 409
     serialized_slot = _serialize_slot(slot)
     return jsonify({"slot": serialized_slot})
 
@@ -2761,7 +6177,7 @@ def edit_submission(submission_id: int):
                 else STATUS_OPTIONS[0],
             }
         )
-        _persist_state_change()
+        _persist_state_change(_submission_delta(submission))
         return redirect(url_for("admin_page"))
 
     submission.setdefault("status", STATUS_OPTIONS[0])
@@ -2785,7 +6201,7 @@ def update_submission_status(submission_id: int):
         status = STATUS_OPTIONS[0]
 
     submission["status"] = status
-    _persist_state_change()
+    _persist_state_change(_submission_delta(submission))
     return redirect(url_for("admin_page"))
 
 
@@ -2796,24 +6212,64 @@ def delete_submission(submission_id: int):
         abort(404)
 
     submissions.remove(submission)
-    _persist_state_change()
+    _submission_index.removed(submission)
+    _persist_state_change(_state_delta("submissions", submission_id, op="delete"))
     return redirect(url_for("admin_page"))
 
 
 @app.route("/admin/visitors/<path:ip_address>/block", methods=["POST"])
 def block_visitor(ip_address: str):
-    blocked_ips.add(ip_address)
-    _persist_state_change()
+    try:
+        rule = _normalize_block_rule(ip_address)
+    except ValueError:
+        rule = ip_address
+    _update_blocklist([rule])
     return redirect(url_for("admin_page"))
 
 
 @app.route("/admin/visitors/<path:ip_address>/unblock", methods=["POST"])
 def unblock_visitor(ip_address: str):
-    blocked_ips.discard(ip_address)
-    _persist_state_change()
+    rules = [ip_address]
+    try:
+        rules.append(_normalize_block_rule(ip_address))
+    except ValueError:
+        pass
+    _update_blocklist(rules, remove=True)
     return redirect(url_for("admin_page"))
 
 
+@app.route("/admin/blocklist/import", methods=["POST"])
+def import_blocklist():
+    """Add IPs and CIDR ranges pasted into the form or uploaded as a text file."""
+
+    text = request.form.get("rules") or ""
+    uploaded = request.files.get("blocklist_file")
+    if uploaded and uploaded.filename:
+        text += "\n" + uploaded.read().decode("utf-8", errors="replace")
+    rules, invalid = _parse_block_rules(text)
+    if request.form.get("action") == "remove":
+        outcome = {"blocklist_removed": _update_blocklist(rules, remove=True)}
+    else:
+        outcome = {"blocklist_added": _update_blocklist(rules)}
+    return redirect(url_for("admin_page", view="visitors", blocklist_invalid=len(invalid), **outcome))
+
+
+@app.route("/admin/blocklist/export", methods=["GET"])
+def export_blocklist():
+    """Download the blocklist as text, one rule per line, ready to import again."""
+
+    def sort_key(rule):
+        try:
+            network = ipaddress.ip_network(rule, strict=False)
+        except ValueError:
+            return (7, 0, rule)
+        return (network.version, int(network.network_address), rule)
+
+    body = "".join(f"{rule}\n" for rule in sorted(blocked_ips, key=sort_key))
+    headers = {"Content-Disposition": "attachment; filename=blocklist.txt", "Cache-Control": "no-store"}
+    return Response(body, mimetype="text/plain", headers=headers)
+
+
 @app.route("/chat/messages", methods=["GET", "POST"])
 def chat_messages_endpoint():
     if request.method == "POST":
@@ -2831,6 +6287,16 @@ def chat_messages_endpoint():
             visitor_id = _get_client_ip()
         if not visitor_id:
             return jsonify({"error": "Unable to determine visitor"}), 400
+        if not _is_verified_admin_session():
+            # ``sender`` comes from the client, so every post is limited per
+            # address; visitors also per visitor id, so neither a changing id
+            # nor a shared address escapes the budget.
+            identities = [_get_client_ip()]
+            if sender == "visitor":
+                identities.append(f"visitor:{visitor_id}")
+            retry_after = _take_rate_limit_token("chat", *identities)
+            if retry_after:
+                return _rate_limited_response(retry_after, "You're sending messages too quickly.")
         ip_address = _get_client_ip() if sender == "visitor" else None
         message = _add_chat_message(sender, body, visitor_id, ip_address=ip_address)
         return jsonify(message), 201
@@ -2869,7 +6335,10 @@ def mark_chat_as_read():
     data = request.get_json(silent=True) or {}
     visitor_id = (data.get("visitor_id") or request.form.get("visitor_id") or "").strip()
     _mark_conversation_as_read(visitor_id or None)
-    _persist_state_change()
+    if visitor_id and visitor_id in chat_conversations:
+        _persist_state_change(_conversation_delta(visitor_id, include_messages=True))
+    else:
+        _persist_state_change()
     return ("", 204)
 
 
@@ -2896,10 +6365,13 @@ def chat_stream():
 
 try:
     if not load_data():
-        save_data(source="auto", record_history=False)
+        _write_state_changes((), full_save=True)
 except Exception as exc:  # pragma: no cover - defensive startup
     app.logger.exception("State bootstrap failed: %s", exc)
 
+# Queued visits (and write-behind changes) would otherwise be lost on deploy.
+_install_shutdown_hooks()
+
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,594 @@
+(function () {
+  const conversationsEl = document.getElementById("adminChatConversations");
+  const initialConversations = conversationsEl ? JSON.parse(conversationsEl.textContent || "[]") : [];
+  const messagesEl = document.getElementById("adminChatMessages");
+  const form = document.getElementById("adminChatForm");
+  const input = document.getElementById("adminChatInput");
+  const submitButton = form ? form.querySelector("button[type='submit']") : null;
+  const indicator = document.getElementById("chatIndicator");
+  const panel = document.getElementById("chatPanel");
+  const statusMessage = document.getElementById("chatStatusMessage");
+  const openButton = document.getElementById("openChatButton");
+  const closeButton = document.getElementById("closeChatButton");
+  const chatAlert = document.querySelector(".chat-alert");
+  const globalChatBanner = document.getElementById("globalChatBanner");
+  const globalChatBannerText = document.getElementById("globalChatBannerText");
+  const conversationSelect = document.getElementById("chatVisitorSelect");
+  const deleteButton = document.getElementById("deleteConversationButton");
+  const AudioContext = window.AudioContext || window.webkitAudioContext;
+  let audioCtx = null;
+  let audioUnlocked = false;
+  if (!messagesEl || !form) {
+    return;
+  }
+  const conversationMap = new Map();
+  const cachedMessages = new Map();
+  const messageIds = new Set();
+  const unreadVisitors = new Set();
+  let activeVisitorId = null;
+  let chatWindowOpen = false;
+  let shouldStickToBottom = true;
+  let eventSource = null;
+  let reconnectTimer = null;
+  let legacyLastMessageId = 0;
+
+  function ensureAudioContext() {
+    if (audioCtx || !AudioContext) {
+      return !!audioCtx;
+    }
+    try {
+      audioCtx = new AudioContext();
+    } catch (error) {
+      console.warn("Unable to initialize audio context", error);
+    }
+    return !!audioCtx;
+  }
+
+  function unlockAudioContext() {
+    if (audioUnlocked || !ensureAudioContext()) {
+      return;
+    }
+    if (audioCtx.state === "suspended") {
+      audioCtx.resume();
+    }
+    audioUnlocked = true;
+  }
+
+  function playNotificationSound() {
+    if (!ensureAudioContext()) return;
+    if (audioCtx.state === "suspended" && audioUnlocked) {
+      audioCtx.resume();
+    }
+    try {
+      const oscillator = audioCtx.createOscillator();
+      const gainNode = audioCtx.createGain();
+      oscillator.type = "sine";
+      oscillator.frequency.value = 880;
+      gainNode.gain.value = 0.0001;
+      oscillator.connect(gainNode);
+      gainNode.connect(audioCtx.destination);
+      const now = audioCtx.currentTime;
+      gainNode.gain.exponentialRampToValueAtTime(0.15, now + 0.02);
+      gainNode.gain.exponentialRampToValueAtTime(0.00001, now + 0.35);
+      oscillator.start(now);
+      oscillator.stop(now + 0.4);
+    } catch (error) {
+      console.warn("Unable to play notification sound", error);
+    }
+  }
+
+  function formatConversationLabel(meta) {
+    if (!meta || !meta.visitor_id) {
+      return "Unknown visitor";
+    }
+    const shortId = meta.visitor_id.slice(0, 6).toUpperCase();
+    const ip = meta.ip_address && meta.ip_address !== "Unknown" ? meta.ip_address : null;
+    return ip ? `${ip} (${shortId})` : `Visitor ${shortId}`;
+  }
+
+  function updateConversationSelect() {
+    if (!conversationSelect) return;
+    const previousValue = conversationSelect.value;
+    conversationSelect.innerHTML = "";
+    if (!conversationMap.size) {
+      const option = document.createElement("option");
+      option.value = "";
+      option.textContent = "No conversations yet";
+      conversationSelect.appendChild(option);
+      conversationSelect.disabled = true;
+    } else {
+      conversationSelect.disabled = false;
+      Array.from(conversationMap.values())
+        .sort((a, b) => {
+          const aDate = new Date(a.created_at || 0).getTime();
+          const bDate = new Date(b.created_at || 0).getTime();
+          return bDate - aDate;
+        })
+        .forEach((meta) => {
+          if (!meta || !meta.visitor_id) return;
+          const option = document.createElement("option");
+          option.value = meta.visitor_id;
+          option.textContent = formatConversationLabel(meta);
+          if (unreadVisitors.has(meta.visitor_id)) {
+            option.textContent += " • New";
+          }
+          conversationSelect.appendChild(option);
+        });
+    }
+    if (previousValue && conversationMap.has(previousValue)) {
+      conversationSelect.value = previousValue;
+    } else if (activeVisitorId) {
+      conversationSelect.value = activeVisitorId;
+    } else {
+      conversationSelect.value = "";
+    }
+  }
+
+  function ensureConversationMeta(visitorId, ipAddress) {
+    if (!visitorId) return;
+    const existing = conversationMap.get(visitorId) || {};
+    const merged = Object.assign({}, existing, {
+      visitor_id: visitorId,
+      ip_address: ipAddress || existing.ip_address || "Unknown",
+    });
+    merged.created_at = merged.created_at || new Date().toISOString();
+    merged.message_count = (cachedMessages.get(visitorId) || []).length;
+    conversationMap.set(visitorId, merged);
+  }
+
+  function markCachedMessagesAsRead(visitorId) {
+    const messages = cachedMessages.get(visitorId);
+    if (!messages) return;
+    messages.forEach((msg) => {
+      if (msg.sender === "visitor") {
+        msg.seen_by_admin = true;
+      }
+    });
+  }
+
+  function renderPlaceholder(text) {
+    const placeholder = document.createElement("div");
+    placeholder.className = "chat-empty-state";
+    placeholder.textContent = text;
+    messagesEl.appendChild(placeholder);
+  }
+
+  function renderMessage(message) {
+    const row = document.createElement("div");
+    row.className = `chat-row ${message.sender}`;
+    const bubble = document.createElement("div");
+    bubble.className = "bubble";
+    bubble.textContent = message.body;
+    row.appendChild(bubble);
+    messagesEl.appendChild(row);
+    if (shouldStickToBottom) {
+      messagesEl.scrollTop = messagesEl.scrollHeight;
+    }
+  }
+
+  function renderAllMessages() {
+    messagesEl.innerHTML = "";
+    if (!activeVisitorId || !cachedMessages.has(activeVisitorId)) {
+      renderPlaceholder("Select a visitor conversation to get started.");
+      return;
+    }
+    const messages = cachedMessages.get(activeVisitorId).slice().sort((a, b) => a.id - b.id);
+    if (!messages.length) {
+      renderPlaceholder("No messages yet. Say hello to the visitor!");
+      return;
+    }
+    messages.forEach((msg) => renderMessage(msg));
+    messagesEl.scrollTop = messagesEl.scrollHeight;
+  }
+
+  function updateStickToBottom() {
+    const { scrollTop, scrollHeight, clientHeight } = messagesEl;
+    const distanceFromBottom = scrollHeight - (scrollTop + clientHeight);
+    shouldStickToBottom = distanceFromBottom <= 40;
+  }
+
+  messagesEl.addEventListener("scroll", updateStickToBottom);
+
+  function setIndicator(state, waitingCount = unreadVisitors.size) {
+    if (!indicator) return;
+    indicator.classList.toggle("active", state);
+    if (!state) {
+      indicator.textContent = "All caught up";
+    } else if (waitingCount === 1) {
+      indicator.textContent = "1 visitor waiting";
+    } else {
+      indicator.textContent = `${waitingCount} visitors waiting`;
+    }
+  }
+
+  function setFlash(state) {
+    if (!chatAlert) return;
+    if (state && !chatWindowOpen) {
+      chatAlert.classList.add("flash");
+    } else {
+      chatAlert.classList.remove("flash");
+    }
+  }
+
+  function updateGlobalBanner(waitingCount) {
+    if (!globalChatBanner) return;
+    const hasWaiting = waitingCount > 0;
+    globalChatBanner.classList.toggle("is-active", hasWaiting);
+    if (hasWaiting && globalChatBannerText) {
+      globalChatBannerText.textContent =
+        waitingCount === 1
+          ? "A visitor is waiting in live chat."
+          : `${waitingCount} visitors are waiting in live chat.`;
+    }
+  }
+
+  function updateChatStatus(waitingCount) {
+    if (statusMessage) {
+      if (!conversationMap.size) {
+        statusMessage.textContent = "No live conversations yet.";
+      } else if (waitingCount > 1) {
+        statusMessage.textContent = `There are ${waitingCount} visitors waiting to chat.`;
+      } else if (waitingCount === 1) {
+        statusMessage.textContent = "A visitor is waiting to chat.";
+      } else if (chatWindowOpen) {
+        statusMessage.textContent = "Chat window is open.";
+      } else {
+        statusMessage.textContent = "No visitors are currently waiting.";
+      }
+    }
+    if (openButton) {
+      if (!conversationMap.size) {
+        openButton.disabled = true;
+        openButton.textContent = "Open chat window";
+      } else if (chatWindowOpen) {
+        openButton.disabled = true;
+        openButton.textContent = "Chat window open";
+      } else {
+        openButton.disabled = false;
+        openButton.textContent = waitingCount ? "Respond to visitor" : "Open chat window";
+      }
+    }
+    setFlash(waitingCount > 0);
+    updateGlobalBanner(waitingCount);
+  }
+
+  function updateWaitingState() {
+    const waitingCount = unreadVisitors.size;
+    setIndicator(waitingCount > 0, waitingCount);
+    updateChatStatus(waitingCount);
+    updateConversationSelect();
+  }
+
+  function updateFormState() {
+    const hasActive = !!activeVisitorId && conversationMap.has(activeVisitorId);
+    if (input) {
+      input.disabled = !hasActive;
+    }
+    if (submitButton) {
+      submitButton.disabled = !hasActive;
+    }
+    if (deleteButton) {
+      deleteButton.disabled = !hasActive;
+    }
+  }
+
+  function addMessageToCache(message, fromHistory = false) {
+    if (!message || messageIds.has(message.id)) {
+      return;
+    }
+    const visitorId = message.visitor_id;
+    if (!cachedMessages.has(visitorId)) {
+      cachedMessages.set(visitorId, []);
+    }
+    cachedMessages.get(visitorId).push(message);
+    messageIds.add(message.id);
+    legacyLastMessageId = Math.max(legacyLastMessageId, message.id);
+    ensureConversationMeta(visitorId, message.visitor_ip);
+    if (!fromHistory && message.sender === "visitor" && !message.seen_by_admin) {
+      unreadVisitors.add(visitorId);
+      if (!chatWindowOpen || visitorId !== activeVisitorId) {
+        playNotificationSound();
+      }
+    }
+    if (chatWindowOpen && visitorId === activeVisitorId && !fromHistory) {
+      renderMessage(message);
+    }
+  }
+
+  function handleNewMessage(message) {
+    addMessageToCache(message);
+    if (!activeVisitorId) {
+      activeVisitorId = message.visitor_id;
+      updateFormState();
+      renderAllMessages();
+    } else if (chatWindowOpen && message.visitor_id === activeVisitorId) {
+      shouldStickToBottom = true;
+    }
+    if (chatWindowOpen && message.visitor_id === activeVisitorId) {
+      markAsRead();
+    }
+    updateWaitingState();
+  }
+
+  function handleHistory(payload) {
+    const messages = Array.isArray(payload.messages) ? payload.messages : [];
+    cachedMessages.clear();
+    messageIds.clear();
+    messages
+      .slice()
+      .sort((a, b) => a.id - b.id)
+      .forEach((msg) => addMessageToCache(msg, true));
+    if (Array.isArray(payload.conversations)) {
+      conversationMap.clear();
+      unreadVisitors.clear();
+      payload.conversations.forEach((conversation) => {
+        if (!conversation || !conversation.visitor_id) return;
+        conversationMap.set(conversation.visitor_id, conversation);
+        if (conversation.unread) {
+          unreadVisitors.add(conversation.visitor_id);
+        }
+      });
+    }
+    if (!activeVisitorId) {
+      const firstUnread = unreadVisitors.values().next().value;
+      if (firstUnread) {
+        activeVisitorId = firstUnread;
+      } else {
+        const firstConversation = conversationMap.keys().next().value;
+        activeVisitorId = firstConversation || null;
+      }
+    }
+    renderAllMessages();
+    updateFormState();
+    updateWaitingState();
+  }
+
+  function removeConversationFromState(visitorId) {
+    if (!visitorId) return;
+    cachedMessages.delete(visitorId);
+    conversationMap.delete(visitorId);
+    unreadVisitors.delete(visitorId);
+    if (activeVisitorId === visitorId) {
+      activeVisitorId = conversationMap.keys().next().value || null;
+    }
+    if (!conversationMap.size) {
+      closeChatWindow();
+    }
+    updateFormState();
+    renderAllMessages();
+    updateWaitingState();
+  }
+
+  function handleConversationDeleted(visitorId) {
+    removeConversationFromState(visitorId);
+  }
+
+  async function markAsRead(force = false) {
+    if (!activeVisitorId) return;
+    if (!unreadVisitors.has(activeVisitorId) && !force) {
+      return;
+    }
+    unreadVisitors.delete(activeVisitorId);
+    markCachedMessagesAsRead(activeVisitorId);
+    updateWaitingState();
+    try {
+      await fetch("/admin/chat/read", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ visitor_id: activeVisitorId }),
+      });
+    } catch (error) {
+      console.error("Unable to mark chat as read", error);
+    }
+  }
+
+  function handleStreamPayload(payload) {
+    if (!payload) return;
+    if (payload.type === "ping") {
+      return;
+    }
+    if (payload.type === "history") {
+      handleHistory(payload);
+      return;
+    }
+    if (payload.type === "message" && payload.message) {
+      handleNewMessage(payload.message);
+      return;
+    }
+    if (payload.type === "conversation_deleted") {
+      handleConversationDeleted(payload.visitor_id);
+    }
+  }
+
+  function disconnectStream() {
+    if (eventSource) {
+      eventSource.close();
+      eventSource = null;
+    }
+    if (reconnectTimer) {
+      clearTimeout(reconnectTimer);
+      reconnectTimer = null;
+    }
+  }
+
+  function connectStream() {
+    if (!window.EventSource || eventSource) {
+      return;
+    }
+    eventSource = new EventSource("/chat/stream?role=admin");
+    eventSource.onmessage = (event) => {
+      try {
+        const payload = JSON.parse(event.data);
+        handleStreamPayload(payload);
+      } catch (error) {
+        console.error("Unable to parse chat update", error);
+      }
+    };
+    eventSource.onerror = () => {
+      disconnectStream();
+      reconnectTimer = setTimeout(connectStream, 2000);
+    };
+  }
+
+  function getDefaultVisitor() {
+    const firstUnread = unreadVisitors.values().next().value;
+    if (firstUnread) return firstUnread;
+    return conversationMap.keys().next().value || null;
+  }
+
+  function openChatWindow() {
+    if (!panel || !conversationMap.size) return;
+    chatWindowOpen = true;
+    panel.classList.remove("hidden");
+    if (!activeVisitorId) {
+      activeVisitorId = getDefaultVisitor();
+    }
+    shouldStickToBottom = true;
+    renderAllMessages();
+    updateFormState();
+    updateWaitingState();
+    setFlash(false);
+    markAsRead(true);
+  }
+
+  function closeChatWindow() {
+    if (!panel) return;
+    chatWindowOpen = false;
+    panel.classList.add("hidden");
+    updateWaitingState();
+  }
+
+  const unlockEvents = [openButton, closeButton, form];
+  unlockEvents.forEach((element) => {
+    if (!element) return;
+    const eventName = element === form ? "submit" : "click";
+    element.addEventListener(eventName, unlockAudioContext, { once: true });
+  });
+
+  window.addEventListener(
+    "pointerdown",
+    () => {
+      unlockAudioContext();
+    },
+    { once: true }
+  );
+
+  if (openButton) {
+    openButton.addEventListener("click", openChatWindow);
+  }
+
+  if (closeButton) {
+    closeButton.addEventListener("click", closeChatWindow);
+  }
+
+  if (conversationSelect) {
+    conversationSelect.addEventListener("change", (event) => {
+      const value = event.target.value;
+      activeVisitorId = value || null;
+      shouldStickToBottom = true;
+      renderAllMessages();
+      updateFormState();
+      if (chatWindowOpen) {
+        markAsRead();
+      }
+    });
+  }
+
+  if (deleteButton) {
+    deleteButton.addEventListener("click", async () => {
+      if (!activeVisitorId) return;
+      const confirmed = window.confirm("Delete this conversation? This cannot be undone.");
+      if (!confirmed) return;
+      try {
+        await fetch(`/admin/chat/${encodeURIComponent(activeVisitorId)}/delete`, {
+          method: "POST",
+        });
+      } catch (error) {
+        console.error("Unable to delete conversation", error);
+      }
+      removeConversationFromState(activeVisitorId);
+    });
+  }
+
+  form.addEventListener("submit", async (event) => {
+    event.preventDefault();
+    if (!activeVisitorId) return;
+    const value = input.value.trim();
+    if (!value) return;
+    try {
+      const response = await fetch("/chat/messages", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ sender: "admin", body: value, visitor_id: activeVisitorId }),
+      });
+      if (response.ok) {
+        const message = await response.json();
+        input.value = "";
+        shouldStickToBottom = true;
+        handleNewMessage(message);
+        markAsRead();
+      }
+    } catch (error) {
+      console.error("Unable to send chat response", error);
+    }
+  });
+
+  if (panel) {
+    panel.addEventListener("click", () => markAsRead());
+    panel.addEventListener("mouseenter", () => markAsRead());
+  }
+
+  async function loadInitialHistory() {
+    try {
+      const response = await fetch(`/chat/messages?role=admin`, { cache: "no-store" });
+      if (!response.ok) return;
+      const data = await response.json();
+      handleHistory(data);
+    } catch (error) {
+      console.error("Unable to load chat messages", error);
+    }
+  }
+
+  async function legacyPoll() {
+    try {
+      const response = await fetch(`/chat/messages?role=admin&after=${legacyLastMessageId}`, {
+        cache: "no-store",
+      });
+      if (!response.ok) return;
+      const data = await response.json();
+      if (Array.isArray(data.messages)) {
+        data.messages.forEach((msg) => handleNewMessage(msg));
+      }
+    } catch (error) {
+      console.error("Unable to load chat messages", error);
+    }
+  }
+
+  function bootstrapConversations() {
+    if (Array.isArray(initialConversations)) {
+      initialConversations.forEach((conversation) => {
+        if (!conversation || !conversation.visitor_id) return;
+        conversationMap.set(conversation.visitor_id, conversation);
+        if (conversation.unread) {
+          unreadVisitors.add(conversation.visitor_id);
+        }
+      });
+    }
+    activeVisitorId = getDefaultVisitor();
+    updateFormState();
+    updateWaitingState();
+  }
+
+  bootstrapConversations();
+
+  if (window.EventSource) {
+    connectStream();
+    window.addEventListener("beforeunload", disconnectStream);
+  } else {
+    console.warn("EventSource not available; using fallback polling");
+    loadInitialHistory().finally(() => {
+      legacyPoll();
+      setInterval(legacyPoll, 4000);
+    });
+  }
+})();
@@ -0,0 +1,151 @@
+(function () {
+  const views = Array.from(document.querySelectorAll("[data-view]"));
+  const navButtons = Array.from(document.querySelectorAll(".view-nav [data-open-view]"));
+  const triggers = Array.from(document.querySelectorAll("[data-open-view]"));
+  const initialView = document.body.dataset.activeView;
+  let activeView = initialView || "menu";
+  function setActiveView(viewName) {
+    if (!viewName) {
+      viewName = "menu";
+    }
+    activeView = viewName;
+    views.forEach((view) => {
+      view.classList.toggle("view--active", view.dataset.view === viewName);
+    });
+    navButtons.forEach((button) => {
+      button.classList.toggle("is-active", button.dataset.openView === viewName);
+    });
+  }
+
+  // Views with a counts endpoint refresh their headline numbers when opened,
+  // so the menu stays current without re-rendering the whole page.
+  const viewCountsUrl = (viewName) => `/admin/api/${encodeURIComponent(viewName)}`;
+  const dataViews = new Set(
+    (document.body.dataset.adminDataViews || "").split(",").filter((name) => name)
+  );
+
+  function applyCounts(counts) {
+    Object.entries(counts || {}).forEach(([name, value]) => {
+      document.querySelectorAll(`[data-admin-count="${name}"]`).forEach((node) => {
+        node.textContent = value;
+      });
+    });
+  }
+
+  async function loadViewCounts(viewName) {
+    if (!dataViews.has(viewName)) {
+      return;
+    }
+    try {
+      const response = await fetch(viewCountsUrl(viewName), {
+        headers: { Accept: "application/json" },
+        cache: "no-store",
+      });
+      if (!response.ok) {
+        return;
+      }
+      const data = await response.json();
+      applyCounts(data.counts);
+    } catch (error) {
+      console.warn(`Unable to refresh the ${viewName} view`, error);
+    }
+  }
+
+  function rememberView(viewName) {
+    const url = new URL(window.location.href);
+    if (url.searchParams.get("view") === viewName) {
+      return;
+    }
+    url.searchParams.set("view", viewName);
+    window.history.replaceState(null, "", url);
+  }
+
+  function bindTimeOptions(root) {
+    const timeButtons = root.querySelectorAll("[data-time-option]");
+    const timeInput = root.querySelector("#slotTimeInput");
+    if (!timeInput || !timeButtons.length) {
+      return;
+    }
+    function select(button) {
+      timeButtons.forEach((btn) => btn.classList.toggle("selected", btn === button));
+      timeInput.value = button.dataset.timeOption || "";
+    }
+    const defaultButton = Array.from(timeButtons).find((btn) => btn.dataset.timeOption);
+    if (defaultButton) {
+      select(defaultButton);
+    }
+    timeButtons.forEach((button) => {
+      button.addEventListener("click", () => select(button));
+    });
+  }
+
+  function bindBackupCopy(root) {
+    const copyButton = root.querySelector("[data-copy-backup-path]");
+    if (!copyButton || !copyButton.dataset.copyBackupValue) {
+      return;
+    }
+    copyButton.addEventListener("click", async () => {
+      const originalText = copyButton.textContent;
+      try {
+        if (navigator.clipboard && navigator.clipboard.writeText) {
+          await navigator.clipboard.writeText(copyButton.dataset.copyBackupValue);
+        } else {
+          throw new Error("Clipboard API unavailable");
+        }
+        copyButton.textContent = "Copied!";
+      } catch (error) {
+        console.warn("Unable to copy backup path", error);
+      }
+      setTimeout(() => {
+        copyButton.textContent = originalText;
+      }, 2000);
+    });
+  }
+
+  function bindViewControls(root) {
+    bindTimeOptions(root);
+    bindBackupCopy(root);
+  }
+
+  // Heavy views are rendered only when they are the page's active view; the
+  // others are fetched as HTML the first time they are opened.
+  async function loadViewBody(viewName) {
+    const body = document.querySelector(`[data-view-body="${viewName}"]`);
+    if (!body || "viewLoaded" in body.dataset) {
+      return;
+    }
+    body.dataset.viewLoaded = "";
+    try {
+      const response = await fetch(`/admin/views/${encodeURIComponent(viewName)}`, {
+        headers: { Accept: "text/html" },
+        cache: "no-store",
+      });
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}`);
+      }
+      body.innerHTML = await response.text();
+      bindViewControls(body);
+      document.dispatchEvent(new CustomEvent("admin:view-loaded", { detail: { view: viewName } }));
+    } catch (error) {
+      delete body.dataset.viewLoaded;
+      console.warn(`Unable to load the ${viewName} view`, error);
+    }
+  }
+
+  triggers.forEach((trigger) => {
+    trigger.addEventListener("click", (event) => {
+      const target = trigger.dataset.openView;
+      if (!target) {
+        return;
+      }
+      event.preventDefault();
+      setActiveView(target);
+      rememberView(target);
+      loadViewBody(target);
+      loadViewCounts(target);
+    });
+  });
+
+  setActiveView(activeView);
+  bindViewControls(document);
+})();
@@ -0,0 +1,70 @@
+(function () {
+  const POLL_INTERVAL_MS = 3000;
+  const MAX_POLLS = 40;
+  const ICONS = {
+    sunny: ["☀️", "Sunny"],
+    rain: ["🌧️", "Rain forecast"],
+    good: ["✅", "Good weather"],
+  };
+
+  function pendingNodes() {
+    return document.querySelectorAll('[data-slot-weather][data-weather-status="pending"]');
+  }
+
+  function applyWeather(node, slot) {
+    node.dataset.weatherStatus = slot.weather_status || "unknown";
+    if (node.classList.contains("slot-card__weather")) {
+      node.textContent = slot.weather_label;
+      node.classList.toggle("is-rain", Boolean(slot.is_rainy));
+      return;
+    }
+    node.className = node.className.replace(/\bslot-weather-\S+/, `slot-weather-${node.dataset.weatherStatus}`);
+    const icon = node.querySelector(".slot-weather__icon");
+    const summary = node.querySelector(".slot-weather__summary");
+    const [glyph, title] = ICONS[slot.weather_status] || ["ℹ️", "Weather unavailable"];
+    if (icon) {
+      icon.textContent = glyph;
+      icon.title = title;
+    }
+    if (summary) {
+      summary.textContent = slot.weather_summary || "Weather forecast unavailable";
+    }
+  }
+
+  let polls = 0;
+  let timer = null;
+
+  function schedule() {
+    if (timer === null && pendingNodes().length) {
+      timer = setTimeout(() => {
+        timer = null;
+        poll();
+      }, POLL_INTERVAL_MS);
+    }
+  }
+
+  function poll() {
+    const nodes = Array.from(pendingNodes());
+    if (!nodes.length || polls >= MAX_POLLS) {
+      return;
+    }
+    polls += 1;
+    const ids = Array.from(new Set(nodes.map((node) => node.dataset.slotWeather)));
+    fetch(`/bookings/slots/weather?ids=${ids.join(",")}`, { headers: { Accept: "application/json" } })
+      .then((response) => (response.ok ? response.json() : { slots: [] }))
+      .then((data) => {
+        (data.slots || []).forEach((slot) => {
+          if (slot.weather_status === "pending") return;
+          document
+            .querySelectorAll(`[data-slot-weather="${slot.id}"]`)
+            .forEach((node) => applyWeather(node, slot));
+        });
+      })
+      .catch(() => {})
+      .finally(schedule);
+  }
+
+  schedule();
+  // Admin views fetched after load can bring their own pending slots.
+  document.addEventListener("admin:view-loaded", schedule);
+})();
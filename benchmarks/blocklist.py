@@ -0,0 +1,99 @@
+"""Measure the per-request cost of the IP blocklist with 10,000 rules.
+
+Compares the compiled interval lookup used by ``_ip_is_blocked`` with a
+linear scan over the same networks, then times the whole
+``track_visitors_and_block`` before-request hook.
+
+Run from the project root: ``python benchmarks/blocklist.py``.
+"""
+
+import ipaddress
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SCHEDULER_ENABLED", "0")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import app as app_module  # noqa: E402
+
+
+def make_rules(rule_count=10000, seed=7):
+    generator = random.Random(seed)
+    rules = set()
+    while len(rules) < rule_count:
+        kind = generator.random()
+        if kind < 0.5:
+            rules.add(str(ipaddress.IPv4Address(generator.getrandbits(32))))
+        elif kind < 0.8:
+            prefix = generator.choice((16, 20, 24, 28))
+            rules.add(str(ipaddress.IPv4Network((generator.getrandbits(32), prefix), strict=False)))
+        else:
+            prefix = generator.choice((32, 48, 64))
+            rules.add(str(ipaddress.IPv6Network((generator.getrandbits(128), prefix), strict=False)))
+    return sorted(rules)
+
+
+def make_addresses(count=2000, seed=11):
+    generator = random.Random(seed)
+    return [
+        str(ipaddress.IPv4Address(generator.getrandbits(32)))
+        if index % 4
+        else str(ipaddress.IPv6Address(generator.getrandbits(128)))
+        for index in range(count)
+    ]
+
+
+def per_call_us(function, items, repeat=5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(items) * 1_000_000
+
+
+def main():
+    rules = make_rules()
+    addresses = make_addresses()
+    app_module.blocked_ips = set(rules)
+
+    started = time.perf_counter()
+    app_module._blocklist()
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    networks = [ipaddress.ip_network(rule) for rule in rules]
+
+    def linear_scan(ip_address):
+        address = ipaddress.ip_address(ip_address)
+        return any(address in network for network in networks)
+
+    def hook(ip_address):
+        with app_module.app.test_request_context("/", headers={"X-Forwarded-For": ip_address}):
+            app_module.track_visitors_and_block()
+
+    def empty_context(ip_address):
+        with app_module.app.test_request_context("/", headers={"X-Forwarded-For": ip_address}):
+            pass
+
+    rows = [
+        ("linear scan", per_call_us(linear_scan, addresses[:200], repeat=1)),
+        ("_ip_is_blocked", per_call_us(app_module._ip_is_blocked, addresses)),
+        ("request context only", per_call_us(empty_context, addresses)),
+        ("before_request hook", per_call_us(hook, addresses)),
+    ]
+    print(f"{len(rules):,} rules compiled in {compile_ms:.1f} ms")
+    print(f"{'case':<28}{'us/request':>12}")
+    for label, elapsed_us in rows:
+        print(f"{label:<28}{elapsed_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
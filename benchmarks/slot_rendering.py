@@ -0,0 +1,90 @@
+"""Measure the cost of presenting 5,000 appointment slots.
+
+Compares building every slot view from scratch with the memoized
+``_serialize_slot`` path, then times full page renders with a cold and a
+warm slot view cache.
+
+Run from the project root: ``python benchmarks/slot_rendering.py``.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+os.environ.setdefault("SCHEDULER_ENABLED", "0")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import app as app_module  # noqa: E402
+
+
+def populate_slots(slot_count=5000):
+    # Every 25 minutes keeps all 5,000 slots inside the 90 day booking window.
+    start = datetime.utcnow().replace(second=0, microsecond=0) + timedelta(hours=1)
+    app_module.appointment_slots = [
+        {
+            "id": index,
+            "start": start + timedelta(minutes=25 * index),
+            "is_booked": index % 5 == 0,
+            "workflow_status": "New" if index % 5 == 0 else "",
+            "visitor_name": "Sam Walker" if index % 5 == 0 else None,
+            "visitor_email": "sam@example.com" if index % 5 == 0 else None,
+            "price": 15.0,
+            "service_type": "walk" if index % 4 else "meet",
+            "weather": {"status": "good", "summary": "scattered clouds"},
+        }
+        for index in range(1, slot_count + 1)
+    ]
+    app_module.next_slot_id = slot_count + 1
+
+
+def timed(function, repeat=5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def cold(function):
+    def run():
+        app_module._slot_view_cache.clear()
+        function()
+
+    return run
+
+
+def main():
+    populate_slots()
+    # Time the rendering itself rather than the rendered-page cache.
+    app_module.PAGE_CACHE_TTL = 0
+    slots = app_module._sorted_slots()
+    client = app_module.app.test_client()
+    # Compile the templates before timing anything.
+    client.get("/")
+
+    rows = [
+        ("build views (uncached)", timed(lambda: [app_module._build_slot_view(slot) for slot in slots])),
+        ("_serialize_slot, cold", timed(cold(lambda: [app_module._serialize_slot(slot) for slot in slots]))),
+        ("_serialize_slot, warm", timed(lambda: [app_module._serialize_slot(slot) for slot in slots])),
+        ("GET / cold", timed(cold(lambda: client.get("/")))),
+        ("GET / warm", timed(lambda: client.get("/"))),
+        ("GET /bookings cold", timed(cold(lambda: client.get("/bookings")))),
+        ("GET /bookings warm", timed(lambda: client.get("/bookings"))),
+        ("GET /admin cold", timed(cold(lambda: client.get("/admin?view=appointments")))),
+        ("GET /admin warm", timed(lambda: client.get("/admin?view=appointments"))),
+    ]
+    print(f"{len(slots):,} slots")
+    print(f"{'case':<28}{'best ms':>10}")
+    for label, elapsed_ms in rows:
+        print(f"{label:<28}{elapsed_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
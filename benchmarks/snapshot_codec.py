@@ -0,0 +1,108 @@
+"""Compare legacy indent=2 JSON snapshots with the compressed snapshot codec.
+
+Run from the project root: ``python benchmarks/snapshot_codec.py``.
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import app as app_module  # noqa: E402
+
+
+def populate_state(slot_count=1000, conversation_count=500, messages_per_conversation=12, visitor_count=5000):
+    start = datetime(2024, 5, 1, 8, 0, 0)
+    app_module.appointment_slots = [
+        {
+            "id": index,
+            "start": start + timedelta(hours=index),
+            "is_booked": index % 3 == 0,
+            "workflow_status": "New",
+            "visitor_name": "Sam Walker",
+            "visitor_email": "sam@example.com",
+            "visitor_dog_breed": "Border Collie",
+            "price": 15.0,
+            "service_type": "walk" if index % 4 else "meet",
+            "weather": {"status": "good", "summary": "scattered clouds"},
+        }
+        for index in range(1, slot_count + 1)
+    ]
+    app_module.chat_conversations = {
+        f"visitor-{index}": {
+            "visitor_id": f"visitor-{index}",
+            "ip_address": f"203.0.113.{index % 250}",
+            "created_at": start,
+            "last_message_at": start,
+            "messages": [
+                {
+                    "id": index * 100 + number,
+                    "sender": "visitor" if number % 2 else "admin",
+                    "body": f"Message {number}: could you walk Biscuit on Tuesday around {number + 1}pm?",
+                    "timestamp": (start + timedelta(minutes=number)).isoformat(),
+                    "seen_by_admin": True,
+                    "visitor_id": f"visitor-{index}",
+                    "visitor_ip": f"203.0.113.{index % 250}",
+                }
+                for number in range(messages_per_conversation)
+            ],
+        }
+        for index in range(conversation_count)
+    }
+    app_module.visitor_stats = {
+        f"198.51.{index // 250}.{index % 250}": {
+            "visits": index % 40 + 1,
+            "first_visit": start + timedelta(minutes=index),
+            "last_visit": start + timedelta(minutes=index * 2),
+            "location": "en-GB,en;q=0.9",
+            "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
+            "accept_language": "en-GB,en;q=0.9",
+        }
+        for index in range(visitor_count)
+    }
+
+
+def timed(function, repeat=5):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+
+def main():
+    populate_state()
+    payload = app_module._serialize_state()
+
+    legacy_text, legacy_encode_ms = timed(lambda: json.dumps(payload, indent=2))
+    _, legacy_decode_ms = timed(lambda: app_module._decode_snapshot(legacy_text))
+    compact_text, compact_encode_ms = timed(lambda: app_module._snapshot_json(payload))
+    encoded_text, codec_encode_ms = timed(
+        lambda: app_module._compress_snapshot_text(app_module._snapshot_json(payload))
+    )
+    _, codec_decode_ms = timed(lambda: app_module._decode_snapshot(encoded_text))
+    encoded_bytes = app_module._compress_snapshot_bytes(compact_text)
+
+    rows = [
+        ("legacy indent=2 JSON", len(legacy_text.encode("utf-8")), legacy_encode_ms, legacy_decode_ms),
+        ("compact JSON", len(compact_text.encode("utf-8")), compact_encode_ms, None),
+        ("codec text (KV)", len(encoded_text), codec_encode_ms, codec_decode_ms),
+        ("codec bytes (R2)", len(encoded_bytes), None, None),
+    ]
+    print(f"{'format':<24}{'bytes':>12}{'encode ms':>12}{'decode ms':>12}")
+    for label, size, encode_ms, decode_ms in rows:
+        encode_label = f"{encode_ms:.1f}" if encode_ms is not None else "-"
+        decode_label = f"{decode_ms:.1f}" if decode_ms is not None else "-"
+        print(f"{label:<24}{size:>12,}{encode_label:>12}{decode_label:>12}")
+
+
+if __name__ == "__main__":
+    main()
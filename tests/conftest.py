@@ -0,0 +1,162 @@
+import atexit
+import importlib
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Tests run scheduled jobs explicitly instead of on a background thread.
+os.environ.setdefault("SCHEDULER_ENABLED", "0")
+# Importing the app saves a snapshot; keep it and andy.json out of the project root.
+_STATE_DATA_DIR = None
+if not os.environ.get("STATE_DATA_DIR"):
+    _STATE_DATA_DIR = os.environ["STATE_DATA_DIR"] = tempfile.mkdtemp(prefix="dog-walking-tests-")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if _STATE_DATA_DIR:
+        shutil.rmtree(_STATE_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _no_shutdown_hooks(monkeypatch):
+    """Stop app copies imported by a test from installing shutdown hooks.
+
+    Those hooks would otherwise merge and save whatever a test left queued
+    into the real project root when pytest exits.
+    """
+
+    monkeypatch.setattr(atexit, "register", lambda func, *args, **kwargs: func)
+    monkeypatch.setattr(signal, "signal", lambda signum, handler: signal.SIG_DFL)
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    """The app module with its backups and KV store confined to ``tmp_path``.
+
+    Test modules add their own setup by overriding this fixture with one that
+    requests ``app_module``. The module is reloaded afterwards so no state
+    leaks into the next test.
+    """
+
+    module = importlib.import_module("app.app")
+    monkeypatch.setattr(module, "_backup_directory_candidates", lambda: [str(tmp_path)])
+    monkeypatch.setattr(module, "_cached_export_file_path", None)
+    monkeypatch.setattr(module, "_fallback_kv_store", {})
+    # Importing the app loads whatever andy.json an earlier run left in the
+    # project root; start every test without that run's backup history.
+    monkeypatch.setattr(module, "backup_history", [])
+    monkeypatch.setattr(module, "next_backup_history_id", 1)
+    yield module
+    importlib.reload(module)
+
+
+class FakeKVServer:
+    """Minimal stand-in for the Upstash-style KV REST API."""
+
+    def __init__(self):
+        self.store = {}
+        self.requests = []
+        self.connections = 0
+        self.fail_next = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def execute(self, command, *args):
+        command = command.upper()
+        with self.lock:
+            if command == "SET":
+                if "NX" in args[2:] and args[0] in self.store:
+                    return None
+                self.store[args[0]] = args[1]
+                return "OK"
+            if command == "GET":
+                return self.store.get(args[0])
+            if command == "DEL":
+                return 1 if self.store.pop(args[0], None) is not None else 0
+            if command == "INCR":
+                value = int(self.store.get(args[0], 0)) + 1
+                self.store[args[0]] = str(value)
+                return value
+            if command == "RPUSH":
+                rows = self.store.setdefault(args[0], [])
+                rows.extend(args[1:])
+                return len(rows)
+            if command == "LRANGE":
+                return list(self.store.get(args[0], []))
+        raise ValueError(command)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def log_message(self, *args):  # pragma: no cover - silence test output
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"null")
+                server.requests.append((self.path, body))
+                if server.fail_next:
+                    server.fail_next -= 1
+                    self._send(503, {"error": "unavailable"})
+                    return
+                if self.path.endswith("/pipeline") or self.path.endswith("/multi-exec"):
+                    payload = [{"result": server.execute(*command)} for command in body]
+                else:
+                    payload = {"result": server.execute(body["command"], *body["args"])}
+                self._send(200, payload)
+
+            def _send(self, status, payload):
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        return Handler
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def kv_server():
+    server = FakeKVServer().start()
+    yield server
+    server.stop()
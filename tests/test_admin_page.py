@@ -16,7 +16,7 @@ def test_admin_page_handles_missing_last_visit():
 
     client = module.app.test_client()
 
-    response = client.get("/admin")
+    response = client.get("/admin?view=visitors")
 
     assert response.status_code == 200
     assert b"Admin" in response.data
@@ -32,7 +32,7 @@ def test_admin_page_skips_invalid_visitors():
 
     client = module.app.test_client()
 
-    response = client.get("/admin")
+    response = client.get("/admin?view=visitors")
 
     assert response.status_code == 200
     assert b"Admin" in response.data
@@ -0,0 +1,84 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "ADMIN_SLOT_PAGE_SIZE", 10)
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    app_module.appointment_slots = [
+        {"id": index, "start": start + timedelta(hours=index), "is_booked": index <= 3, "service_type": "walk"}
+        for index in range(1, 26)
+    ]
+    return app_module
+
+
+def test_admin_page_links_static_bundles_instead_of_inlining(app_module):
+    html = app_module.app.test_client().get("/admin").get_data(as_text=True)
+
+    assert "<style>" not in html
+    assert re.findall(r"<script>", html) == []
+    assert re.search(r'/static/css/admin\.[0-9a-f]{12}\.css', html)
+    assert re.search(r'/static/js/admin\.[0-9a-f]{12}\.js', html)
+    assert re.search(r'/static/js/admin-chat\.[0-9a-f]{12}\.js', html)
+
+
+def test_view_endpoints_return_only_headline_counts(app_module):
+    client = app_module.app.test_client()
+    client.post("/chat/messages", json={"sender": "visitor", "body": "Hi", "visitor_id": "v-1"})
+
+    appointments = client.get("/admin/api/appointments").get_json()
+    chat = client.get("/admin/api/chat").get_json()
+
+    assert appointments == {
+        "counts": {"open_slot_count": 22, "booked_slot_count": 3, "slot_summary": "3 booked • 22 open"},
+    }
+    assert chat == {"counts": {"chat_waiting_count": 1}}
+
+
+def test_every_listed_view_has_an_endpoint(app_module):
+    client = app_module.app.test_client()
+
+    for view_name in app_module.ADMIN_VIEW_COUNTS:
+        response = client.get(f"/admin/api/{view_name}")
+        assert response.status_code == 200, view_name
+        assert list(response.get_json()) == ["counts"]
+    assert client.get("/admin/api/unknown").status_code == 404
+
+
+def test_admin_page_renders_only_the_active_heavy_view(app_module, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("built a view that is not open")
+
+    for name in ("_admin_slot_lists", "_admin_visitor_page", "_backup_retention_preview", "_scheduler_summary"):
+        monkeypatch.setattr(app_module, name, fail)
+    client = app_module.app.test_client()
+
+    html = client.get("/admin").get_data(as_text=True)
+
+    assert 'data-view-body="appointments">' in html
+    assert "3 booked • 22 open" in html
+
+
+def test_view_fragments_match_the_server_rendered_view(app_module):
+    client = app_module.app.test_client()
+
+    fragment = client.get("/admin/views/appointments?open_page=2")
+    page = client.get("/admin?view=appointments&open_page=2").get_data(as_text=True)
+
+    assert fragment.status_code == 200
+    assert fragment.headers["Cache-Control"] == "no-store"
+    assert "<html" not in fragment.get_data(as_text=True)
+    assert fragment.get_data(as_text=True).strip() in page
+    assert 'data-view-body="appointments" data-view-loaded>' in page
+
+
+def test_every_fragment_view_renders(app_module):
+    client = app_module.app.test_client()
+
+    for view_name in app_module.ADMIN_VIEW_CONTEXTS:
+        assert client.get(f"/admin/views/{view_name}").status_code == 200, view_name
+        assert client.get(f"/admin?view={view_name}").status_code == 200, view_name
+    assert client.get("/admin/views/chat").status_code == 404
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "backup_retention_stats", dict.fromkeys(app_module.backup_retention_stats, 0))
+    monkeypatch.setitem(app_module.backup_retention_stats, "last_run_at", None)
+    app_module._kv_cache_invalidate()
+    return app_module
+
+
+def _hourly_entries(count, start=datetime(2024, 5, 10, 23, 30)):
+    return [
+        {"id": index, "saved_at": start - timedelta(hours=index), "source": "auto"}
+        for index in range(count)
+    ]
+
+
+def test_plan_keeps_latest_and_one_entry_per_bucket(app_module):
+    policy = app_module._parse_backup_retention_policy("last=3,hourly=0,daily=4")
+    entries = _hourly_entries(24 * 7)
+
+    keep, prune = app_module._plan_backup_retention(entries, policy)
+
+    kept_ids = [entry["id"] for entry in keep]
+    # The three newest, then the newest entry of each of the four most recent days.
+    assert kept_ids == [0, 1, 2, 24, 48, 72]
+    assert len(prune) == len(entries) - len(keep)
+
+
+def test_policy_with_no_rules_keeps_everything(app_module):
+    keep, prune = app_module._plan_backup_retention(_hourly_entries(5), app_module._parse_backup_retention_policy(""))
+
+    assert len(keep) == 5
+    assert prune == []
+
+
+def test_backups_prune_old_snapshots_and_their_chunks(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "BACKUP_RETENTION_POLICY", "last=2")
+    results = []
+    for index in range(4):
+        app_module.dog_breeds = [{"id": 1, "name": f"Breed {index}"}]
+        results.append(app_module._write_state_backup(source="auto"))
+
+    assert [entry["id"] for entry in app_module.backup_history] == [
+        results[3]["history_entry"]["id"],
+        results[2]["history_entry"]["id"],
+    ]
+    for result in results[:2]:
+        assert app_module._kv_get(app_module._snapshot_key(result["storage_id"])) is None
+    assert app_module.load_data(storage_id=results[2]["storage_id"]) is True
+    assert app_module.dog_breeds[0]["name"] == "Breed 2"
+    stats = app_module.backup_retention_stats
+    assert stats["pruned_total"] == 2
+    assert stats["bytes_reclaimed_total"] > 0
+
+
+def test_admin_backups_view_previews_retention(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "BACKUP_RETENTION_POLICY", "last=1")
+    app_module.backup_history = _hourly_entries(3)
+
+    response = app_module.app.test_client().get("/admin?view=backups")
+
+    assert response.status_code == 200
+    assert b"Snapshot retention" in response.data
+    assert b"Would be removed" in response.data
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module.blocked_ips = set()
+    return app_module
+
+
+def test_ranges_block_ipv4_and_ipv6_addresses(app_module):
+    app_module._update_blocklist(["198.51.100.0/24", "198.51.101.0/24", "2001:db8::/32", "203.0.113.7"])
+
+    assert app_module._ip_is_blocked("198.51.100.200")
+    assert app_module._ip_is_blocked("198.51.101.1")
+    assert app_module._ip_is_blocked("::ffff:198.51.100.9")
+    assert app_module._ip_is_blocked("2001:db8:1::5")
+    assert app_module._ip_is_blocked("203.0.113.7")
+    assert not app_module._ip_is_blocked("198.51.102.0")
+    assert not app_module._ip_is_blocked("203.0.113.8")
+    assert not app_module._ip_is_blocked("2001:db9::1")
+    assert not app_module._ip_is_blocked("Unknown")
+    # The two adjacent /24s are merged into one interval.
+    starts, ends = app_module._blocklist()[4]
+    assert len(starts) == len(ends) == 2
+
+
+def test_blocked_range_gets_403_but_admin_stays_reachable(app_module):
+    client = app_module.app.test_client()
+    client.post("/admin/blocklist/import", data={"rules": "203.0.113.0/24"})
+
+    assert client.get("/", headers={"X-Forwarded-For": "203.0.113.50"}).status_code == 403
+    assert client.get("/", headers={"X-Forwarded-For": "203.0.114.50"}).status_code == 200
+    assert client.get("/admin", headers={"X-Forwarded-For": "203.0.113.50"}).status_code == 200
+
+
+def test_bulk_import_persists_each_rule_and_reports_invalid_entries(app_module, monkeypatch):
+    persisted = []
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: persisted.extend(changes))
+    client = app_module.app.test_client()
+
+    response = client.post(
+        "/admin/blocklist/import",
+        data={
+            "rules": "10.1.2.3/8  # noisy crawler\n192.0.2.1, nonsense",
+            "blocklist_file": (io.BytesIO(b"2001:DB8::1\n192.0.2.1\n"), "rules.txt"),
+        },
+        content_type="multipart/form-data",
+    )
+
+    assert "blocklist_added=3" in response.headers["Location"]
+    assert "blocklist_invalid=1" in response.headers["Location"]
+    assert app_module.blocked_ips == {"10.0.0.0/8", "192.0.2.1", "2001:db8::1"}
+    assert sorted(change["id"] for change in persisted) == ["10.0.0.0/8", "192.0.2.1", "2001:db8::1"]
+
+
+def test_export_round_trips_through_import(app_module):
+    client = app_module.app.test_client()
+    client.post("/admin/blocklist/import", data={"rules": "2001:db8::/32\n10.0.0.0/8\n192.0.2.1"})
+
+    exported = client.get("/admin/blocklist/export").get_data(as_text=True)
+    client.post("/admin/blocklist/import", data={"rules": exported, "action": "remove"})
+
+    assert exported == "10.0.0.0/8\n192.0.2.1\n2001:db8::/32\n"
+    assert app_module.blocked_ips == set()
+    assert not app_module._ip_is_blocked("10.9.9.9")
+
+
+def test_reloaded_state_recompiles_the_blocklist(app_module):
+    app_module._update_blocklist(["198.51.100.0/24"])
+    state = app_module._serialize_state()
+    app_module._update_blocklist(["198.51.100.0/24"], remove=True)
+    assert not app_module._ip_is_blocked("198.51.100.1")
+
+    app_module._load_state(state)
+
+    assert app_module._ip_is_blocked("198.51.100.1")
@@ -0,0 +1,113 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _prepare(module):
+    module.dog_breeds = [{"id": 1, "name": "Whippet"}]
+    module.appointment_slots = [
+        {
+            "id": 1,
+            "start": datetime.utcnow() + timedelta(days=2),
+            "is_booked": False,
+            "workflow_status": "",
+            "price": 15.0,
+            "service_type": "walk",
+            "weather": {},
+        }
+    ]
+    module.next_slot_id = 2
+
+
+def _booking(index):
+    return {
+        "name": f"Visitor {index}",
+        "email": f"visitor{index}@example.com",
+        "breed_id": "1",
+        "coverage_area_id": "1",
+    }
+
+
+def _fire(clients, attempts):
+    barrier = threading.Barrier(min(attempts, 32))
+
+    def book(index):
+        client = clients[index % len(clients)]
+        if index < barrier.parties:
+            barrier.wait()
+        return client.post("/bookings/slots/1", json=_booking(index)).status_code
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        return list(executor.map(book, range(attempts)))
+
+
+@pytest.fixture
+def app_module(app_module, monkeypatch):
+    # Every test client shares one address; the race, not the rate limit, is under test.
+    monkeypatch.setitem(app_module.RATE_LIMITS, "booking", None)
+    _prepare(app_module)
+    return app_module
+
+
+def test_booked_slot_returns_conflict(app_module):
+    client = app_module.app.test_client()
+
+    assert client.post("/bookings/slots/1", json=_booking(1)).status_code == 200
+    response = client.post("/bookings/slots/1", json=_booking(2))
+
+    assert response.status_code == 409
+    assert app_module._get_slot(1)["visitor_name"] == "Visitor 1"
+
+
+def test_parallel_bookings_have_exactly_one_winner(app_module):
+    clients = [app_module.app.test_client() for _ in range(8)]
+
+    statuses = _fire(clients, 300)
+
+    assert statuses.count(200) == 1
+    assert statuses.count(409) == 299
+    winner = app_module._get_slot(1)
+    assert winner["is_booked"] is True
+
+
+def _load_worker(name):
+    spec = importlib.util.spec_from_file_location(name, PROJECT_ROOT / "app" / "app.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_parallel_bookings_across_workers_have_exactly_one_winner(tmp_path, monkeypatch):
+    workers = [_load_worker(f"dog_walking_booking_worker_{index}") for index in range(2)]
+    for module in workers:
+        monkeypatch.setattr(module, "_backup_directory_candidates", lambda: [str(tmp_path)])
+        monkeypatch.setattr(module, "_cached_export_file_path", None)
+        monkeypatch.setattr(module, "STATE_PERSISTENCE_MODE", "sqlite")
+        monkeypatch.setattr(module, "STATE_SQLITE_PATH", str(tmp_path / "state.sqlite3"))
+        monkeypatch.setitem(module.RATE_LIMITS, "booking", None)
+    _prepare(workers[0])
+    workers[0]._write_state_changes((), full_save=True)
+    workers[1].load_data()
+    try:
+        clients = [module.app.test_client() for module in workers for _ in range(4)]
+
+        statuses = _fire(clients, 200)
+
+        assert statuses.count(200) == 1
+        assert statuses.count(409) == 199
+        booked = workers[0]._state_db_load_state()["appointment_slots"]
+        assert [slot["is_booked"] for slot in booked] == [True]
+    finally:
+        for module in workers:
+            module._close_state_db_connection()
+            sys.modules.pop(module.__name__, None)
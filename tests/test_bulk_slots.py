@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module.appointment_slots = []
+    return app_module
+
+
+def _next_monday():
+    today = datetime.utcnow().date() + timedelta(days=1)
+    return today + timedelta(days=(7 - today.weekday()) % 7)
+
+
+def test_weekday_block_is_created_with_one_persist(app_module, monkeypatch):
+    persisted = []
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: persisted.append(changes))
+    client = app_module.app.test_client()
+
+    response = client.post(
+        "/admin/slots/bulk",
+        json={
+            "start_date": _next_monday().isoformat(),
+            "weeks": 8,
+            "weekdays": [0, 1, 2, 3, 4],
+            "times": app_module.DEFAULT_TIME_CHOICES,
+            "price": "15",
+            "service_type": "walk",
+        },
+    )
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert len(data["created"]) == 8 * 5 * len(app_module.DEFAULT_TIME_CHOICES)
+    assert data["skipped"] == []
+    assert len(persisted) == 1 and len(persisted[0]) == len(data["created"])
+    starts = [slot["start"] for slot in app_module.appointment_slots]
+    assert starts == sorted(starts)
+    # The scheduler is off in tests, so forecasts are filled in before the persist.
+    assert all(slot["weather"]["status"] != "pending" for slot in app_module.appointment_slots)
+    assert {slot["start"].weekday() for slot in app_module.appointment_slots} == {0, 1, 2, 3, 4}
+
+
+def test_existing_and_past_times_are_skipped(app_module):
+    monday = _next_monday()
+    client = app_module.app.test_client()
+    client.post("/admin/slots", data={"date": monday.isoformat(), "time": "09:00", "price": "15"})
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+
+    response = client.post(
+        "/admin/slots/bulk",
+        json={
+            "start_date": yesterday.isoformat(),
+            "end_date": monday.isoformat(),
+            "weekdays": list(range(7)),
+            "times": ["09:00", "10:00"],
+            "price": 15,
+        },
+    )
+
+    data = response.get_json()
+    assert f"{monday.isoformat()}T09:00:00" in data["skipped"]
+    assert f"{yesterday.isoformat()}T09:00:00" in data["skipped"]
+    starts = [slot["start"] for slot in app_module.appointment_slots]
+    assert len(starts) == len(set(starts))
+    assert len(app_module.appointment_slots) == 1 + len(data["created"])
+
+
+def test_invalid_and_oversized_requests_are_rejected(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "BULK_SLOT_MAX", 10)
+    client = app_module.app.test_client()
+    base = {"start_date": _next_monday().isoformat(), "weeks": 4, "times": ["09:00"], "price": 15}
+
+    no_days = client.post("/admin/slots/bulk", json=dict(base, weekdays=[]))
+    too_many = client.post("/admin/slots/bulk", json=dict(base, weekdays=[0, 1, 2, 3, 4]))
+    form = client.post("/admin/slots/bulk", data=dict(base, weekdays=["0"], times="25:00"))
+
+    assert no_days.status_code == 400
+    assert too_many.status_code == 400 and "limit is 10" in too_many.get_json()["error"]
+    assert "bulk_error=" in form.headers["Location"]
+    assert app_module.appointment_slots == []
+
+
+def test_huge_spans_and_non_object_bodies_are_rejected_quickly(app_module):
+    client = app_module.app.test_client()
+    base = {"start_date": _next_monday().isoformat(), "weekdays": [0], "times": ["09:00"], "price": 15}
+
+    many_weeks = client.post("/admin/slots/bulk", json=dict(base, weeks=1000000))
+    far_end = client.post("/admin/slots/bulk", json=dict(base, end_date="9999-12-31"))
+    listed = client.post("/admin/slots/bulk", json=[base])
+
+    assert many_weeks.status_code == 400 and "weeks" in many_weeks.get_json()["error"]
+    assert far_end.status_code == 400 and "days" in far_end.get_json()["error"]
+    assert listed.status_code == 400
+    assert app_module.appointment_slots == []
+
+
+def test_slots_stop_at_the_booking_window(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "BOOKING_WINDOW_DAYS", 14)
+    client = app_module.app.test_client()
+    today = app_module.datetime.utcnow().date()
+    base = {"start_date": today.isoformat(), "weekdays": list(range(7)), "times": ["23:00"], "price": 15}
+
+    past_window = client.post("/admin/slots/bulk", json=dict(base, end_date=(today + timedelta(days=14)).isoformat()))
+    in_window = client.post("/admin/slots/bulk", json=dict(base, end_date=(today + timedelta(days=13)).isoformat()))
+
+    assert past_window.status_code == 400 and "14 days ahead" in past_window.get_json()["error"]
+    assert in_window.status_code == 200
+    listed = {slot["id"] for slot in app_module._upcoming_slots("walk")}
+    assert listed == {slot["id"] for slot in app_module.appointment_slots}
+
+
+def test_start_generation_stops_at_the_limit(app_module):
+    monday = _next_monday()
+
+    starts = app_module._bulk_slot_starts(
+        monday, monday + app_module.timedelta(days=365), set(range(7)), [app_module.datetime.min.time()], limit=10
+    )
+
+    assert len(starts) == 11
+
+
+def test_admin_form_reports_created_count(app_module):
+    client = app_module.app.test_client()
+
+    response = client.post(
+        "/admin/slots/bulk",
+        data={
+            "start_date": _next_monday().isoformat(),
+            "weeks": "1",
+            "weekdays": ["0", "2"],
+            "times": ["08:00", "16:00"],
+            "price": "15",
+            "service_type": "meet",
+        },
+    )
+
+    assert "bulk_created=4" in response.headers["Location"]
+    page = client.get(response.headers["Location"]).get_data(as_text=True)
+    assert "Added 4 slots" in page
@@ -0,0 +1,112 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+START = datetime(2030, 6, 1, 0, 0)
+
+
+class FakeForecastServer:
+    """Serves a fixed OpenWeatherMap-style 5 day / 3 hour forecast."""
+
+    def __init__(self):
+        self.requests = []
+        descriptions = ["light rain", "clear sky", "scattered clouds"]
+        self.payload = {
+            "list": [
+                {
+                    "dt": int((START + timedelta(hours=3 * index)).replace(tzinfo=timezone.utc).timestamp()),
+                    "weather": [{"description": descriptions[index % 3]}],
+                }
+                for index in range(40)
+            ]
+        }
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # pragma: no cover - silence test output
+                pass
+
+            def do_GET(self):
+                server.requests.append(self.path)
+                raw = json.dumps(server.payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/forecast"
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def forecast_server():
+    server = FakeForecastServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def app_module(app_module, forecast_server, monkeypatch):
+    monkeypatch.setattr(app_module, "WEATHER_FORECAST_URL", forecast_server.url)
+    monkeypatch.setattr(app_module, "weather_api_key", "test-key")
+    monkeypatch.setattr(app_module, "_forecast_cache", None)
+    return app_module
+
+
+def test_forty_slots_share_one_forecast_download(app_module, forecast_server):
+    app_module.appointment_slots = [
+        {"id": index, "start": START + timedelta(hours=3 * index), "is_booked": False, "weather": {}}
+        for index in range(1, 41)
+    ]
+
+    updated = app_module._refresh_future_weather(START - timedelta(hours=1))
+
+    assert len(updated) == 40
+    assert len(forecast_server.requests) == 1
+    assert "appid=test-key" in forecast_server.requests[0]
+    assert app_module._get_slot(1)["weather"] == {"status": "sunny", "summary": "clear sky"}
+    assert app_module._get_slot(2)["weather"] == {"status": "good", "summary": "scattered clouds"}
+    assert app_module._get_slot(3)["weather"] == {"status": "rain", "summary": "light rain"}
+
+
+def test_nearest_entry_is_picked_between_forecast_steps(app_module):
+    assert app_module._fetch_tameside_weather(START + timedelta(hours=1))["summary"] == "light rain"
+    assert app_module._fetch_tameside_weather(START + timedelta(hours=2))["summary"] == "clear sky"
+    assert app_module._fetch_tameside_weather(START - timedelta(days=3))["summary"] == "light rain"
+    assert app_module._fetch_tameside_weather(START + timedelta(days=30))["summary"] == "light rain"
+
+
+def test_cache_expires_and_counts_hits(app_module, forecast_server, monkeypatch):
+    for hours in (0, 3, 6):
+        app_module._fetch_tameside_weather(START + timedelta(hours=hours))
+    summary = app_module._forecast_cache_summary()
+    assert (summary["hits"], summary["misses"], summary["entries"]) == (2, 1, 40)
+
+    monkeypatch.setattr(app_module, "_forecast_cache", dict(app_module._forecast_cache, expires=0))
+    app_module._fetch_tameside_weather(START)
+
+    assert len(forecast_server.requests) == 2
+
+
+def test_new_api_key_bypasses_the_cache(app_module, forecast_server, monkeypatch):
+    app_module._fetch_tameside_weather(START)
+    monkeypatch.setattr(app_module, "weather_api_key", "other-key")
+
+    app_module._fetch_tameside_weather(START)
+
+    assert "appid=other-key" in forecast_server.requests[-1]
+    assert len(forecast_server.requests) == 2
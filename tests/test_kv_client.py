@@ -0,0 +1,137 @@
+import socket
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module, kv_server, monkeypatch):
+    monkeypatch.setattr(app_module, "_KV_REST_API_URL", kv_server.url)
+    monkeypatch.setattr(app_module, "KV_REST_BACKOFF", 0)
+    app_module._reset_kv_connection_pool()
+    yield app_module
+    app_module._reset_kv_connection_pool()
+
+
+def test_commands_reuse_a_keep_alive_connection(app_module, kv_server):
+    for index in range(20):
+        app_module._kv_set(f"key-{index}", str(index))
+    kv_server.store["remote-key"] = "remote"
+    assert app_module._kv_get("remote-key") == "remote"
+    assert app_module._kv_incr("counter") == 1
+
+    assert kv_server.connections == 1
+    assert len(kv_server.requests) == 22
+
+
+def test_snapshot_save_writes_in_a_single_transaction(app_module, kv_server):
+    result = app_module.save_data(source="manual", record_history=True)
+
+    assert result is not None
+    paths = [path for path, _ in kv_server.requests]
+    # INCR for the snapshot id, lock and read the chunk index, then one
+    # transaction that also releases the lock.
+    assert paths == ["/", "/", "/", "/multi-exec"]
+    _, commands = kv_server.requests[-1]
+    assert [command[0] for command in commands[:2]] == ["SET", "DEL"]
+    assert {command[0] for command in commands[2:-1]} == {"SET"}
+    assert commands[-1] == ["DEL", app_module._snapshot_chunk_refs_lock_key()]
+    assert app_module._snapshot_chunk_refs_lock_key() not in kv_server.store
+    snapshot_key = app_module._snapshot_key(result["storage_id"])
+    assert snapshot_key in kv_server.store
+    assert app_module._latest_state_key() in kv_server.store
+
+
+def test_server_errors_are_retried(app_module, kv_server):
+    kv_server.fail_next = 2
+
+    app_module._kv_set("retry-key", "value")
+
+    assert kv_server.store["retry-key"] == "value"
+    assert len(kv_server.requests) == 3
+
+
+def test_non_idempotent_commands_are_not_retried(app_module, kv_server):
+    kv_server.fail_next = 2
+
+    assert app_module._kv_rest_execute("INCR", "counter") is None
+    assert app_module._kv_rest_pipeline([("SET", "a", "1"), ("RPUSH", "journal", "x")]) is None
+
+    assert len(kv_server.requests) == 2
+    assert kv_server.store == {}
+
+
+def test_pooled_connection_closed_by_the_server_is_not_reused(app_module, kv_server):
+    local, remote = socket.socketpair()
+    connection = app_module._kv_open_connection(app_module._kv_rest_target())
+    connection.sock = local
+    app_module._kv_release_connection(app_module._kv_rest_target(), connection)
+    remote.close()
+
+    assert app_module._kv_incr("counter") == 1
+
+    assert connection.sock is None
+    assert kv_server.store["counter"] == "1"
+
+
+def test_pipeline_falls_back_to_local_store_when_unavailable(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "_KV_REST_API_URL", None)
+    monkeypatch.setattr(app_module, "_fallback_kv_store", {})
+
+    results = app_module._kv_pipeline([("SET", "a", "1"), ("INCR", "n"), ("GET", "a")])
+
+    assert results == ["OK", 1, "1"]
+
+
+def test_reads_of_values_this_process_wrote_are_served_from_cache(app_module, kv_server):
+    result = app_module.save_data(source="manual", record_history=True)
+    request_count = len(kv_server.requests)
+    misses = app_module._kv_cache_summary()["misses"]
+
+    row = app_module._get_snapshot_row(result["storage_id"])
+    latest = app_module._kv_get(app_module._latest_state_key())
+
+    assert row is not None
+    assert latest is not None
+    assert len(kv_server.requests) == request_count
+    assert app_module._kv_cache_summary()["misses"] == misses
+
+
+def test_delete_invalidates_cached_value(app_module, kv_server):
+    app_module._kv_set("cached-key", "value")
+    app_module._kv_delete("cached-key")
+
+    assert app_module._kv_get("cached-key") is None
+    assert ("/", {"command": "GET", "args": ["cached-key"]}) in kv_server.requests
+
+
+def test_read_cache_is_bounded_by_bytes(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "KV_READ_CACHE_MAX_BYTES", 10)
+
+    app_module._kv_set("first", "aaaaaa")
+    app_module._kv_set("second", "bbbbbb")
+
+    summary = app_module._kv_cache_summary()
+    assert summary["entries"] == 1
+    assert summary["bytes"] == 6
+    assert summary["evictions"] == 1
+    assert app_module._kv_cache_lookup("first") is None
+
+
+def test_stale_read_is_not_cached_after_concurrent_write(app_module, kv_server):
+    kv_server.store["race-key"] = "old"
+    generation = app_module._kv_cache_generation
+    app_module._kv_set("race-key", "new")
+
+    app_module._kv_cache_store("race-key", "old", generation)
+
+    assert app_module._kv_get("race-key") == "new"
+
+
+def test_snapshot_fails_when_the_shared_lock_is_unreachable(app_module, kv_server):
+    kv_server.fail_next = 1
+
+    assert app_module.save_data(source="manual", record_history=True) is None
+
+    lock_key = app_module._snapshot_chunk_refs_lock_key()
+    assert lock_key not in app_module._fallback_kv_store
+    assert app_module._latest_state_key() not in kv_server.store
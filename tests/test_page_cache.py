@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module.appointment_slots = [
+        {
+            "id": 1,
+            "start": datetime.utcnow().replace(microsecond=0) + timedelta(days=2),
+            "is_booked": False,
+            "price": 15.0,
+            "service_type": "walk",
+            "weather": {"status": "good", "summary": "scattered clouds"},
+        }
+    ]
+    app_module._page_cache.clear()
+    return app_module
+
+
+def test_repeat_views_are_served_from_memory_with_validators(app_module, monkeypatch):
+    client = app_module.app.test_client()
+    first = client.get("/")
+    rendered = []
+    monkeypatch.setattr(app_module, "render_template", lambda *args, **kwargs: rendered.append(args) or "")
+
+    second = client.get("/")
+    revalidated = client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert rendered == []
+    assert second.data == first.data
+    assert first.headers["ETag"] and first.headers["Last-Modified"]
+    assert revalidated.status_code == 304
+    assert app_module._page_cache_summary()["not_modified"] == 1
+
+
+def test_admin_edits_and_bookings_invalidate_the_page(app_module):
+    client = app_module.app.test_client()
+    first = client.get("/")
+
+    client.post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+    with_breed = client.get("/")
+    app_module._claim_slot(app_module._get_slot(1), {"is_booked": True, "visitor_name": "Jo"})
+    after_booking = client.get("/", headers={"If-None-Match": with_breed.headers["ETag"]})
+
+    assert b"Whippet" in with_breed.data and b"Whippet" not in first.data
+    assert with_breed.headers["ETag"] != first.headers["ETag"]
+    assert after_booking.status_code == 200
+    assert app_module._page_cache_summary()["misses"] == 3
+
+
+def test_unrelated_changes_and_ttl(app_module, monkeypatch):
+    client = app_module.app.test_client()
+    client.get("/page/1")
+
+    client.post("/chat/messages", json={"sender": "visitor", "body": "Hello", "visitor_id": "v-1"})
+    client.get("/page/1")
+    assert app_module._page_cache_summary()["hits"] == 1
+
+    for entry in app_module._page_cache.values():
+        entry["expires"] = 0
+    client.get("/page/1")
+    assert app_module._page_cache_summary()["misses"] == 2
+
+
+def test_cache_can_be_disabled(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "PAGE_CACHE_TTL", 0)
+    client = app_module.app.test_client()
+
+    client.get("/bookings")
+    client.get("/bookings")
+
+    assert app_module._page_cache_summary()["entries"] == 0
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: None)
+    return app_module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(app_module, monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(app_module.time, "monotonic", fake)
+    return fake
+
+
+def _chat(client, ip, visitor_id="v-1"):
+    return client.post(
+        "/chat/messages",
+        json={"sender": "visitor", "body": "Hello", "visitor_id": visitor_id},
+        headers={"X-Forwarded-For": ip},
+    )
+
+
+def test_chat_burst_is_refused_with_retry_after_then_refills(app_module, clock, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMITS, "chat", (3, 60.0))
+    client = app_module.app.test_client()
+
+    statuses = [_chat(client, "203.0.113.5").status_code for _ in range(3)]
+    refused = _chat(client, "203.0.113.5")
+
+    assert statuses == [201, 201, 201]
+    assert refused.status_code == 429
+    assert refused.headers["Retry-After"] == "20"
+    assert refused.get_json()["retry_after"] == 20
+    assert _chat(client, "198.51.100.1", visitor_id="v-2").status_code == 201
+
+    clock.now += 20
+    assert _chat(client, "203.0.113.5").status_code == 201
+    assert app_module.rate_limit_stats["chat"] == {"allowed": 5, "limited": 1}
+
+
+def test_chat_visitor_id_is_limited_across_addresses(app_module, clock, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMITS, "chat", (2, 60.0))
+    client = app_module.app.test_client()
+
+    assert _chat(client, "203.0.113.1").status_code == 201
+    assert _chat(client, "203.0.113.2").status_code == 201
+    assert _chat(client, "203.0.113.3").status_code == 429
+
+
+def test_enquiry_form_is_limited_per_address(app_module, clock, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMITS, "enquiry", (1, 600.0))
+    client = app_module.app.test_client()
+    form = {"name": "Jo", "email": "jo@example.com", "message": "Hi"}
+
+    assert client.post("/", data=form, headers={"X-Forwarded-For": "203.0.113.9"}).status_code == 302
+    refused = client.post("/", data=form, headers={"X-Forwarded-For": "203.0.113.9"})
+
+    assert refused.status_code == 429
+    assert refused.headers["Retry-After"] == "600"
+    assert [row["name"] for row in app_module.submissions] == ["Jo"]
+
+
+def test_booking_attempts_are_limited(app_module, clock, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMITS, "booking", (2, 300.0))
+    app_module.appointment_slots = [
+        {"id": index, "start": datetime.utcnow() + timedelta(days=index), "is_booked": False, "price": 15.0}
+        for index in (1, 2, 3)
+    ]
+    client = app_module.app.test_client()
+
+    statuses = [client.post(f"/bookings/slots/{index}", json={}).status_code for index in (1, 2, 3)]
+
+    assert statuses == [400, 400, 429]
+
+
+def test_idle_buckets_are_swept_and_bucket_count_is_capped(app_module, clock, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMITS, "chat", (2, 60.0))
+    monkeypatch.setattr(app_module, "RATE_LIMIT_MAX_BUCKETS", 3)
+    for index in range(5):
+        app_module._take_rate_limit_token("chat", f"203.0.113.{index}")
+    assert list(app_module._rate_buckets) == [("chat", f"203.0.113.{index}") for index in (2, 3, 4)]
+
+    clock.now += 10
+    app_module._take_rate_limit_token("chat", "203.0.113.4")
+    clock.now += 25
+
+    assert app_module._sweep_rate_limits() == 2
+    assert list(app_module._rate_buckets) == [("chat", "203.0.113.4")]
+    assert app_module._rate_limit_summary()["swept"] == 2
+
+
+def test_admin_sender_field_does_not_skip_the_limit(app_module, clock, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMITS, "chat", (2, 60.0))
+    client = app_module.app.test_client()
+
+    statuses = [
+        client.post("/chat/messages", json={"sender": "admin", "body": "Hi", "visitor_id": "v-1"}).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [201, 201, 429]
+
+
+def test_unlocked_admin_session_is_not_limited(app_module, clock, monkeypatch):
+    monkeypatch.setitem(app_module.RATE_LIMITS, "chat", (2, 60.0))
+    client = app_module.app.test_client()
+    client.post("/admin/weather/unlock", data={"password": app_module.WEATHER_ADMIN_PASSWORD})
+
+    statuses = [
+        client.post("/chat/messages", json={"sender": "admin", "body": "Hi", "visitor_id": "v-1"}).status_code
+        for _ in range(5)
+    ]
+
+    assert statuses == [201] * 5
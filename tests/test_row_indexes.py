@@ -0,0 +1,85 @@
+def test_lookups_follow_creates_and_deletes(app_module):
+    client = app_module.app.test_client()
+    client.post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+    breed = app_module._get_breed(app_module.next_dog_breed_id - 1)
+
+    assert breed["name"] == "Whippet"
+    assert app_module._breed_name_exists("whippet")
+
+    client.post(f"/admin/dog-breeds/{breed['id']}/delete")
+
+    assert app_module._get_breed(breed["id"]) is None
+    assert not app_module._breed_name_exists("Whippet")
+
+
+def test_appended_rows_extend_the_index_without_a_rebuild(app_module):
+    app_module.submissions = [{"id": index, "name": f"Visitor {index}"} for index in range(1, 1001)]
+    app_module.next_submission_id = 1001
+    assert app_module._get_submission(500)["name"] == "Visitor 500"
+    _, _, index_before = app_module._submission_index._state
+
+    client = app_module.app.test_client()
+    client.post("/", data={"name": "Jo", "email": "jo@example.com", "message": "Hi"})
+
+    assert app_module._get_submission(1001)["name"] == "Jo"
+    assert app_module._submission_index._state[2] is index_before
+
+
+def test_indexes_follow_load_state_and_ignore_stale_keys(app_module):
+    state = app_module._serialize_state()
+    state["certificates"] = [{"id": 42, "title": "Canine first aid"}]
+    state["dog_breeds"] = [{"id": 7, "name": "Beagle"}]
+    app_module._load_state(state)
+
+    assert app_module._get_certificate(42)["title"] == "Canine first aid"
+    assert app_module._breed_name_exists("BEAGLE")
+
+    app_module.dog_breeds[0]["name"] = "Basset Hound"
+
+    assert not app_module._breed_name_exists("beagle")
+
+
+def test_delete_then_create_keeps_the_index_in_step(app_module):
+    app_module.submissions = []
+    app_module.next_submission_id = 1
+    client = app_module.app.test_client()
+    for name in ("Jo", "Sam"):
+        client.post("/", data={"name": name, "email": "a@example.com", "message": "Hi"})
+    assert app_module._get_submission(1)["name"] == "Jo"
+
+    client.post("/admin/submissions/1/delete")
+    client.post("/", data={"name": "Alex", "email": "a@example.com", "message": "Hi"})
+
+    assert app_module._get_submission(1) is None
+    assert app_module._get_submission(3)["name"] == "Alex"
+    assert client.post("/admin/submissions/1/delete").status_code == 404
+    assert client.get("/admin/submissions/3/edit").status_code == 200
+
+
+def test_slot_delete_then_create_keeps_the_index_in_step(app_module):
+    app_module.appointment_slots = []
+    start = app_module.datetime.utcnow() + app_module.timedelta(days=2)
+    for index in range(2):
+        client = app_module.app.test_client()
+        client.post(
+            "/admin/slots",
+            data={
+                "date": start.strftime("%Y-%m-%d"),
+                "time": f"1{index}:00",
+                "price": "15",
+                "service_type": "walk",
+            },
+        )
+    first_id, second_id = (slot["id"] for slot in app_module.appointment_slots)
+    assert app_module._get_slot(first_id) is not None
+
+    client.post(f"/admin/slots/{first_id}/delete")
+    client.post(
+        "/admin/slots",
+        data={"date": start.strftime("%Y-%m-%d"), "time": "12:00", "price": "15", "service_type": "walk"},
+    )
+    new_id = app_module.appointment_slots[-1]["id"]
+
+    assert app_module._get_slot(first_id) is None
+    assert app_module._get_slot(new_id)["id"] == new_id
+    assert app_module._get_slot(second_id)["id"] == second_id
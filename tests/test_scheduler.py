@@ -0,0 +1,108 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    now = datetime.utcnow()
+    app_module.appointment_slots = [
+        {"id": 1, "start": now - timedelta(hours=2), "is_booked": False, "service_type": "walk", "weather": {}},
+        {"id": 2, "start": now - timedelta(hours=1), "is_booked": True, "service_type": "walk", "weather": {}},
+        {"id": 3, "start": now + timedelta(days=1), "is_booked": False, "service_type": "walk", "weather": {}},
+    ]
+    return app_module
+
+
+def _pretend_scheduler_is_running(module, monkeypatch):
+    monkeypatch.setattr(module, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(module, "_scheduler_pid", os.getpid())
+
+
+def test_page_views_do_not_touch_slots_or_weather(app_module, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("weather fetched during a page view")
+
+    monkeypatch.setattr(app_module, "_load_tameside_forecast", fail)
+    _pretend_scheduler_is_running(app_module, monkeypatch)
+    client = app_module.app.test_client()
+
+    for path in ("/", "/bookings", "/admin?view=appointments"):
+        assert client.get(path).status_code == 200
+
+    assert [slot["id"] for slot in app_module.appointment_slots] == [1, 2, 3]
+
+
+def test_requests_expire_slots_when_the_scheduler_is_off(app_module):
+    client = app_module.app.test_client()
+
+    client.get("/bookings")
+    app_module.appointment_slots.append(
+        {"id": 4, "start": datetime.utcnow() - timedelta(minutes=5), "is_booked": False, "service_type": "walk"}
+    )
+    client.get("/bookings")
+
+    # Once per interval: the second request is too soon to expire slot 4.
+    assert [slot["id"] for slot in app_module.appointment_slots] == [2, 3, 4]
+    assert app_module.scheduled_job_status["expire_slots"]["runs"] == 1
+
+
+def test_expiry_keeps_a_slot_inserted_meanwhile(app_module):
+    now = datetime.utcnow()
+    app_module._slot_calendar.insert({"id": 5, "start": now + timedelta(days=2), "is_booked": False})
+
+    assert app_module._cleanup_expired_slots() == [1]
+
+    assert [slot["id"] for slot in app_module._sorted_slots()] == [2, 3, 5]
+    assert app_module._get_slot(1) is None
+
+
+def test_jobs_expire_slots_and_refresh_weather(app_module, monkeypatch):
+    monkeypatch.setattr(
+        app_module,
+        "_load_tameside_forecast",
+        lambda: {"status": "good", "summary": "clear sky"},
+    )
+
+    assert app_module._run_scheduled_job("expire_slots") is True
+    assert app_module._run_scheduled_job("refresh_weather") is True
+
+    assert [slot["id"] for slot in app_module.appointment_slots] == [2, 3]
+    assert app_module._get_slot(3)["weather"]["summary"] == "clear sky"
+    jobs = {job["name"]: job for job in app_module._scheduler_summary()}
+    assert jobs["expire_slots"]["last_result"] == "Removed 1 expired slot"
+    assert jobs["refresh_weather"]["runs"] == 1
+    assert 0 < jobs["refresh_weather"]["next_run_seconds"] <= app_module.SCHEDULED_JOBS["refresh_weather"]["interval"] * 1.1
+
+
+def test_jobs_are_single_flight(app_module, monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_job():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    monkeypatch.setitem(app_module.SCHEDULED_JOBS["expire_slots"], "run", slow_job)
+    _pretend_scheduler_is_running(app_module, monkeypatch)
+    worker = threading.Thread(target=app_module._run_scheduled_job, args=("expire_slots",))
+    worker.start()
+    started.wait(5)
+
+    response = app_module.app.test_client().post("/admin/jobs/expire_slots/run")
+    release.set()
+    worker.join(5)
+
+    assert "state_action=job_busy" in response.headers["Location"]
+    assert app_module.scheduled_job_status["expire_slots"]["skipped"] == 1
+    assert app_module.scheduled_job_status["expire_slots"]["runs"] == 1
+
+
+def test_admin_backups_view_lists_jobs(app_module):
+    response = app_module.app.test_client().get("/admin?view=backups")
+
+    assert b"Scheduled jobs" in response.data
+    assert b"Refresh slot weather" in response.data
@@ -0,0 +1,121 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_worker(name):
+    """Import a second, independent copy of the app, like another gunicorn worker."""
+
+    spec = importlib.util.spec_from_file_location(name, PROJECT_ROOT / "app" / "app.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    modules = [_load_worker("dog_walking_worker_a"), _load_worker("dog_walking_worker_b")]
+    for module in modules:
+        monkeypatch.setattr(module, "_backup_directory_candidates", lambda: [str(tmp_path)])
+        monkeypatch.setattr(module, "_cached_export_file_path", None)
+        monkeypatch.setattr(module, "STATE_PERSISTENCE_MODE", "sqlite")
+        monkeypatch.setattr(module, "STATE_SQLITE_PATH", str(tmp_path / "state.sqlite3"))
+    modules[0]._write_state_changes((), full_save=True)
+    modules[1].load_data()
+    yield modules
+    for module in modules:
+        module._close_state_db_connection()
+        sys.modules.pop(module.__name__, None)
+
+
+def test_worker_sees_changes_committed_by_another_worker(workers):
+    worker_a, worker_b = workers
+
+    worker_a.app.test_client().post("/", data={"name": "Jo", "email": "jo@example.com", "message": "Hi"})
+    assert worker_b.submissions == []
+
+    worker_b.app.test_client().get("/")
+
+    assert [row["name"] for row in worker_b.submissions] == ["Jo"]
+    assert worker_b._state_db_seen_version == worker_a._state_db_version()
+
+
+def test_row_changes_from_both_workers_are_kept(workers):
+    worker_a, worker_b = workers
+
+    worker_a.app.test_client().post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+    worker_b.app.test_client().post("/admin/dog-breeds", data={"breed_name": "Beagle"})
+
+    worker_a.app.test_client().get("/")
+    names = {breed["name"] for breed in worker_a.dog_breeds}
+    assert {"Whippet", "Beagle"} <= names
+
+
+def test_unchanged_database_skips_the_version_query(workers, monkeypatch):
+    worker_a, worker_b = workers
+    worker_b._refresh_shared_state()
+    queries = []
+    version = worker_b._state_db_version
+    monkeypatch.setattr(worker_b, "_state_db_version", lambda *args: queries.append(1) or version(*args))
+
+    assert worker_b._refresh_shared_state() is False
+    assert queries == []
+
+    worker_a.app.test_client().post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+    assert worker_b._refresh_shared_state() is True
+    assert queries
+
+
+def test_commit_racing_a_reload_on_another_thread_is_reloaded(workers):
+    _worker_a, worker_b = workers
+    worker_b._refresh_shared_state(force=True)
+
+    # Another thread swaps the globals while this one is mid-request.
+    reloader = threading.Thread(target=lambda: worker_b._apply_state_db_snapshot(worker_b._state_db_load_state()))
+    reloader.start()
+    reloader.join()
+    submission = {"id": 99, "name": "Jo", "email": "jo@example.com", "message": "Hi", "status": "new"}
+    assert worker_b._state_db_apply_changes([worker_b._submission_delta(submission)]) is True
+
+    assert worker_b._state_db_seen_version is None
+    assert worker_b._refresh_shared_state() is True
+    assert 99 in {row["id"] for row in worker_b.submissions}
+
+
+def test_stale_full_rewrite_is_rejected_and_reloads(workers):
+    worker_a, worker_b = workers
+    worker_a.app.test_client().post("/", data={"name": "Jo", "email": "jo@example.com", "message": "Hi"})
+
+    worker_b.meet_greet_enabled = False
+    assert worker_b._write_state_changes((), full_save=True) is False
+
+    assert [row["name"] for row in worker_b.submissions] == ["Jo"]
+    assert worker_b._write_state_changes((), full_save=True) is True
+
+
+def test_unix_socket_notifications_mark_other_workers_stale(workers, tmp_path, monkeypatch):
+    worker_a, worker_b = workers
+    for module in workers:
+        monkeypatch.setattr(module, "STATE_NOTIFY_DIR", str(tmp_path / "notify"))
+    # Both copies share one pid here, so give each its own socket name.
+    monkeypatch.setattr(worker_a, "_state_notify_socket_path", lambda pid=None: str(tmp_path / "notify" / "a.sock"))
+    monkeypatch.setattr(worker_b, "_state_notify_socket_path", lambda pid=None: str(tmp_path / "notify" / "b.sock"))
+    worker_b._refresh_shared_state()
+    assert not worker_b._state_change_event.is_set()
+
+    worker_a.app.test_client().post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+
+    deadline = time.monotonic() + 2
+    while not worker_b._state_change_event.is_set() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert worker_b._refresh_shared_state() is True
+    assert "Whippet" in {breed["name"] for breed in worker_b.dog_breeds}
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module.appointment_slots = []
+    return app_module
+
+
+def _slot(slot_id, start, service_type="walk", is_booked=False):
+    return {
+        "id": slot_id,
+        "start": start,
+        "is_booked": is_booked,
+        "workflow_status": "",
+        "price": 15.0,
+        "service_type": service_type,
+        "weather": {"status": "good", "summary": "clear sky"},
+    }
+
+
+def test_calendar_keeps_slots_in_time_order(app_module):
+    base = datetime(2030, 1, 1, 9, 0)
+    calendar = app_module._slot_calendar
+    for slot_id, hours in [(1, 5), (2, 1), (3, 3)]:
+        calendar.insert(_slot(slot_id, base + timedelta(hours=hours)))
+
+    assert [slot["id"] for slot in app_module.appointment_slots] == [2, 3, 1]
+
+    moved = app_module._get_slot(1)
+    previous_start = moved["start"]
+    moved["start"] = base
+    calendar.move(moved, previous_start)
+    calendar.remove(app_module._get_slot(3))
+
+    assert [slot["id"] for slot in app_module.appointment_slots] == [1, 2]
+    window = calendar.between(base + timedelta(minutes=30), base + timedelta(hours=2))
+    assert [slot["id"] for slot in window] == [2]
+
+
+def test_public_pages_only_list_upcoming_slots_in_the_window(app_module):
+    now = datetime.utcnow()
+    app_module.appointment_slots = [
+        _slot(1, now - timedelta(days=1), is_booked=True),
+        _slot(2, now + timedelta(days=1)),
+        _slot(3, now + timedelta(days=2), service_type="meet"),
+        _slot(4, now + timedelta(days=app_module.BOOKING_WINDOW_DAYS + 5)),
+    ]
+
+    assert [slot["id"] for slot in app_module._upcoming_slots("walk")] == [2]
+    assert [slot["id"] for slot in app_module._upcoming_slots("meet")] == [3]
+    response = app_module.app.test_client().get("/")
+    assert b'data-slot-id="2"' in response.data
+    assert b'data-slot-id="1"' not in response.data
+    assert b'data-slot-id="4"' not in response.data
+
+
+def test_admin_appointments_are_paged(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "ADMIN_SLOT_PAGE_SIZE", 10)
+    now = datetime.utcnow()
+    app_module.appointment_slots = [_slot(index, now + timedelta(hours=index)) for index in range(1, 26)]
+    client = app_module.app.test_client()
+
+    response = client.get("/admin?view=appointments&open_page=3")
+
+    assert response.status_code == 200
+    assert b"Page 3 of 3 (25 slots)" in response.data
+    assert b"0 booked \xe2\x80\xa2 25 open" in response.data
+    assert f"delete-slot-21\"".encode() in response.data
+    assert f"delete-slot-20\"".encode() not in response.data
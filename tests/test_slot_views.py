@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    start = datetime.utcnow().replace(microsecond=0) + timedelta(days=1)
+    app_module.appointment_slots = [
+        {
+            "id": index,
+            "start": start + timedelta(hours=index),
+            "is_booked": False,
+            "price": 15.0,
+            "service_type": "walk",
+            "weather": {"status": "good", "summary": "scattered clouds"},
+        }
+        for index in range(1, 4)
+    ]
+    return app_module
+
+
+def test_unchanged_slot_reuses_its_view(app_module):
+    slot = app_module._get_slot(1)
+
+    first = app_module._serialize_slot(slot)
+    second = app_module._serialize_slot(slot)
+
+    assert first is second
+    assert app_module.slot_view_stats["hits"] == 1
+    assert first == app_module._build_slot_view(slot)
+
+
+def test_persisted_edit_rebuilds_the_view(app_module):
+    slot = app_module._get_slot(1)
+    before = app_module._serialize_slot(slot)
+    client = app_module.app.test_client()
+
+    client.post(
+        "/admin/slots/1",
+        data={"date": slot["start"].strftime("%Y-%m-%d"), "time": "07:00", "price": "22", "service_type": "meet"},
+    )
+
+    after = app_module._serialize_slot(slot)
+    assert after is not before
+    assert after["price_label"] != before["price_label"]
+    assert after["service_type"] == "meet"
+
+
+def test_booking_and_reload_rebuild_the_view(app_module):
+    slot = app_module._get_slot(2)
+    assert app_module._serialize_slot(slot)["is_booked"] is False
+
+    assert app_module._claim_slot(slot, {"is_booked": True, "visitor_name": "Jo"}) is True
+    booked = app_module._serialize_slot(slot)
+    replacement = dict(slot, visitor_name="Sam")
+    app_module.appointment_slots[app_module.appointment_slots.index(slot)] = replacement
+
+    assert booked["is_booked"] is True and booked["visitor_name"] == "Jo"
+    assert app_module._serialize_slot(replacement)["visitor_name"] == "Sam"
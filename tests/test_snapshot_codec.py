@@ -0,0 +1,111 @@
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+
+def _populate_busy_state(module):
+    start = datetime(2024, 5, 1, 8, 0, 0)
+    module.appointment_slots = [
+        {
+            "id": index,
+            "start": start + timedelta(hours=index),
+            "is_booked": index % 3 == 0,
+            "workflow_status": "New",
+            "visitor_name": "Sam Walker",
+            "visitor_email": "sam@example.com",
+            "price": 15.0,
+            "service_type": "walk",
+            "weather": {"status": "good", "summary": "scattered clouds"},
+        }
+        for index in range(1, 401)
+    ]
+    module.chat_conversations = {
+        f"visitor-{index}": {
+            "visitor_id": f"visitor-{index}",
+            "ip_address": f"203.0.113.{index % 250}",
+            "created_at": start,
+            "last_message_at": start,
+            "messages": [
+                {
+                    "id": index * 100 + number,
+                    "sender": "visitor" if number % 2 else "admin",
+                    "body": "Hi! Could you walk Biscuit on Tuesday afternoon?",
+                    "timestamp": start.isoformat(),
+                    "seen_by_admin": True,
+                    "visitor_id": f"visitor-{index}",
+                    "visitor_ip": f"203.0.113.{index % 250}",
+                }
+                for number in range(8)
+            ],
+        }
+        for index in range(200)
+    }
+    module.visitor_stats = {
+        f"198.51.{index // 250}.{index % 250}": {
+            "visits": index,
+            "first_visit": start,
+            "last_visit": start,
+            "location": "en-GB,en;q=0.9",
+            "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
+            "accept_language": "en-GB,en;q=0.9",
+        }
+        for index in range(1500)
+    }
+
+
+def test_codec_round_trips_and_reads_legacy_json(app_module):
+    payload = app_module._serialize_state()
+    encoded = app_module._compress_snapshot_text(app_module._snapshot_json(payload))
+
+    assert encoded.startswith(app_module.SNAPSHOT_CODEC_TEXT_PREFIX)
+    assert app_module._decode_snapshot(encoded) == payload
+    assert app_module._decode_snapshot(json.dumps(payload, indent=2)) == payload
+    binary = app_module._compress_snapshot_bytes(app_module._snapshot_json(payload))
+    assert app_module._decode_snapshot(binary) == payload
+    assert app_module._decode_snapshot("not a snapshot") is None
+
+
+def test_compressed_snapshot_is_much_smaller_than_legacy_json(app_module):
+    _populate_busy_state(app_module)
+    payload = app_module._serialize_state()
+
+    legacy_size = len(json.dumps(payload, indent=2).encode("utf-8"))
+    encoded_size = len(app_module._compress_snapshot_text(app_module._snapshot_json(payload)))
+
+    assert encoded_size * 10 < legacy_size
+
+
+def test_history_snapshot_can_be_loaded_back(app_module):
+    app_module.meet_greet_enabled = False
+    result = app_module._write_state_backup(source="manual")
+    app_module.meet_greet_enabled = True
+
+    assert app_module.load_data(storage_id=result["storage_id"]) is True
+    assert app_module.meet_greet_enabled is False
+
+
+def test_download_is_gzipped_when_accepted(app_module):
+    client = app_module.app.test_client()
+
+    response = client.get("/admin/state/download", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    data = json.loads(gzip.decompress(response.data))
+    assert "chat_conversations" in data
+
+
+def test_import_accepts_compressed_snapshot(app_module):
+    state = app_module._serialize_state()
+    state["meet_greet_enabled"] = False
+    encoded = app_module._compress_snapshot_bytes(app_module._snapshot_json(state))
+    client = app_module.app.test_client()
+
+    response = client.post(
+        "/admin/state/import",
+        data={"state_file": (io.BytesIO(encoded), "andy.json")},
+        content_type="multipart/form-data",
+    )
+
+    assert "state_action=imported" in response.headers.get("Location", "")
+    assert app_module.meet_greet_enabled is False
@@ -0,0 +1,115 @@
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module._kv_cache_invalidate()
+    return app_module
+
+
+def _chunk_keys(module):
+    prefix = module._storage_key("chunk", "")
+    return {key for key in module._fallback_kv_store if key.startswith(prefix)}
+
+
+def _add_breeds(module, count):
+    module.dog_breeds = [{"id": index, "name": f"Breed {index}"} for index in range(1, count + 1)]
+
+
+def test_consecutive_snapshots_only_store_changed_chunks(app_module):
+    _add_breeds(app_module, 300)
+    first = app_module._write_state_backup(source="auto")
+    chunks_after_first = _chunk_keys(app_module)
+
+    app_module._add_chat_message("visitor", "One more question", "visitor-1", ip_address="203.0.113.9")
+    second = app_module._write_state_backup(source="auto")
+    new_chunks = _chunk_keys(app_module) - chunks_after_first
+
+    first_manifest = app_module._get_snapshot_row(first["storage_id"])
+    second_manifest = app_module._get_snapshot_row(second["storage_id"])
+    assert first_manifest["chunks"]["settings"] == second_manifest["chunks"]["settings"]
+    assert first_manifest["chunks"]["slots"] == second_manifest["chunks"]["slots"]
+    assert len(new_chunks) == 2  # conversations and history
+    assert second["history_entry"]["stored_bytes"] * 4 < first["history_entry"]["stored_bytes"]
+
+
+def test_manifest_snapshot_restores_full_state(app_module):
+    _add_breeds(app_module, 3)
+    result = app_module._write_state_backup(source="manual")
+    app_module.dog_breeds = []
+
+    assert app_module.load_data(storage_id=result["storage_id"]) is True
+    assert [breed["name"] for breed in app_module.dog_breeds] == ["Breed 1", "Breed 2", "Breed 3"]
+
+
+def test_deleting_history_entry_collects_unreferenced_chunks(app_module):
+    _add_breeds(app_module, 3)
+    first = app_module._write_state_backup(source="auto")
+    app_module._add_chat_message("visitor", "Hello", "visitor-1", ip_address="203.0.113.9")
+    second = app_module._write_state_backup(source="auto")
+    first_chunks = set(app_module._get_snapshot_row(first["storage_id"])["chunks"].values())
+    second_chunks = set(app_module._get_snapshot_row(second["storage_id"])["chunks"].values())
+
+    client = app_module.app.test_client()
+    client.post(f"/admin/state/history/{first['history_entry']['id']}/delete")
+
+    remaining = _chunk_keys(app_module)
+    for chunk_hash in first_chunks - second_chunks:
+        assert app_module._snapshot_chunk_key(chunk_hash) not in remaining
+    for chunk_hash in second_chunks:
+        assert app_module._snapshot_chunk_key(chunk_hash) in remaining
+    assert app_module._kv_get(app_module._snapshot_key(first["storage_id"])) is None
+    assert app_module.load_data(storage_id=second["storage_id"]) is True
+
+
+def test_chunk_references_from_other_processes_are_kept(app_module):
+    first = app_module._write_state_backup(source="auto")
+    refs_key = app_module._snapshot_chunk_refs_key()
+    # Another process saves snapshot #99 with a chunk of its own.
+    refs = app_module._decode_snapshot(app_module._fallback_kv_store[refs_key])
+    refs["other-chunk"] = {"size": 10, "refs": [99]}
+    app_module._fallback_kv_store[refs_key] = app_module._snapshot_json(refs)
+
+    app_module._add_chat_message("visitor", "Hello", "visitor-1", ip_address="203.0.113.9")
+    app_module._write_state_backup(source="auto")
+    app_module._delete_backup_row(first["storage_id"])
+
+    refs = app_module._decode_snapshot(app_module._fallback_kv_store[refs_key])
+    assert refs["other-chunk"]["refs"] == [99]
+    assert app_module._snapshot_chunk_refs_lock_key() not in app_module._fallback_kv_store
+
+
+def test_snapshot_waits_for_the_chunk_index_lock(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "STATE_CHUNK_REFS_LOCK_SECONDS", 0.1)
+    app_module._fallback_kv_store[app_module._snapshot_chunk_refs_lock_key()] = "other-process"
+
+    assert app_module._write_state_backup(source="auto") is None
+    assert app_module._snapshot_chunk_refs_key() not in app_module._fallback_kv_store
+
+
+def test_chunk_index_lock_is_taken_before_the_storage_lock(app_module, monkeypatch):
+    set_if_absent = app_module._kv_set_if_absent
+
+    def checked(*args):
+        assert not app_module._state_storage_lock.locked()
+        return set_if_absent(*args)
+
+    monkeypatch.setattr(app_module, "_kv_set_if_absent", checked)
+    first = app_module._write_state_backup(source="auto")
+
+    assert first is not None
+    assert app_module._delete_backup_row(first["storage_id"]) > 0
+
+
+def test_chunk_cleanup_is_skipped_without_the_lock(app_module, monkeypatch):
+    first = app_module._write_state_backup(source="auto")
+    refs_key = app_module._snapshot_chunk_refs_key()
+    refs_before = app_module._fallback_kv_store[refs_key]
+    chunks_before = _chunk_keys(app_module)
+    monkeypatch.setattr(app_module, "_kv_set_if_absent", lambda *args: None)
+
+    app_module._delete_backup_row(first["storage_id"])
+
+    assert app_module._kv_get(app_module._snapshot_key(first["storage_id"])) is None
+    assert _chunk_keys(app_module) == chunks_before
+    assert app_module._fallback_kv_store[refs_key] == refs_before
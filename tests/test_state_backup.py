@@ -92,13 +92,20 @@ def test_load_state_restores_chats_breeds_and_photos(app_module):
     assert app_module.meet_greet_enabled is False
 
 
-def test_backup_candidates_include_project_root_and_folder(app_module):
+def test_backup_candidates_include_project_root_and_folder(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "STATE_DATA_DIR", "")
     project_root = Path(app_module.app.root_path).parent
     candidates = app_module._backup_directory_candidates()
     assert str(project_root) in candidates
     assert str(project_root / "backups") in candidates
 
 
+def test_state_data_dir_replaces_the_project_root(app_module, monkeypatch, tmp_path):
+    monkeypatch.setattr(app_module, "STATE_DATA_DIR", str(tmp_path))
+
+    assert app_module._backup_directory_candidates() == [str(tmp_path), str(tmp_path / "backups")]
+
+
 def test_state_backup_includes_history_entries(tmp_path, monkeypatch, app_module):
     db_path = tmp_path / "snapshots.sqlite3"
     monkeypatch.setenv("DOG_WALKING_BACKUP_DB_PATH", str(db_path))
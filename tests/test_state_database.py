@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "STATE_PERSISTENCE_MODE", "sqlite")
+    monkeypatch.setattr(app_module, "STATE_SQLITE_PATH", str(tmp_path / "state.sqlite3"))
+    app_module._write_state_changes((), full_save=True)
+    yield app_module
+    app_module._close_state_db_connection()
+
+
+def _query(module, sql, params=()):
+    with sqlite3.connect(module.STATE_SQLITE_PATH) as connection:
+        return connection.execute(sql, params).fetchall()
+
+
+def test_mutations_become_row_upserts(app_module):
+    client = app_module.app.test_client()
+    latest_before = app_module._kv_get(app_module._latest_state_key())
+
+    client.post("/", data={"name": "Jo", "email": "jo@example.com", "message": "Hi"})
+    client.post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+    client.post("/chat/messages", json={"sender": "visitor", "body": "Hello", "visitor_id": "v-1"})
+
+    assert _query(app_module, "SELECT status FROM submissions") == [("New",)]
+    assert ("Whippet",) in _query(app_module, "SELECT name FROM dog_breeds")
+    assert _query(app_module, "SELECT visitor_id, seen_by_admin FROM chat_messages") == [("v-1", 0)]
+    assert app_module._kv_get(app_module._latest_state_key()) == latest_before
+
+
+def test_state_is_loaded_back_from_tables(app_module):
+    client = app_module.app.test_client()
+    client.post("/", data={"name": "Jo", "email": "jo@example.com", "message": "Hi"})
+    client.post("/chat/messages", json={"sender": "visitor", "body": "Hello", "visitor_id": "v-1"})
+    client.post("/admin/meet-greet", data={"enabled": "0"})
+    client.post("/admin/visitors/203.0.113.7/block")
+
+    app_module.submissions = []
+    app_module.chat_conversations = {}
+    app_module.blocked_ips = set()
+    app_module.meet_greet_enabled = True
+
+    assert app_module.load_data() is True
+    assert [row["name"] for row in app_module.submissions] == ["Jo"]
+    assert app_module.next_submission_id == 2
+    assert [message["body"] for message in app_module.chat_conversations["v-1"]["messages"]] == ["Hello"]
+    assert app_module.blocked_ips == {"203.0.113.7"}
+    assert app_module.meet_greet_enabled is False
+
+
+def test_deleting_a_conversation_removes_its_messages(app_module):
+    client = app_module.app.test_client()
+    client.post("/chat/messages", json={"sender": "visitor", "body": "Hello", "visitor_id": "v-1"})
+
+    client.post("/admin/chat/v-1/delete")
+
+    assert _query(app_module, "SELECT COUNT(*) FROM chat_messages") == [(0,)]
+    assert _query(app_module, "SELECT COUNT(*) FROM chat_conversations") == [(0,)]
+
+
+def test_database_uses_wal_and_indexes(app_module):
+    assert _query(app_module, "PRAGMA journal_mode") == [("wal",)]
+    plan = _query(
+        app_module,
+        "EXPLAIN QUERY PLAN SELECT data FROM chat_messages WHERE visitor_id = ? ORDER BY id",
+        ("v-1",),
+    )
+    assert any("chat_messages_visitor" in row[-1] for row in plan)
+
+
+def test_stale_slot_copy_cannot_unbook_a_slot(app_module):
+    slot = {"id": 9, "start": "2030-01-01T09:00:00", "is_booked": False, "service_type": "walk"}
+    app_module._state_db_apply_changes([app_module._state_delta("appointment_slots", 9, slot)])
+    assert app_module._state_db_claim_slot(dict(slot, is_booked=True, visitor_name="Jo")) is True
+
+    app_module._state_db_apply_changes([app_module._state_delta("appointment_slots", 9, slot)])
+
+    assert _query(app_module, "SELECT is_booked FROM appointment_slots WHERE id = 9") == [(1,)]
@@ -0,0 +1,54 @@
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "STATE_PERSISTENCE_MODE", "journal")
+    app_module.save_data(source="auto", record_history=False)
+    return app_module
+
+
+def test_journal_mode_appends_deltas_instead_of_rewriting(app_module):
+    latest_before = app_module._kv_get(app_module._latest_state_key())
+    client = app_module.app.test_client()
+
+    client.post("/", data={"name": "Jo", "email": "jo@example.com", "message": "Hi"})
+    client.post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+    client.post("/chat/messages", json={"sender": "visitor", "body": "Hello", "visitor_id": "v-1"})
+
+    journal = app_module._kv_lrange(app_module._state_journal_key())
+    entities = [app_module.json.loads(row)["entity"] for row in journal]
+    assert entities == ["submissions", "dog_breeds", "chat_conversations", "chat_messages"]
+    assert app_module._kv_get(app_module._latest_state_key()) == latest_before
+
+
+def test_load_data_replays_journal_on_top_of_snapshot(app_module):
+    client = app_module.app.test_client()
+    client.post("/", data={"name": "Jo", "email": "jo@example.com", "message": "Hi"})
+    client.post("/admin/dog-breeds", data={"breed_name": "Whippet"})
+    client.post("/chat/messages", json={"sender": "visitor", "body": "Hello", "visitor_id": "v-1"})
+    breed_id = next(breed["id"] for breed in app_module.dog_breeds if breed["name"] == "Whippet")
+    client.post(f"/admin/dog-breeds/{breed_id}/delete")
+
+    app_module.submissions = []
+    app_module.chat_conversations = {}
+    app_module.next_submission_id = 1
+
+    assert app_module.load_data() is True
+    assert [row["name"] for row in app_module.submissions] == ["Jo"]
+    assert app_module.next_submission_id == 2
+    assert not any(breed["name"] == "Whippet" for breed in app_module.dog_breeds)
+    messages = app_module.chat_conversations["v-1"]["messages"]
+    assert [message["body"] for message in messages] == ["Hello"]
+
+
+def test_journal_compacts_into_snapshot(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "STATE_JOURNAL_COMPACT_EVERY", 3)
+    client = app_module.app.test_client()
+
+    for index in range(3):
+        client.post("/admin/dog-breeds", data={"breed_name": f"Breed {index}"})
+
+    assert app_module._kv_lrange(app_module._state_journal_key()) == []
+    latest = app_module._decode_snapshot(app_module._kv_get(app_module._latest_state_key()))
+    assert {breed["name"] for breed in latest["dog_breeds"]} >= {"Breed 0", "Breed 1", "Breed 2"}
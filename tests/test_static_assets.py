@@ -0,0 +1,53 @@
+import gzip
+import re
+from pathlib import Path
+
+
+def _asset_urls(html):
+    return re.findall(r'/static/[^"]+', html)
+
+
+def test_pages_link_fingerprinted_assets(app_module):
+    client = app_module.app.test_client()
+
+    urls = _asset_urls(client.get("/bookings").get_data(as_text=True))
+
+    source = (Path(app_module.app.static_folder) / "js" / "booking.js").read_bytes()
+    digest = app_module.hashlib.sha256(source).hexdigest()[:12]
+    assert f"/static/js/booking.{digest}.js" in urls
+    assert all(re.search(r"\.[0-9a-f]{12}\.(js|css)$", url) for url in urls)
+
+
+def test_hashed_asset_is_precompressed_and_immutable(app_module):
+    client = app_module.app.test_client()
+    url = next(url for url in _asset_urls(client.get("/").get_data(as_text=True)) if "booking." in url)
+
+    plain = client.get(url)
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    revalidated = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]})
+
+    assert "immutable" in plain.headers["Cache-Control"]
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data)
+    assert revalidated.status_code == 304
+
+
+def test_plain_names_still_work_but_revalidate(app_module):
+    client = app_module.app.test_client()
+
+    response = client.get("/static/js/booking.js")
+
+    assert response.status_code == 200
+    assert "immutable" not in response.headers["Cache-Control"]
+    assert client.get("/static/js/missing.js").status_code == 404
+
+
+def test_fingerprinting_can_be_disabled(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "STATIC_FINGERPRINTING", False)
+    client = app_module.app.test_client()
+
+    urls = _asset_urls(client.get("/page/1").get_data(as_text=True))
+
+    assert "/static/css/chat-widget.css" in urls
@@ -0,0 +1,77 @@
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module.visitor_stats = {}
+    app_module._classify_user_agent.cache_clear()
+    return app_module
+
+
+CHROME = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+
+
+@pytest.mark.parametrize(
+    "user_agent, expected",
+    [
+        (CHROME, "browser"),
+        (GOOGLEBOT, "bot"),
+        ("facebookexternalhit/1.1", "bot"),
+        ("Mozilla/5.0+(compatible; UptimeRobot/2.0)", "bot"),
+        ("curl/8.5.0", "bot"),
+        ("python-requests/2.31", "bot"),
+        ("Mozilla/5.0 (compatible; ExampleReader/1.0; +https://example.com/reader)", "bot"),
+        ("Mozilla/5.0 (Linux; Android 10; CUBOT_X30) AppleWebKit/537.36 Chrome/120.0 Mobile Safari/537.36", "browser"),
+        ("Mozilla/5.0 (Linux; Android 12; Cubot KingKong Power) AppleWebKit/537.36 Chrome/118.0 Mobile", "browser"),
+        ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36 ScreenMonitor/2", "browser"),
+        ("Vercel-Screenshot/1.0", "ignored"),
+        ("", "unknown"),
+    ],
+)
+def test_user_agents_are_classified(app_module, user_agent, expected):
+    assert app_module._classify_user_agent(user_agent) == expected
+
+
+def test_classification_is_cached_per_user_agent(app_module):
+    for _ in range(3):
+        app_module._classify_user_agent(CHROME)
+
+    info = app_module._classify_user_agent.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_bots_are_not_tracked_but_are_still_blocked(app_module):
+    client = app_module.app.test_client()
+    app_module._update_blocklist(["198.51.100.0/24"])
+
+    client.get("/page/1", headers={"X-Forwarded-For": "203.0.113.1", "User-Agent": GOOGLEBOT})
+    client.get("/page/1", headers={"X-Forwarded-For": "203.0.113.2", "User-Agent": CHROME})
+    blocked = client.get("/", headers={"X-Forwarded-For": "198.51.100.4", "User-Agent": GOOGLEBOT})
+    app_module._flush_visits()
+
+    assert blocked.status_code == 403
+    assert list(app_module.visitor_stats) == ["203.0.113.2"]
+    assert app_module._user_agent_summary()["bots_skipped"] == 2
+
+
+def test_bot_query_strings_share_the_plain_cached_page(app_module):
+    client = app_module.app.test_client()
+    client.get("/bookings", headers={"User-Agent": CHROME})
+    misses = app_module.page_cache_stats["misses"]
+
+    for index in range(5):
+        response = client.get(f"/bookings?utm_source=crawl{index}", headers={"User-Agent": GOOGLEBOT})
+        assert response.status_code == 200
+
+    assert app_module.page_cache_stats["misses"] == misses
+    assert list(app_module._page_cache) == ["/bookings?"]
+
+
+def test_uncached_bot_variants_are_rendered_but_not_stored(app_module):
+    client = app_module.app.test_client()
+
+    response = client.get("/bookings?ref=spam", headers={"User-Agent": GOOGLEBOT})
+
+    assert response.status_code == 200
+    assert list(app_module._page_cache) == []
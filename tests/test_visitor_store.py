@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module.visitor_stats = {}
+    return app_module
+
+
+def _visit(client, ip, **headers):
+    client.get("/page/1", headers=dict({"X-Forwarded-For": ip}, **headers))
+
+
+def test_store_evicts_least_recent_and_expired_visitors(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "VISITOR_STATS_MAX", 3)
+    stale = datetime.utcnow() - timedelta(days=app_module.VISITOR_STATS_TTL_DAYS + 1)
+    app_module.visitor_stats = {"192.0.2.99": {"visits": 1, "first_visit": stale, "last_visit": stale}}
+    persisted = []
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: persisted.append(changes))
+    client = app_module.app.test_client()
+
+    for ip in ("203.0.113.1", "203.0.113.2", "203.0.113.3", "203.0.113.1", "203.0.113.4"):
+        _visit(client, ip)
+    app_module._flush_visits()
+
+    assert list(app_module.visitor_stats) == ["203.0.113.3", "203.0.113.1", "203.0.113.4"]
+    deleted = {change["id"] for change in persisted[0] if change["op"] == "delete"}
+    assert deleted == {"192.0.2.99", "203.0.113.2"}
+
+
+def test_rollups_count_visits_uniques_and_top_labels(app_module):
+    client = app_module.app.test_client()
+    for ip in ("203.0.113.1", "203.0.113.1", "203.0.113.2"):
+        _visit(client, ip, **{"User-Agent": "Firefox", "CF-IPCountry": "GB"})
+    _visit(client, "203.0.113.3", **{"User-Agent": "Safari", "CF-IPCountry": "US"})
+    app_module._flush_visits()
+
+    hourly = app_module.visitor_rollups["hourly"][-1]
+    assert (hourly[1], hourly[2]) == (4, 3)
+    summary = app_module._visitor_rollup_summary()
+    assert summary["last_day"]["top_agents"][0] == ("Firefox", 3)
+    assert summary["last_day"]["top_locations"] == [("GB", 3), ("US", 1)]
+    assert summary["days"][0]["unique_ips"] == 3
+
+
+def test_rollup_unique_ips_use_fixed_size_sketches(app_module):
+    seen_at = datetime.utcnow()
+    for index in range(5000):
+        app_module._rollup_visit(f"10.0.{index // 256}.{index % 256}", seen_at, "Firefox", "GB", 1)
+    app_module._refresh_rollup_unique_ips()
+
+    assert len(app_module._rollup_ip_sketches) == 2
+    for _bucket, _base, registers in app_module._rollup_ip_sketches.values():
+        assert len(registers) == 1 << app_module.VISITOR_ROLLUP_SKETCH_BITS
+    hourly = app_module.visitor_rollups["hourly"][-1]
+    assert hourly[1] == 5000
+    assert abs(hourly[2] - 5000) < 5000 * 0.1
+
+
+def test_rollups_survive_a_snapshot_round_trip(app_module):
+    client = app_module.app.test_client()
+    _visit(client, "203.0.113.1")
+    app_module._flush_visits()
+
+    state = app_module._serialize_state()
+    app_module.visitor_rollups = {"hourly": [], "daily": []}
+    app_module._load_state(state)
+
+    assert app_module.visitor_rollups["hourly"][-1][1] == 1
+    assert app_module.visitor_rollups["daily"][-1][1] == 1
+
+
+def test_admin_visitors_view_pages_most_recent_first(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "VISITOR_PAGE_SIZE", 2)
+    now = datetime.utcnow()
+    app_module._load_state(
+        dict(
+            app_module._serialize_state(),
+            visitor_stats={
+                f"203.0.113.{index}": {"visits": 1, "last_visit": (now - timedelta(minutes=index)).isoformat()}
+                for index in range(1, 6)
+            },
+        )
+    )
+    client = app_module.app.test_client()
+
+    page_two = client.get("/admin?view=visitors&visitor_page=2", headers={"X-Forwarded-For": "192.0.2.1"})
+    html = client.get("/admin?view=visitors&visitor_page=3").get_data(as_text=True)
+
+    page_two_html = page_two.get_data(as_text=True)
+    assert "Page 2 of 3 (6 visitors)" in page_two_html
+    assert page_two_html.index("203.0.113.2") < page_two_html.index("203.0.113.3")
+    assert "203.0.113.4" not in page_two_html
+    assert "Page 3 of 4 (7 visitors)" in html
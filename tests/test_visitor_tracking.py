@@ -0,0 +1,129 @@
+import sys
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module):
+    app_module.visitor_stats = {}
+    return app_module
+
+
+def _visit(client, ip, **headers):
+    client.get("/page/1", headers=dict({"X-Forwarded-For": ip}, **headers))
+
+
+def test_requests_only_enqueue_until_the_flush_job_runs(app_module, monkeypatch):
+    persisted = []
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: persisted.append(changes))
+    client = app_module.app.test_client()
+
+    for _ in range(3):
+        _visit(client, "203.0.113.5", **{"CF-IPCountry": "GB", "User-Agent": "Firefox"})
+    _visit(client, "198.51.100.7", **{"Accept-Language": "fr-FR"})
+    assert app_module.visitor_stats == {}
+
+    assert app_module._run_scheduled_job("flush_visits") is True
+
+    first = app_module.visitor_stats["203.0.113.5"]
+    assert (first["visits"], first["location"], first["user_agent"]) == (3, "GB", "Firefox")
+    assert app_module.visitor_stats["198.51.100.7"]["location"] == "fr-FR"
+    assert len(persisted) == 1
+    assert {change["id"] for change in persisted[0] if change["entity"] == "visitor_stats"} == {
+        "203.0.113.5",
+        "198.51.100.7",
+    }
+    assert "Merged 4 visits from 2 visitors" == app_module.scheduled_job_status["flush_visits"]["last_result"]
+
+
+def test_ignored_agents_are_dropped_by_the_aggregator(app_module):
+    client = app_module.app.test_client()
+
+    _visit(client, "203.0.113.9", **{"User-Agent": "vercel-screenshot/1.0"})
+    app_module._flush_visits()
+
+    assert app_module.visitor_stats == {}
+
+
+def test_backlog_is_sampled_and_weighted(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "VISITOR_QUEUE_HIGH_WATER", 2)
+    monkeypatch.setattr(app_module, "VISITOR_LOAD_SAMPLE_RATE", 0.5)
+    monkeypatch.setattr(app_module, "VISITOR_FLUSH_BATCH", 10_000)
+    draws = iter([0.9, 0.1, 0.9, 0.1])
+    monkeypatch.setattr(app_module.random, "random", lambda: next(draws))
+    client = app_module.app.test_client()
+
+    for _ in range(6):
+        _visit(client, "203.0.113.5")
+    app_module._flush_visits()
+
+    assert app_module.visit_tracking_stats["sampled_out"] == 2
+    assert app_module.visitor_stats["203.0.113.5"]["visits"] == 2 + 2 * 2
+
+
+def test_admin_view_reads_fresh_counts_without_saving(app_module, monkeypatch):
+    persisted = []
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: persisted.append(changes))
+    client = app_module.app.test_client()
+    _visit(client, "203.0.113.5")
+
+    data = client.get("/admin/api/visitors", headers={"X-Forwarded-For": "192.0.2.1"}).get_json()
+
+    assert data["counts"]["visitor_count"] == 2
+    assert persisted == []
+    app_module._flush_visits()
+    assert {change["id"] for change in persisted[0] if change["entity"] == "visitor_stats"} == {
+        "203.0.113.5",
+        "192.0.2.1",
+    }
+
+
+def test_shutdown_merges_and_saves_queued_visits(app_module, monkeypatch):
+    persisted = []
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: persisted.append(changes))
+    client = app_module.app.test_client()
+    _visit(client, "203.0.113.5")
+
+    assert app_module._flush_on_shutdown() is True
+
+    assert app_module.visitor_stats["203.0.113.5"]["visits"] == 1
+    assert app_module._visit_queue.empty()
+    assert {change["id"] for change in persisted[0] if change["entity"] == "visitor_stats"} == {"203.0.113.5"}
+
+
+def test_readers_are_safe_while_the_flush_reorders_visitors(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "_persist_state_change", lambda *changes: None)
+    seen = app_module.datetime(2024, 1, 1)
+    row = {"visits": 1, "first_visit": seen, "last_visit": seen, "location": "GB", "user_agent": "Firefox"}
+    app_module.visitor_stats = {f"10.0.0.{index}": dict(row, accept_language="en") for index in range(200)}
+    stop = threading.Event()
+    errors = []
+
+    def flush_forever():
+        while not stop.is_set():
+            for index in range(0, 200, 7):
+                app_module._visit_queue.put(
+                    (f"10.0.0.{index}", app_module.datetime.utcnow(), "Firefox", None, None, None, None, 1)
+                )
+            try:
+                app_module._flush_visits()
+            except Exception as exc:  # pragma: no cover - the failure being tested
+                errors.append(exc)
+
+    # Switch threads often so an unguarded iteration would overlap a flush.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    flusher = threading.Thread(target=flush_forever)
+    flusher.start()
+    try:
+        with app_module.app.test_request_context("/admin"):
+            for _ in range(200):
+                app_module._serialize_state()
+                app_module._admin_visitor_page(2)
+                app_module._visitor_rollup_summary()
+    finally:
+        stop.set()
+        flusher.join()
+        sys.setswitchinterval(interval)
+    assert errors == []
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+
+FORECAST = {"status": "sunny", "summary": "clear sky"}
+
+
+@pytest.fixture
+def app_module(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "_forecast_for", lambda start, forecast: dict(FORECAST))
+    app_module.appointment_slots = []
+    return app_module
+
+
+def _create_slot(client, date="2030-06-01", time_value="09:00"):
+    return client.post("/admin/slots", data={"date": date, "time": time_value, "price": "15"})
+
+
+def test_create_returns_before_the_forecast_is_fetched(app_module, monkeypatch):
+    release = threading.Event()
+
+    def slow_forecast():
+        release.wait(5)
+        return {}
+
+    monkeypatch.setattr(app_module, "_load_tameside_forecast", slow_forecast)
+    monkeypatch.setattr(app_module, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(app_module, "_weather_worker_pid", None)
+    client = app_module.app.test_client()
+
+    started = time.monotonic()
+    _create_slot(client)
+    elapsed = time.monotonic() - started
+
+    slot = app_module.appointment_slots[0]
+    assert elapsed < 1
+    assert slot["weather"]["status"] == "pending"
+    release.set()
+    deadline = time.monotonic() + 5
+    while slot["weather"]["status"] == "pending" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slot["weather"] == FORECAST
+
+
+def test_slots_are_enriched_inline_when_the_scheduler_is_off(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "_load_tameside_forecast", lambda: {})
+    monkeypatch.setattr(app_module, "SCHEDULER_ENABLED", False)
+    client = app_module.app.test_client()
+
+    _create_slot(client)
+
+    assert app_module.appointment_slots[0]["weather"] == FORECAST
+    assert app_module._weather_enrichment_queue.empty()
+
+
+def test_pending_slots_share_one_forecast_load(app_module, monkeypatch):
+    loads = []
+    monkeypatch.setattr(app_module, "_load_tameside_forecast", lambda: loads.append(1) or {})
+    # Leave the slots pending, as if the worker had not got to them yet.
+    monkeypatch.setattr(app_module, "_queue_weather_enrichment", lambda *slot_ids: None)
+    client = app_module.app.test_client()
+    for hour in ("09:00", "10:00", "11:00"):
+        _create_slot(client, time_value=hour)
+
+    updated = app_module._enrich_pending_weather()
+
+    assert len(updated) == 3
+    assert len(loads) == 1
+    assert all(slot["weather"] == FORECAST for slot in app_module.appointment_slots)
+
+
+def test_poll_endpoint_reports_pending_then_forecast(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "_load_tameside_forecast", lambda: {})
+    # Leave the slots pending, as if the worker had not got to them yet.
+    monkeypatch.setattr(app_module, "_queue_weather_enrichment", lambda *slot_ids: None)
+    client = app_module.app.test_client()
+    _create_slot(client)
+    slot_id = app_module.appointment_slots[0]["id"]
+
+    pending = client.get(f"/bookings/slots/weather?ids={slot_id},9999,abc").get_json()
+    app_module._enrich_pending_weather([slot_id])
+    ready = client.get(f"/bookings/slots/weather?ids={slot_id}").get_json()
+
+    assert pending["slots"] == [
+        {
+            "id": slot_id,
+            "weather_status": "pending",
+            "weather_summary": "Checking the forecast…",
+            "weather_label": "Checking the forecast…",
+            "is_rainy": False,
+        }
+    ]
+    assert ready["slots"][0]["weather_status"] == "sunny"
+    assert ready["slots"][0]["weather_label"] == "clear sky"
@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def app_module(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "STATE_WRITE_BEHIND_INTERVAL", 0.2)
+    yield app_module
+    app_module.flush_pending_state_changes()
+
+
+def test_chat_posts_do_not_wait_for_storage(app_module, monkeypatch):
+    saves = []
+    storage_started = threading.Event()
+
+    def slow_save_data(**kwargs):
+        storage_started.set()
+        time.sleep(0.3)
+        saves.append(kwargs)
+        return {"payload": {}}
+
+    monkeypatch.setattr(app_module, "save_data", slow_save_data)
+    client = app_module.app.test_client()
+
+    started = time.monotonic()
+    for index in range(10):
+        response = client.post(
+            "/chat/messages",
+            json={"sender": "visitor", "body": f"Message {index}", "visitor_id": "v-1"},
+        )
+        assert response.status_code == 201
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.3
+    assert storage_started.wait(1)
+    assert app_module.flush_pending_state_changes() is True
+    assert 1 <= len(saves) <= 3
+    assert app_module.write_behind_status["last_error"] is None
+
+
+def test_admin_backups_view_reports_write_behind_status(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "save_data", lambda **kwargs: {"payload": {}})
+    client = app_module.app.test_client()
+    client.post("/admin/meet-greet", data={"enabled": "0"})
+    app_module.flush_pending_state_changes()
+
+    response = client.get("/admin?view=backups")
+
+    assert response.status_code == 200
+    assert b"Background saving" in response.data
+    assert b"Writes completed" in response.data